@@ -0,0 +1,186 @@
+"""Append-only task activity log.
+
+Write paths call record() with a field-level diff. Events wait in an
+in-process buffer and are stored with one bulk INSERT per batch, once
+ACTIVITY_BATCH_SIZE events are pending or the oldest has waited
+ACTIVITY_FLUSH_INTERVAL seconds. The check runs on request_finished, after
+the response has been sent, so no request waits for the log; whatever is
+left is written when the process exits.
+"""
+
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import FieldDoesNotExist
+from django.core.signals import request_finished
+from django.db import DatabaseError, transaction
+from django.dispatch import receiver
+from django.forms import ModelMultipleChoiceField
+from django.utils import timezone
+
+from task_manager.models import Label, Status, Task, TaskEvent
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pending = []
+_oldest = None
+
+# How changes of each field are shown: model of the stored keys, if any.
+FIELD_MODELS = {
+    'status': Status,
+    'executor': User,
+    'labels': Label,
+}
+
+
+def event(task_id, action, changes=None, actor=None):
+    return TaskEvent(
+        task_id=task_id,
+        actor_id=getattr(actor, 'pk', actor),
+        action=action,
+        changes=changes or {},
+        created_at=timezone.now(),
+    )
+
+
+def record(task_id, action, changes=None, actor=None):
+    """Queue an event for a change that has been made.
+
+    Inside transaction.atomic() the event is only kept if the transaction
+    commits. Outside one (there are no ATOMIC_REQUESTS) on_commit runs at
+    once, so record after the change, not before it.
+    """
+    record_many([event(task_id, action, changes, actor)])
+
+
+def record_many(events):
+    """Queue several events, built with event(), as one unit; see record()."""
+    events = list(events)
+    if events:
+        transaction.on_commit(lambda: _enqueue(events))
+
+
+def _enqueue(events):
+    global _oldest
+    with _lock:
+        if not _pending:
+            _oldest = time.monotonic()
+        _pending.extend(events)
+
+
+def flush():
+    """Write every queued event now; return how many were written."""
+    global _oldest
+    with _lock:
+        events = _pending[:]
+        _pending.clear()
+        _oldest = None
+    if not events:
+        return 0
+    try:
+        TaskEvent.objects.bulk_create(
+            events,
+            batch_size=settings.ACTIVITY_BATCH_SIZE
+        )
+    except DatabaseError:
+        logger.exception('Lost %s task events', len(events))
+        return 0
+    return len(events)
+
+
+def flush_due():
+    with _lock:
+        due = bool(_pending) and (
+            len(_pending) >= settings.ACTIVITY_BATCH_SIZE
+            or time.monotonic() - _oldest >= settings.ACTIVITY_FLUSH_INTERVAL
+        )
+    if due:
+        flush()
+
+
+@receiver(request_finished)
+def flush_after_response(sender, **kwargs):
+    flush_due()
+
+
+atexit.register(flush)
+
+
+def _key(value):
+    return getattr(value, 'pk', value)
+
+
+def form_changes(form):
+    """Diff of a bound ModelForm as stored in TaskEvent.changes."""
+    changes = {}
+    for name in form.changed_data:
+        if name not in form._meta.fields:
+            continue
+        old = form.initial.get(name)
+        new = form.cleaned_data.get(name)
+        if isinstance(form.fields[name], ModelMultipleChoiceField):
+            old = {_key(item) for item in old or ()}
+            new = {_key(item) for item in new or ()}
+            if old != new:
+                changes[name] = [sorted(new - old), sorted(old - new)]
+        else:
+            changes[name] = [_key(old), _key(new)]
+    return changes
+
+
+def describe(events):
+    """Pair each event with its displayable changes.
+
+    A change is a dict with the field's verbose name and either old and
+    new values or, for labels, the added and removed names. Related
+    objects are looked up with one query per model for the whole page.
+    """
+    wanted = {name: set() for name in FIELD_MODELS}
+    for item in events:
+        for name, (old, new) in item.changes.items():
+            if name == 'labels':
+                wanted[name].update(old + new)
+            elif name in wanted:
+                wanted[name].update(key for key in (old, new) if key)
+    found = {
+        name: FIELD_MODELS[name].objects.in_bulk(keys)
+        for name, keys in wanted.items() if keys
+    }
+
+    def show(name, key):
+        if name == 'labels':
+            return [str(found[name].get(pk, pk)) for pk in key]
+        if name not in FIELD_MODELS or key is None:
+            return key
+        obj = found[name].get(key)
+        if obj is None:
+            return key
+        return obj.get_full_name() if name == 'executor' else str(obj)
+
+    described = []
+    for item in events:
+        lines = []
+        for name, (old, new) in item.changes.items():
+            try:
+                label = Task._meta.get_field(name).verbose_name
+            except FieldDoesNotExist:
+                label = name
+            if name == 'labels':
+                lines.append({
+                    'field': label,
+                    'added': show(name, old),
+                    'removed': show(name, new),
+                })
+            else:
+                lines.append({
+                    'field': label,
+                    'old': show(name, old),
+                    'new': show(name, new),
+                })
+        described.append((item, lines))
+    return described
@@ -1,17 +1,25 @@
 from django.contrib import admin
 
-from task_manager.models import Label, Status, Task
+from task_manager.models import (
+    Job,
+    Label,
+    Notification,
+    SavedFilter,
+    Status,
+    Task,
+    TaskEvent,
+)
 
 
 @admin.register(Status)
 class StatusAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'created_at')
+    list_display = ('id', 'name', 'tasks_count', 'created_at')
     search_fields = ('name',)
 
 
 @admin.register(Label)
 class LabelAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'created_at')
+    list_display = ('id', 'name', 'tasks_count', 'created_at')
     search_fields = ('name',)
 
 
@@ -21,3 +29,33 @@ class TaskAdmin(admin.ModelAdmin):
     search_fields = ('name',)
     list_filter = ('status', 'labels')
     filter_horizontal = ('labels',)
+
+
+@admin.register(TaskEvent)
+class TaskEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task_id', 'action', 'actor', 'created_at')
+    list_filter = ('action',)
+    raw_id_fields = ('task', 'actor')
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'name', 'state', 'attempts', 'run_at', 'duration', 'worker'
+    )
+    list_filter = ('state', 'name')
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('id', 'recipient', 'kind', 'task_name', 'sent_at')
+    list_filter = ('kind',)
+    raw_id_fields = ('recipient', 'actor')
+
+
+@admin.register(SavedFilter)
+class SavedFilterAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'user', 'is_default', 'uses', 'materialized')
+    list_filter = ('materialized',)
+    raw_id_fields = ('user',)
+    readonly_fields = ('uses', 'materialized')
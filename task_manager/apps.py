@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class TaskManagerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "task_manager"
+
+    def ready(self):
+        from task_manager import (  # noqa: F401
+            activity,
+            choices,
+            conditional,
+            counters,
+            db,
+            jobs,
+            notifications,
+            page_cache,
+            saved_filters,
+        )
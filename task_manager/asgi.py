@@ -1,5 +1,7 @@
 """
-ASGI config for hexlet_code project.
+ASGI config for task_manager project.
+
+Read views run natively async here (see ASYNC_VIEWS).
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
@@ -11,6 +13,9 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hexlet_code.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
+os.environ.setdefault("ASYNC_VIEWS", "True")
+# Django advises against persistent connections under ASGI; use DB_POOL.
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
@@ -0,0 +1,175 @@
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.translation import gettext_lazy as _
+
+from task_manager.conditional import (
+    aget_markers,
+    compute_validators,
+    set_validators,
+)
+from task_manager.labels_views import LabelListView
+from task_manager.models import Task
+from task_manager.page_cache import AsyncAnonymousPageCacheMixin
+from task_manager.pagination import InvalidCursor, apaginate_by_cursor
+from task_manager.serializers import EXPORT_FORMATS
+from task_manager.statuses_views import StatusListView
+from task_manager.tasks_views import TaskDetailView, TaskListView
+from task_manager.users_views import UserListView
+
+
+class AsyncViewMixin:
+    """Serve a conditional-GET read view without leaving the event loop.
+
+    Data access goes through the async ORM, request.auser() and the async
+    session API. The session and the user are loaded once up front, so the
+    sync code that follows (LoginRequiredMixin, messages) reads them from
+    memory. get_context_data may still query (choice lists, fragments), so
+    it runs in a worker thread, as do the templates, rendered by Django.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        # Fills the session cache; later sync reads do not hit the database.
+        await request.session.aitems()
+        response = super().dispatch(request, *args, **kwargs)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
+    async def aget_validator_parts(self):
+        return self.get_validator_parts()
+
+    async def get(self, request, *args, **kwargs):
+        parts = None
+        # Flash messages are rendered once; a 304 would swallow them.
+        if not len(messages.get_messages(request)):
+            parts = await self.aget_validator_parts()
+
+        if parts is not None:
+            markers = await aget_markers(self.change_markers)
+            etag, last_modified = compute_validators(
+                self,
+                request,
+                markers,
+                parts
+            )
+            response = get_conditional_response(
+                request,
+                etag=etag,
+                last_modified=last_modified
+            )
+            if response is None:
+                response = self.render_to_response(
+                    await self.aget_context_data()
+                )
+            return set_validators(response, etag, last_modified)
+
+        return self.render_to_response(await self.aget_context_data())
+
+    async def aget_context_data(self):
+        self.object_list = [obj async for obj in self.get_queryset()]
+        return await sync_to_async(self.get_context_data)()
+
+
+class AsyncCursorPaginationMixin:
+    """Fetch the cursor page with the async ORM before the context is built."""
+
+    async def apaginate(self, queryset):
+        try:
+            self.page = await apaginate_by_cursor(
+                queryset,
+                self.request.GET.get('cursor'),
+                self.get_paginate_by(queryset),
+                keys=self.get_cursor_keys(queryset)
+            )
+        except InvalidCursor:
+            raise Http404(_('Invalid page.'))
+
+    def paginate_queryset(self, queryset, page_size):
+        return None, self.page, self.page.object_list, self.page.has_other_pages()
+
+
+class AsyncTaskListView(AsyncViewMixin, AsyncCursorPaginationMixin, TaskListView):
+    async def get(self, request, *args, **kwargs):
+        response = await sync_to_async(self.select_saved_filter)()
+        if response is not None:
+            return response
+        export_format = request.GET.get('export')
+        if export_format in EXPORT_FORMATS:
+            return await sync_to_async(self.export)(export_format)
+        return await super().get(request, *args, **kwargs)
+
+    async def aget_context_data(self):
+        self.filterset = self.get_filterset(self.get_filterset_class())
+        # Validation looks the chosen status, executor and label up.
+        if (
+            not self.filterset.is_bound
+            or await sync_to_async(self.filterset.is_valid)()
+            or not self.get_strict()
+        ):
+            queryset = self.filterset.qs
+        else:
+            queryset = self.filterset.queryset.none()
+
+        await self.apaginate(queryset)
+        self.object_list = queryset
+        return await sync_to_async(self.get_context_data)(
+            filter=self.filterset
+        )
+
+
+class AsyncTaskDetailView(AsyncViewMixin, TaskDetailView):
+    async def aget_validator_parts(self):
+        updated_at = await self.updated_at_query().afirst()
+        if updated_at is None:
+            return None
+        return [updated_at]
+
+    async def aget_context_data(self):
+        try:
+            self.object = await self.get_queryset().aget(pk=self.kwargs['pk'])
+        except Task.DoesNotExist:
+            raise Http404
+        return await sync_to_async(self.get_context_data)(object=self.object)
+
+
+class AsyncStatusListView(AsyncViewMixin, StatusListView):
+    pass
+
+
+class AsyncLabelListView(AsyncViewMixin, LabelListView):
+    pass
+
+
+class AsyncUserListView(
+    AsyncAnonymousPageCacheMixin,
+    AsyncViewMixin,
+    AsyncCursorPaginationMixin,
+    UserListView
+):
+    async def aget_context_data(self):
+        queryset = self.get_queryset()
+        await self.apaginate(queryset)
+        self.object_list = queryset
+        return await sync_to_async(self.get_context_data)()
+
+
+ASYNC_VARIANTS = {
+    TaskListView: AsyncTaskListView,
+    TaskDetailView: AsyncTaskDetailView,
+    StatusListView: AsyncStatusListView,
+    LabelListView: AsyncLabelListView,
+    UserListView: AsyncUserListView,
+}
+
+
+def read_view(view_class, **initkwargs):
+    """as_view() for a read view, async when ASYNC_VIEWS is enabled."""
+    if settings.ASYNC_VIEWS:
+        view_class = ASYNC_VARIANTS.get(view_class, view_class)
+    return view_class.as_view(**initkwargs)
@@ -0,0 +1,224 @@
+from collections import Counter, namedtuple
+from itertools import chain
+
+from django.db import connections, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from task_manager.activity import event, record_many
+from task_manager.conditional import bump
+from task_manager.counters import apply_counter_deltas
+from task_manager.models import Task, TaskEvent
+from task_manager.notifications import assigned, notify, status_changed
+from task_manager.saved_filters import refresh_results
+
+BulkResult = namedtuple('BulkResult', ['changed', 'skipped'])
+
+# Receivers of Task's pre_delete/post_delete. delete_tasks() deletes with
+# a plain DELETE, which sends no signals, and does their work set-based
+# itself; a test fails when a receiver is added here or there.
+DELETE_RECEIVERS = (
+    'task_manager.conditional.model_changed',
+    'task_manager.counters.task_deleted',
+    'task_manager.counters.task_deleting',
+    'task_manager.saved_filters.task_changed',
+)
+
+
+def _grouped(queryset, field):
+    return Counter(dict(
+        queryset.order_by().values_list(field).annotate(count=Count('*'))
+    ))
+
+
+def _moved(old, new_pk, changed):
+    """Counter deltas for tasks moved from the old groups to new_pk."""
+    deltas = {pk: -count for pk, count in old.items()}
+    if new_pk is not None:
+        deltas[new_pk] = deltas.get(new_pk, 0) + changed
+    return deltas
+
+
+def _finish(changed, skipped=()):
+    if changed:
+        bump('task')
+    return BulkResult(changed, list(skipped))
+
+
+def _touched():
+    """Columns every set-based change of a task updates.
+
+    Bumping the version makes a task form opened before the change
+    report a conflict instead of overwriting it.
+    """
+    return {'updated_at': timezone.now(), 'version': F('version') + 1}
+
+
+def _set_field(task_ids, field, value, actor):
+    """Point field of the selected tasks at value.
+
+    The rows are read once: they give the counter deltas, the activity
+    log entries, the notifications and the saved filter results to redo.
+    """
+    new_pk = value and value.pk
+    rows = list(
+        Task.objects.filter(pk__in=task_ids)
+        .exclude(**{field: value})
+        .select_for_update()
+        .values_list('pk', f'{field}_id', 'name', 'author_id', 'executor_id')
+    )
+    changed = Task.objects.filter(pk__in=[row[0] for row in rows]).update(
+        **{field: value, **_touched()}
+    )
+    record_many(
+        event(pk, TaskEvent.UPDATED, {field: [old, new_pk]}, actor)
+        for pk, old, *_ in rows
+    )
+    refresh_results(row[0] for row in rows)
+    old = Counter(row[1] for row in rows if row[1] is not None)
+    return rows, _moved(old, new_pk, changed)
+
+
+@transaction.atomic
+def set_status(task_ids, status, actor=None):
+    rows, deltas = _set_field(task_ids, 'status', status, actor)
+    apply_counter_deltas(statuses=deltas)
+    notify(chain.from_iterable(
+        status_changed(pk, name, status, [author_id, executor_id], actor)
+        for pk, _, name, author_id, executor_id in rows
+    ))
+    return _finish(len(rows))
+
+
+@transaction.atomic
+def set_executor(task_ids, executor, actor=None):
+    rows, deltas = _set_field(task_ids, 'executor', executor, actor)
+    apply_counter_deltas(executors=deltas)
+    if executor is not None:
+        notify(chain.from_iterable(
+            assigned(pk, name, executor.pk, actor)
+            for pk, _, name, *_ in rows
+        ))
+    return _finish(len(rows))
+
+
+def _label_events(links, actor, removed=False):
+    by_task = {}
+    for task_id, label_id in links:
+        by_task.setdefault(task_id, []).append(label_id)
+    return [
+        event(
+            task_id,
+            TaskEvent.UPDATED,
+            {'labels': [[], sorted(ids)] if removed else [sorted(ids), []]},
+            actor
+        )
+        for task_id, ids in by_task.items()
+    ]
+
+
+@transaction.atomic
+def add_labels(task_ids, labels, actor=None):
+    through = Task.labels.through
+    label_ids = [label.pk for label in labels]
+    task_ids = list(
+        Task.objects.filter(pk__in=task_ids).values_list('pk', flat=True)
+    )
+    existing = set(
+        through.objects.filter(task_id__in=task_ids, label_id__in=label_ids)
+        .values_list('task_id', 'label_id')
+    )
+    links = [
+        through(task_id=task_id, label_id=label_id)
+        for task_id in task_ids
+        for label_id in label_ids
+        if (task_id, label_id) not in existing
+    ]
+    through.objects.bulk_create(links)
+
+    changed_ids = {link.task_id for link in links}
+    Task.objects.filter(pk__in=changed_ids).update(**_touched())
+    refresh_results(changed_ids)
+    apply_counter_deltas(
+        labels=Counter(link.label_id for link in links)
+    )
+    record_many(_label_events(
+        [(link.task_id, link.label_id) for link in links],
+        actor
+    ))
+    return _finish(len(changed_ids))
+
+
+@transaction.atomic
+def remove_labels(task_ids, labels, actor=None):
+    links = Task.labels.through.objects.filter(
+        task_id__in=task_ids,
+        label__in=labels
+    )
+    pairs = list(links.values_list('task_id', 'label_id'))
+    changed_ids = {task_id for task_id, _ in pairs}
+    links.delete()
+
+    Task.objects.filter(pk__in=changed_ids).update(**_touched())
+    refresh_results(changed_ids)
+    removed = Counter(label_id for _, label_id in pairs)
+    apply_counter_deltas(
+        labels={pk: -count for pk, count in removed.items()}
+    )
+    record_many(_label_events(pairs, actor, removed=True))
+    return _finish(len(changed_ids))
+
+
+@transaction.atomic
+def delete_tasks(task_ids, user):
+    """Delete the tasks authored by user and skip the others."""
+    rows = list(Task.objects.filter(pk__in=task_ids).values_list(
+        'pk', 'name', 'author_id'
+    ))
+    skipped = [name for _, name, author in rows if author != user.pk]
+    own = [(pk, name) for pk, name, author in rows if author == user.pk]
+    own_ids = [pk for pk, _ in own]
+    tasks = Task.objects.filter(pk__in=own_ids)
+    record_many(
+        event(pk, TaskEvent.DELETED, {'name': [name, None]}, user)
+        for pk, name in own
+    )
+    links = Task.labels.through.objects.filter(task__in=tasks)
+
+    statuses = _grouped(tasks, 'status')
+    executors = _grouped(tasks, 'executor')
+    labels = _grouped(links, 'label_id')
+
+    links.delete()
+    # QuerySet.delete() would fetch every row and send its signals one by
+    # one. Instead of DELETE_RECEIVERS: the counter deltas (task_deleting,
+    # task_deleted), refresh_results() (task_changed) and the marker bump
+    # in _finish() (model_changed). TaskEvent rows are kept on purpose and
+    # SavedFilterResult rows go with refresh_results().
+    changed = 0
+    if own_ids:
+        placeholders = ', '.join(['%s'] * len(own_ids))
+        with connections[tasks.db].cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {Task._meta.db_table} '
+                f'WHERE {Task._meta.pk.column} IN ({placeholders})',
+                own_ids
+            )
+            changed = cursor.rowcount
+    refresh_results(own_ids)
+
+    apply_counter_deltas(
+        statuses={pk: -count for pk, count in statuses.items()},
+        executors={pk: -count for pk, count in executors.items()},
+        labels={pk: -count for pk, count in labels.items()},
+    )
+    return _finish(changed, skipped)
+
+
+BULK_ACTIONS = {
+    'status': set_status,
+    'executor': set_executor,
+    'add_labels': add_labels,
+    'remove_labels': remove_labels,
+    'delete': delete_tasks,
+}
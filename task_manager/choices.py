@@ -0,0 +1,94 @@
+from django import forms
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from task_manager.models import Label, Status
+
+STATUS_KEY = 'task_manager:choices:statuses'
+LABEL_KEY = 'task_manager:choices:labels'
+USER_KEY = 'task_manager:choices:users'
+
+
+def _cached(key, build):
+    choices = cache.get(key)
+    if choices is None:
+        choices = build()
+        cache.set(key, choices, settings.CHOICES_CACHE_TIMEOUT)
+    return choices
+
+
+def _user_rows():
+    return User.objects.order_by('pk').only(
+        'username', 'first_name', 'last_name'
+    )
+
+
+def _user_choice(user):
+    return (user.pk, user.username, user.get_full_name())
+
+
+def status_choices():
+    return _cached(
+        STATUS_KEY,
+        lambda: list(Status.objects.values_list('pk', 'name'))
+    )
+
+
+def label_choices():
+    return _cached(
+        LABEL_KEY,
+        lambda: list(Label.objects.values_list('pk', 'name'))
+    )
+
+
+def user_choices(full_name=False):
+    users = _cached(
+        USER_KEY,
+        lambda: [_user_choice(user) for user in _user_rows()]
+    )
+    return [
+        (pk, name if full_name else username)
+        for pk, username, name in users
+    ]
+
+
+def set_choices(field, choices):
+    """Render a model choice field from a cached list.
+
+    The field keeps its queryset, so submitted values are still
+    validated against the database.
+    """
+    empty_label = getattr(field, 'empty_label', None)
+    if empty_label is not None:
+        choices = [('', empty_label), *choices]
+    # Bypass the iterator wrappers that model choice fields (and their
+    # django-filter subclasses) install in their choices setters.
+    forms.ChoiceField.choices.fset(field, choices)
+
+
+def invalidate_choices():
+    """Drop every cached list, for writes that bypass model signals."""
+    cache.delete_many([STATUS_KEY, LABEL_KEY, USER_KEY])
+
+
+@receiver(post_save, sender=Status)
+@receiver(post_delete, sender=Status)
+def status_changed(sender, **kwargs):
+    cache.delete(STATUS_KEY)
+
+
+@receiver(post_save, sender=Label)
+@receiver(post_delete, sender=Label)
+def label_changed(sender, **kwargs):
+    cache.delete(LABEL_KEY)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    cache.delete(USER_KEY)
@@ -0,0 +1,165 @@
+import hashlib
+
+from django.contrib import messages
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
+from django.middleware.csrf import get_token
+from django.utils import timezone, translation
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from task_manager.models import (
+    ChangeMarker,
+    Label,
+    SavedFilter,
+    Status,
+    Task,
+)
+
+MARKER_MODELS = {
+    Task: 'task',
+    Status: 'status',
+    Label: 'label',
+    User: 'user',
+    SavedFilter: 'saved_filter',
+}
+
+
+# Sent after a change marker moved on, with the marker name.
+marker_bumped = Signal()
+
+
+def bump(name):
+    _bump(name)
+    marker_bumped.send(sender=ChangeMarker, name=name)
+
+
+def _bump(name):
+    now = timezone.now()
+    updated = ChangeMarker.objects.filter(name=name).update(
+        version=F('version') + 1,
+        changed_at=now
+    )
+    if not updated:
+        marker, created = ChangeMarker.objects.get_or_create(
+            name=name,
+            defaults={'version': 1, 'changed_at': now}
+        )
+        if not created:
+            _bump(name)
+
+
+def get_markers(names):
+    found = ChangeMarker.objects.in_bulk(list(names))
+    return [found.get(name) for name in names]
+
+
+async def aget_markers(names):
+    found = await ChangeMarker.objects.ain_bulk(list(names))
+    return [found.get(name) for name in names]
+
+
+def model_changed(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump(MARKER_MODELS[sender])
+
+
+# Connected per model: a sender-less receiver would make every other model
+# (the label through table included) lose Django's fast-path deletes.
+for model in MARKER_MODELS:
+    post_save.connect(model_changed, sender=model)
+    post_delete.connect(model_changed, sender=model)
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def task_labels_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        tasks = Task.objects.filter(pk=instance.pk)
+    elif action == 'pre_clear':
+        tasks = Task.objects.filter(labels=instance)
+    else:
+        tasks = Task.objects.filter(pk__in=pk_set or ())
+    tasks.update(updated_at=timezone.now())
+    bump('task')
+
+
+def compute_validators(view, request, markers, parts):
+    """Return the (etag, last_modified) pair for a page.
+
+    The ETag covers the change markers the page depends on, the full
+    path (filters, cursors), the current user and the language, so per-user
+    and per-filter content never shares a validator. On pages that render
+    forms it also covers the CSRF secret: a page kept from before a login
+    rotated the secret would post a rejected token.
+    """
+    csrf_secret = None
+    if view.renders_forms:
+        # Creates the secret (and its cookie) on the first visit, so the
+        # next request, which sends the cookie, gets the same ETag.
+        get_token(request)
+        csrf_secret = request.META['CSRF_COOKIE']
+
+    changed = [marker.changed_at for marker in markers if marker is not None]
+    changed.extend(part for part in parts if hasattr(part, 'timestamp'))
+    last_modified = int(max(changed).timestamp()) if changed else None
+
+    etag = quote_etag(hashlib.md5(repr((
+        type(view).__name__,
+        request.get_full_path(),
+        request.user.pk,
+        translation.get_language(),
+        csrf_secret,
+        [marker and marker.version for marker in markers],
+        parts,
+    )).encode()).hexdigest())
+    return etag, last_modified
+
+
+def set_validators(response, etag, last_modified):
+    response.headers.setdefault('ETag', etag)
+    if last_modified is not None:
+        response.headers.setdefault('Last-Modified', http_date(last_modified))
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+class ConditionalGetMixin:
+    """Answer GET with 304 Not Modified when nothing shown has changed.
+
+    See compute_validators for what the validators cover.
+    """
+
+    change_markers = ()
+    renders_forms = False
+
+    def get_validator_parts(self):
+        return []
+
+    def get(self, request, *args, **kwargs):
+        # Flash messages are rendered once; a 304 would swallow them.
+        if len(messages.get_messages(request)):
+            return super().get(request, *args, **kwargs)
+
+        parts = self.get_validator_parts()
+        if parts is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified = compute_validators(
+            self,
+            request,
+            get_markers(self.change_markers),
+            parts
+        )
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
@@ -0,0 +1,188 @@
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from task_manager.conditional import bump
+from task_manager.jobs import register_job
+from task_manager.models import Label, Status, Task, UserTaskCounter
+
+
+def _bump(model, pk, delta, field='tasks_count'):
+    if pk is None or not delta:
+        return 0
+    return model.objects.filter(pk=pk).update(**{field: F(field) + delta})
+
+
+def _bump_executor(user_id, delta):
+    if user_id is None or not delta:
+        return
+    if not _bump(UserTaskCounter, user_id, delta, 'assigned_tasks_count'):
+        counter, created = UserTaskCounter.objects.get_or_create(
+            user_id=user_id,
+            defaults={'assigned_tasks_count': max(delta, 0)}
+        )
+        if not created:
+            _bump(UserTaskCounter, user_id, delta, 'assigned_tasks_count')
+
+
+def _bump_labels(label_ids, delta):
+    if label_ids:
+        Label.objects.filter(pk__in=label_ids).update(
+            tasks_count=F('tasks_count') + delta
+        )
+
+
+# Task columns whose changes move counters.
+COUNTED_FIELDS = ('status_id', 'executor_id')
+
+
+@receiver(pre_save, sender=Task)
+def task_saving(sender, instance, **kwargs):
+    # A task loaded with only() or defer() has no loaded value for the
+    # columns left out; if one of them was set since, read what it was
+    # before this save overwrites it.
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None or instance._state.adding:
+        return
+    missing = [
+        name for name in COUNTED_FIELDS
+        if name not in loaded and name in instance.__dict__
+    ]
+    if missing:
+        loaded.update(
+            Task.objects.filter(pk=instance.pk).values(*missing).first() or {}
+        )
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    if created:
+        _bump(Status, instance.status_id, 1)
+        _bump_executor(instance.executor_id, 1)
+        return
+
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None:
+        return
+
+    # Columns neither loaded nor set were not saved and did not change.
+    if 'status_id' in loaded:
+        old_status = loaded['status_id']
+        if old_status != instance.status_id:
+            _bump(Status, old_status, -1)
+            _bump(Status, instance.status_id, 1)
+        loaded['status_id'] = instance.status_id
+
+    if 'executor_id' in loaded:
+        old_executor = loaded['executor_id']
+        if old_executor != instance.executor_id:
+            _bump_executor(old_executor, -1)
+            _bump_executor(instance.executor_id, 1)
+        loaded['executor_id'] = instance.executor_id
+
+
+@receiver(pre_delete, sender=Task)
+def task_deleting(sender, instance, **kwargs):
+    # The through rows are removed by the delete cascade, which does not
+    # send m2m_changed, so labels are released here.
+    _bump_labels(list(instance.labels.values_list('pk', flat=True)), -1)
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    _bump(Status, instance.status_id, -1)
+    _bump_executor(instance.executor_id, -1)
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def task_labels_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'post_add':
+        # Django only reports the links that were actually inserted.
+        _apply_link_delta(instance, reverse, pk_set, 1)
+    elif action in ('pre_remove', 'pre_clear'):
+        links = sender.objects.filter(
+            **{'label_id' if reverse else 'task_id': instance.pk}
+        )
+        column = 'task_id' if reverse else 'label_id'
+        if pk_set is not None:
+            links = links.filter(**{f'{column}__in': pk_set})
+        _apply_link_delta(
+            instance,
+            reverse,
+            set(links.values_list(column, flat=True)),
+            -1
+        )
+
+
+def _apply_link_delta(instance, reverse, pk_set, delta):
+    if not pk_set:
+        return
+    if reverse:
+        _bump(Label, instance.pk, delta * len(pk_set))
+    else:
+        _bump_labels(pk_set, delta)
+
+
+def apply_counter_deltas(statuses=None, executors=None, labels=None):
+    """Apply counter changes made by set-based updates that send no signals.
+
+    Each argument maps a Status, User or Label pk to the change in its
+    task count; None keys (tasks without executor) are ignored.
+    """
+    for pk, delta in (statuses or {}).items():
+        _bump(Status, pk, delta)
+    for pk, delta in (executors or {}).items():
+        _bump_executor(pk, delta)
+    for pk, delta in (labels or {}).items():
+        _bump(Label, pk, delta)
+
+
+def _count(queryset, column):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{column: OuterRef('pk')})
+            .order_by()
+            .values(column)
+            .annotate(count=Count('*'))
+            .values('count')
+        ),
+        Value(0)
+    )
+
+
+@register_job()
+def rebuild_task_counters():
+    """Recompute every counter from the tasks table in set-based UPDATEs."""
+    Status.objects.update(tasks_count=_count(Task.objects.all(), 'status'))
+    Label.objects.update(
+        tasks_count=_count(Task.labels.through.objects.all(), 'label')
+    )
+
+    executor_ids = (
+        Task.objects.filter(executor__isnull=False)
+        .order_by()
+        .values_list('executor', flat=True)
+        .distinct()
+    )
+    existing = set(
+        UserTaskCounter.objects.values_list('user_id', flat=True)
+    )
+    UserTaskCounter.objects.bulk_create([
+        UserTaskCounter(user_id=user_id)
+        for user_id in executor_ids
+        if user_id not in existing
+    ])
+    UserTaskCounter.objects.update(
+        assigned_tasks_count=_count(Task.objects.all(), 'executor')
+    )
+    # The set-based updates send no signals; the status and label lists
+    # show the counts and would keep answering 304.
+    bump('status')
+    bump('label')
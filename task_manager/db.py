@@ -0,0 +1,55 @@
+import os
+from collections import Counter
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# psycopg_pool statistics worth watching when sizing the pool.
+POOL_STATS = {
+    'pool_min': 'min_size',
+    'pool_max': 'max_size',
+    'pool_size': 'size',
+    'pool_available': 'available',
+    'requests_num': 'checkouts',
+    'requests_queued': 'waits',
+    'requests_wait_ms': 'wait_ms',
+    'requests_waiting': 'waiting',
+    'requests_errors': 'timeouts',
+    'connections_num': 'connections_made',
+    'connections_lost': 'connections_lost',
+    'returns_bad': 'returns_bad',
+}
+
+opened = Counter()
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    opened[connection.alias] += 1
+
+
+def pool_stats():
+    """Connection statistics of the current worker process, per alias.
+
+    Pooled databases add the psycopg_pool counters (checkouts, waits,
+    timeouts); connections_opened then counts checkouts as well. Without a
+    pool it is the number of connections this process opened, which with
+    persistent connections should stay flat.
+    """
+    databases = {}
+    for connection in connections.all():
+        stats = {
+            'vendor': connection.vendor,
+            'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+            'connections_opened': opened[connection.alias],
+        }
+        pool = getattr(connection, 'pool', None)
+        if pool is not None:
+            raw = pool.get_stats()
+            stats['pool'] = {
+                name: raw.get(key, 0) for key, name in POOL_STATS.items()
+            }
+        databases[connection.alias] = stats
+    return {'pid': os.getpid(), 'databases': databases}
@@ -3,11 +3,25 @@ from django import forms
 from django.contrib.auth.models import User
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.choices import (
+    label_choices,
+    set_choices,
+    status_choices,
+    user_choices,
+)
 from task_manager.models import Label, Task
+from task_manager.search import search_tasks
 
 
 class TaskFilter(django_filters.FilterSet):
+    q = django_filters.CharFilter(
+        method='filter_search',
+        label=_('Search'),
+        widget=forms.TextInput(attrs={'class': 'form-control'})
+    )
+
     label = django_filters.ModelChoiceFilter(
+        field_name='labels',
         queryset=Label.objects.all(),
         label=_('Label'),
         widget=forms.Select(attrs={'class': 'form-select'})
@@ -27,13 +41,35 @@ class TaskFilter(django_filters.FilterSet):
 
     class Meta:
         model = Task
-        fields = ['status', 'executor', 'label', 'self_tasks']
+        fields = ['q', 'status', 'executor', 'label', 'self_tasks']
         widgets = {
             'status': forms.Select(attrs={'class': 'form-select'}),
         }
 
+    def __init__(self, *args, precomputed=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.precomputed = precomputed
+
+    @property
+    def form(self):
+        if not hasattr(self, '_form'):
+            form = super().form
+            set_choices(form.fields['status'], status_choices())
+            set_choices(form.fields['executor'], user_choices())
+            set_choices(form.fields['label'], label_choices())
+        return self._form
+
+    def filter_queryset(self, queryset):
+        # The queryset is a saved filter's precomputed result already.
+        if self.precomputed:
+            return queryset
+        return super().filter_queryset(queryset)
+
     def filter_self_tasks(self, queryset, name, value):
         if value:
             user = self.request.user
             return queryset.filter(author=user)
         return queryset
+
+    def filter_search(self, queryset, name, value):
+        return search_tasks(queryset, value)
@@ -0,0 +1,61 @@
+import hashlib
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils import timezone, translation
+from django.utils.safestring import mark_safe
+
+ROW_TEMPLATE = 'task_manager/tasks/row.html'
+ROW_TIMEOUT = 60 * 60 * 24
+
+
+def row_version(task):
+    """Digest of everything the task row displays.
+
+    It changes whenever the task, its status, its labels or its author
+    and executor change, so stale fragments are never served and no
+    explicit invalidation is needed. Related objects must be loaded
+    (see TaskQuerySet.with_related).
+    """
+    executor = task.executor
+    parts = (
+        task.name,
+        task.created_at.isoformat(),
+        task.status_id,
+        task.status.name,
+        task.author_id,
+        task.author.get_full_name(),
+        task.executor_id,
+        executor.get_full_name() if executor else None,
+        [(label.pk, label.name) for label in task.labels.all()],
+    )
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def row_key(task):
+    return ':'.join((
+        'task_manager:task_row',
+        translation.get_language() or '',
+        timezone.get_current_timezone_name(),
+        str(task.pk),
+        row_version(task),
+    ))
+
+
+def render_task_rows(tasks):
+    """Render task rows, reusing cached fragments for unchanged tasks."""
+    keys = [row_key(task) for task in tasks]
+    cached = cache.get_many(keys)
+    missing = {}
+    rows = []
+
+    for task, key in zip(tasks, keys):
+        row = cached.get(key)
+        if row is None:
+            row = render_to_string(ROW_TEMPLATE, {'task': task})
+            missing[key] = row
+        rows.append(mark_safe(row))
+
+    if missing:
+        cache.set_many(missing, ROW_TIMEOUT)
+    return rows
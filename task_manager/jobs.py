@@ -0,0 +1,234 @@
+"""Background jobs stored in the project's database.
+
+enqueue() inserts a row in the caller's transaction, so a job exists
+exactly when the change that asked for it is committed, and the request
+returns without running it. The run_worker command claims due jobs and
+calls the function registered under the job's name.
+
+On PostgreSQL a worker claims with SELECT ... FOR UPDATE SKIP LOCKED, so
+workers skip each other's rows instead of waiting on them. SQLite has no
+row locks: a job is taken with a conditional UPDATE (still queued), which
+only one worker can win.
+
+enqueue(..., unique=True) queues a job only if the same job is not
+queued already. A unique key on the row decides, so concurrent callers
+cannot both insert it; the key is released when a worker claims the job.
+
+A failed job is retried with exponential backoff until max_attempts; a
+running job not finished within JOB_TIMEOUT seconds is taken as lost with
+its worker and retried the same way. If it was only slow, its outcome is
+dropped when it finishes: the row belongs to the new attempt by then.
+"""
+
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Avg, Count, F, Max
+from django.utils import timezone
+
+from task_manager.models import Job
+
+logger = logging.getLogger(__name__)
+
+REGISTRY = {}
+NON_ATOMIC = set()
+
+STATE_NAMES = {
+    Job.QUEUED: 'queued',
+    Job.RUNNING: 'running',
+    Job.DONE: 'done',
+    Job.FAILED: 'failed',
+}
+
+
+class UnknownJob(LookupError):
+    pass
+
+
+def register_job(name=None, atomic=True):
+    """Decorator: make a function runnable as a job, by name or its own.
+
+    The job runs in a transaction unless atomic is False; such a job
+    commits its own steps, so a retry does not redo the finished ones.
+    """
+    def register(func):
+        if not atomic:
+            NON_ATOMIC.add(func)
+        REGISTRY[name or func.__name__] = func
+        return func
+    return register
+
+
+def enqueue(name, *, run_at=None, max_attempts=None, unique=False, **payload):
+    """Queue a call of job name with payload (JSON) as keyword arguments.
+
+    With unique, nothing is queued when the job is already waiting; the
+    waiting job is returned instead.
+    """
+    if name not in REGISTRY:
+        raise UnknownJob(name)
+    job = Job(
+        name=name,
+        payload=payload,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        unique_key=name if unique else None,
+    )
+    if not unique:
+        job.save()
+        return job
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        return Job.objects.filter(unique_key=name).first()
+    return job
+
+
+def claim(worker, limit=1):
+    """Mark up to limit due jobs as running by worker and return them."""
+    now = timezone.now()
+    due = Job.objects.filter(
+        state=Job.QUEUED,
+        run_at__lte=now
+    ).order_by('run_at', 'id')
+    running = {
+        'state': Job.RUNNING,
+        'started_at': now,
+        'attempts': F('attempts') + 1,
+        'worker': worker,
+        'unique_key': None,
+    }
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                due.select_for_update(skip_locked=True)
+                .values_list('pk', flat=True)[:limit]
+            )
+            Job.objects.filter(pk__in=ids).update(**running)
+    else:
+        ids = [
+            pk for pk in due.values_list('pk', flat=True)[:limit]
+            if Job.objects.filter(pk=pk, state=Job.QUEUED).update(**running)
+        ]
+    return list(Job.objects.filter(pk__in=ids).order_by('run_at', 'id'))
+
+
+def retry_delay(attempts):
+    """Seconds before the next attempt: JOB_RETRY_DELAY doubled per failure."""
+    return settings.JOB_RETRY_DELAY * 2 ** (attempts - 1)
+
+
+def run(job):
+    """Run a claimed job (in a transaction) and store the outcome.
+
+    Returns the job's new state, or None when the job was taken over by
+    housekeeping() meanwhile and the outcome was not stored.
+    """
+    started = time.perf_counter()
+    error = ''
+    try:
+        func = REGISTRY.get(job.name)
+        if func is None:
+            raise UnknownJob(job.name)
+        if func in NON_ATOMIC:
+            func(**job.payload)
+        else:
+            with transaction.atomic():
+                func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Job %s failed (attempt %s)', job, job.attempts)
+    duration = time.perf_counter() - started
+
+    finished = timezone.now()
+    outcome = {
+        'finished_at': finished,
+        'waited': (job.started_at - job.run_at).total_seconds(),
+        'duration': duration,
+        'error': error,
+    }
+    if not error:
+        outcome['state'] = Job.DONE
+    elif job.attempts < job.max_attempts:
+        outcome['state'] = Job.QUEUED
+        outcome['run_at'] = finished + timedelta(
+            seconds=retry_delay(job.attempts)
+        )
+    else:
+        outcome['state'] = Job.FAILED
+    stored = Job.objects.filter(
+        pk=job.pk,
+        worker=job.worker,
+        attempts=job.attempts,
+        state=Job.RUNNING
+    ).update(**outcome)
+    if not stored:
+        logger.warning(
+            'Job %s outlived JOB_TIMEOUT and was retried, '
+            'outcome of attempt %s dropped',
+            job,
+            job.attempts
+        )
+        return None
+    logger.info(
+        'Job %s %s in %.3fs',
+        job,
+        STATE_NAMES[outcome['state']],
+        duration
+    )
+    return outcome['state']
+
+
+def housekeeping():
+    """Retry jobs lost with their worker and drop old finished ones."""
+    now = timezone.now()
+    lost = Job.objects.filter(
+        state=Job.RUNNING,
+        started_at__lt=now - timedelta(seconds=settings.JOB_TIMEOUT)
+    )
+    lost.filter(attempts__gte=F('max_attempts')).update(
+        state=Job.FAILED,
+        finished_at=now,
+        error='Timed out'
+    )
+    lost.update(state=Job.QUEUED, run_at=now, error='Timed out')
+    Job.objects.filter(
+        state__in=(Job.DONE, Job.FAILED),
+        finished_at__lt=now - timedelta(seconds=settings.JOB_KEEP_FINISHED)
+    ).delete()
+
+
+def job_stats():
+    """Jobs kept in the table, by name.
+
+    Counts per state and, over the successful runs, the average wait and
+    the average and longest duration in seconds.
+    """
+    rows = (
+        Job.objects.order_by()
+        .values('name', 'state')
+        .annotate(
+            count=Count('*'),
+            avg_waited=Avg('waited'),
+            avg_duration=Avg('duration'),
+            max_duration=Max('duration'),
+        )
+    )
+    jobs = {}
+    for row in rows:
+        stats = jobs.setdefault(row['name'], {
+            **dict.fromkeys(STATE_NAMES.values(), 0),
+            'avg_waited': None,
+            'avg_duration': None,
+            'max_duration': None,
+        })
+        stats[STATE_NAMES[row['state']]] = row['count']
+        if row['state'] == Job.DONE:
+            for key in ('avg_waited', 'avg_duration', 'max_duration'):
+                stats[key] = row[key]
+    return jobs
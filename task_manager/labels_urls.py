@@ -1,9 +1,10 @@
 from django.urls import path
 
 from task_manager import labels_views
+from task_manager.async_views import read_view
 
 urlpatterns = [
-    path('', labels_views.LabelListView.as_view(), name='labels_list'),
+    path('', read_view(labels_views.LabelListView), name='labels_list'),
     path(
         'create/',
         labels_views.LabelCreateView.as_view(),
@@ -7,6 +7,7 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from task_manager.conditional import ConditionalGetMixin
 from task_manager.models import Label
 
 
@@ -21,10 +22,11 @@ class LabelForm(forms.ModelForm):
         }
 
 
-class LabelListView(LoginRequiredMixin, ListView):
+class LabelListView(LoginRequiredMixin, ConditionalGetMixin, ListView):
     model = Label
     template_name = 'task_manager/labels/list.html'
     context_object_name = 'labels'
+    change_markers = ('label', 'task', 'user')
     login_url = reverse_lazy('login')
 
     def handle_no_permission(self):
@@ -83,7 +85,7 @@ class LabelDeleteView(LoginRequiredMixin, DeleteView):
     def form_valid(self, form):
         label = self.get_object()
 
-        if label.tasks.exists():
+        if label.tasks_count > 0 or label.tasks.exists():
             messages.error(
                 self.request,
                 _('Cannot delete label because it is in use')
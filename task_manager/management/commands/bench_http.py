@@ -0,0 +1,256 @@
+import json
+import math
+import platform
+import subprocess
+import time
+from collections import namedtuple
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.models import Label, Status, Task, UserTaskCounter
+from task_manager.seed import seeded
+
+Scenario = namedtuple('Scenario', ['name', 'method', 'request'])
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile, stable for small samples."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive every page of the project with the test client on seeded '
+        'data and write p50/p95 latency and query counts to a JSON file'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tasks',
+            type=int,
+            default=2000,
+            help='Tasks to seed before measuring (rolled back afterwards)',
+        )
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Measured requests per scenario, after one warm-up request',
+        )
+        parser.add_argument(
+            '--only',
+            nargs='*',
+            help='Run only the scenarios with these names',
+        )
+        parser.add_argument(
+            '--output',
+            default='bench_http.json',
+            help='Where to write the results',
+        )
+        parser.add_argument(
+            '--compare',
+            help='Results file of an earlier run to print the difference to',
+        )
+
+    def handle(self, *args, **options):
+        with seeded(options['tasks'], users=options['users']):
+            self.pick_fixtures()
+            client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+            client.force_login(self.user)
+            task_count = Task.objects.count()
+
+            results = {}
+            for scenario in self.scenarios():
+                if options['only'] and scenario.name not in options['only']:
+                    continue
+                results[scenario.name] = self.measure(
+                    client, scenario, options['repeat']
+                )
+                self.report(scenario.name, results[scenario.name])
+
+        document = {
+            'meta': {
+                'revision': git_revision(),
+                'created_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'tasks': task_count,
+                'repeat': options['repeat'],
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(document, file, indent=2, sort_keys=True)
+        self.stdout.write(f'Results written to {options["output"]}')
+
+        if options['compare']:
+            self.compare(options['compare'], results)
+
+    def pick_fixtures(self):
+        self.user = (
+            User.objects.annotate(authored=Count('authored_tasks'))
+            .order_by('-authored')
+            .first()
+        )
+        self.task = Task.objects.filter(author=self.user).first()
+        if self.task is None:
+            raise CommandError('No tasks to benchmark, use --tasks')
+        self.status = Status.objects.order_by('-tasks_count').first()
+        self.statuses = list(Status.objects.values_list('pk', flat=True))
+        self.label = Label.objects.order_by('-tasks_count').first()
+        self.executor = (
+            UserTaskCounter.objects.order_by('-assigned_tasks_count')
+            .values_list('user_id', flat=True)
+            .first()
+        )
+        self.bulk_ids = list(
+            Task.objects.values_list('pk', flat=True)[:50]
+        )
+
+    def task_data(self, name, description=''):
+        return {
+            'name': name,
+            'description': description,
+            'status': self.status.pk,
+            'executor': self.executor or '',
+            'labels': [self.label.pk] if self.label else [],
+        }
+
+    def new_task(self):
+        return Task.objects.create(
+            name=f'bench-delete-{time.perf_counter_ns()}',
+            status=self.status,
+            author=self.user,
+        )
+
+    def scenarios(self):
+        tasks = reverse('tasks_list')
+        filtered = {'status': self.status.pk, 'executor': self.executor or ''}
+        if self.label:
+            filtered['label'] = self.label.pk
+        detail = reverse('task_detail', args=[self.task.pk])
+        update = reverse('task_update', args=[self.task.pk])
+        create = reverse('task_create')
+
+        def get(url, params=None):
+            return lambda i: (url, params)
+
+        return [
+            Scenario('index', 'get', get(reverse('index'))),
+            Scenario('login', 'get', get(reverse('login'))),
+            Scenario('users_list', 'get', get(reverse('users_list'))),
+            Scenario('statuses_list', 'get', get(reverse('statuses_list'))),
+            Scenario('labels_list', 'get', get(reverse('labels_list'))),
+            Scenario('tasks_list', 'get', get(tasks)),
+            Scenario('tasks_list_filtered', 'get', get(tasks, filtered)),
+            Scenario('tasks_list_self', 'get', get(tasks, {'self_tasks': 'on'})),
+            Scenario('tasks_list_search', 'get', get(tasks, {'q': 'seeded'})),
+            Scenario('task_detail', 'get', get(detail)),
+            Scenario('tasks_api', 'get', get(
+                reverse('tasks_api'), {'limit': 100}
+            )),
+            Scenario('tasks_export_csv', 'get', get(tasks, {'export': 'csv'})),
+            Scenario('task_create_form', 'get', get(create)),
+            Scenario('task_create', 'post', lambda i: (
+                create,
+                self.task_data(f'bench-create-{time.perf_counter_ns()}')
+            )),
+            Scenario('task_update_form', 'get', get(update)),
+            Scenario('task_update', 'post', lambda i: (
+                update,
+                self.task_data(self.task.name, f'Benchmark run {i}')
+            )),
+            Scenario('task_delete', 'post', lambda i: (
+                reverse('task_delete', args=[self.new_task().pk]),
+                {}
+            )),
+            Scenario('tasks_bulk_status', 'post', lambda i: (
+                reverse('tasks_bulk'),
+                {
+                    'action': 'status',
+                    'tasks': self.bulk_ids,
+                    'status': self.statuses[i % len(self.statuses)],
+                }
+            )),
+        ]
+
+    def measure(self, client, scenario, repeat):
+        timings, queries = [], []
+        for i in range(repeat + 1):
+            # Building the request may write setup rows; it is not timed.
+            url, data = scenario.request(i)
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = getattr(client, scenario.method)(url, data)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                elapsed = time.perf_counter() - started
+            if i == 0:
+                continue
+            timings.append(elapsed * 1000)
+            queries.append(len(context.captured_queries))
+
+        return {
+            'method': scenario.method.upper(),
+            'status': response.status_code,
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'mean_ms': round(sum(timings) / len(timings), 2),
+            'queries': max(queries),
+        }
+
+    def report(self, name, result):
+        self.stdout.write(
+            f'{name:<22} {result["status"]}  '
+            f'p50 {result["p50_ms"]:8.2f} ms  '
+            f'p95 {result["p95_ms"]:8.2f} ms  '
+            f'{result["queries"]:4} queries'
+        )
+
+    def compare(self, path, results):
+        with open(path, encoding='utf-8') as file:
+            previous = json.load(file)['results']
+
+        self.stdout.write(f'\nCompared to {path}:')
+        for name, result in results.items():
+            before = previous.get(name)
+            if before is None:
+                self.stdout.write(f'{name:<22} new')
+                continue
+            change = (
+                (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100
+                if before['p50_ms'] else 0
+            )
+            line = (
+                f'{name:<22} p50 {before["p50_ms"]:8.2f} -> '
+                f'{result["p50_ms"]:8.2f} ms ({change:+.0f}%)  '
+                f'queries {before["queries"]} -> {result["queries"]}'
+            )
+            if result['queries'] > before['queries'] or change > 20:
+                line = self.style.WARNING(line)
+            self.stdout.write(line)
@@ -0,0 +1,231 @@
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.management.commands.bench_http import git_revision, percentile
+from task_manager.models import Task
+
+SERVERS = {
+    'wsgi': ('gunicorn', 'task_manager.wsgi:application'),
+    'asgi': ('uvicorn', 'task_manager.asgi:application'),
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput of the read pages under gunicorn (WSGI, sync '
+        'views) and uvicorn (ASGI, async views) on the same data'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--servers',
+            nargs='*',
+            choices=sorted(SERVERS),
+            default=sorted(SERVERS, reverse=True),
+        )
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=4,
+            help='Threads per gunicorn worker',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=32,
+            help='Requests kept in flight at once',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Measured requests per page and server',
+        )
+        parser.add_argument('--startup-timeout', type=float, default=30)
+        parser.add_argument(
+            '--output',
+            default='bench_servers.json',
+            help='Where to write the results',
+        )
+
+    def handle(self, *args, **options):
+        for name in options['servers']:
+            module = SERVERS[name][0]
+            if find_spec(module) is None:
+                raise CommandError(
+                    f'{module} is not installed, it is needed for {name}'
+                )
+
+        user = (
+            User.objects.annotate(authored=Count('authored_tasks'))
+            .order_by('-authored')
+            .first()
+        )
+        task = Task.objects.filter(author=user).first()
+        if task is None:
+            raise CommandError(
+                'Servers read the real database: run seed_load first'
+            )
+        # The session is stored for real so the servers accept it.
+        client = Client()
+        client.force_login(user)
+        session = client.cookies[settings.SESSION_COOKIE_NAME].value
+
+        paths = [
+            reverse('tasks_list'),
+            reverse('task_detail', args=[task.pk]),
+            reverse('users_list'),
+            reverse('statuses_list'),
+            reverse('labels_list'),
+        ]
+        results = {}
+        for name in options['servers']:
+            results[name] = self.bench_server(name, paths, session, options)
+
+        document = {
+            'meta': {
+                'revision': git_revision(),
+                'created_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'tasks': Task.objects.count(),
+                'workers': options['workers'],
+                'threads': options['threads'],
+                'concurrency': options['concurrency'],
+                'requests': options['requests'],
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(document, file, indent=2, sort_keys=True)
+        self.stdout.write(f'Results written to {options["output"]}')
+
+    def command(self, name, port, options):
+        module, application = SERVERS[name]
+        command = [sys.executable, '-m', module, application]
+        if name == 'wsgi':
+            return command + [
+                '--bind', f'127.0.0.1:{port}',
+                '--workers', str(options['workers']),
+                '--threads', str(options['threads']),
+            ]
+        return command + [
+            '--host', '127.0.0.1',
+            '--port', str(port),
+            '--workers', str(options['workers']),
+            '--no-access-log',
+        ]
+
+    def bench_server(self, name, paths, session, options):
+        port = free_port()
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'task_manager.settings',
+            'ASYNC_VIEWS': str(name == 'asgi'),
+            'DEBUG': 'False',
+        }
+        process = subprocess.Popen(
+            self.command(name, port, options),
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            base_url = f'http://127.0.0.1:{port}'
+            self.wait_ready(process, base_url, options['startup_timeout'])
+            results = {}
+            for path in paths:
+                results[path] = self.load(
+                    base_url + path,
+                    session,
+                    options['concurrency'],
+                    options['requests'],
+                )
+                self.report(name, path, results[path])
+            return results
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def wait_ready(self, process, base_url, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(process.stderr.read().decode())
+            try:
+                urlopen(base_url + reverse('index'), timeout=1).close()
+                return
+            except (URLError, ConnectionError):
+                time.sleep(0.2)
+        raise CommandError(f'Server did not start within {timeout}s')
+
+    def load(self, url, session, concurrency, total):
+        headers = {
+            'Host': settings.ALLOWED_HOSTS[0],
+            'Cookie': f'{settings.SESSION_COOKIE_NAME}={session}',
+        }
+
+        def fetch(_):
+            started = time.perf_counter()
+            try:
+                with urlopen(Request(url, headers=headers), timeout=30) as response:
+                    response.read()
+                    ok = response.status == 200
+            except (HTTPError, URLError, ConnectionError):
+                ok = False
+            return time.perf_counter() - started, ok
+
+        with ThreadPoolExecutor(concurrency) as pool:
+            # Warm-up: every worker opens its connections and caches.
+            list(pool.map(fetch, range(concurrency)))
+            started = time.perf_counter()
+            outcomes = list(pool.map(fetch, range(total)))
+            elapsed = time.perf_counter() - started
+
+        timings = [duration * 1000 for duration, _ in outcomes]
+        return {
+            'requests_per_second': round(total / elapsed, 1),
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'errors': sum(not ok for _, ok in outcomes),
+        }
+
+    def report(self, name, path, result):
+        self.stdout.write(
+            f'{name:<5} {path:<22} '
+            f'{result["requests_per_second"]:8.1f} req/s  '
+            f'p50 {result["p50_ms"]:8.2f} ms  '
+            f'p95 {result["p95_ms"]:8.2f} ms  '
+            f'{result["errors"]} errors'
+        )
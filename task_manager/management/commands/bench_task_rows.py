@@ -0,0 +1,67 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from task_manager.fragments import render_task_rows, row_key
+from task_manager.models import Task
+from task_manager.seed import seeded
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare task list row rendering with a cold and a warm fragment '
+        'cache on a seeded board'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tasks',
+            type=int,
+            default=5000,
+            help='Number of tasks to seed and render (rolled back afterwards)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Number of runs to average for each measurement',
+        )
+
+    def handle(self, *args, **options):
+        with seeded(options['tasks']):
+            tasks = list(Task.objects.with_related())
+            cold, warm = [], []
+
+            for _ in range(options['repeat']):
+                cache.delete_many(self.row_keys(tasks))
+                cold.append(self.measure(tasks))
+                warm.append(self.measure(tasks))
+
+            changed = tasks[:len(tasks) // 100]
+            for task in changed:
+                task.name = f'{task.name} (changed)'
+            partial = self.measure(tasks)
+            cache.delete_many(self.row_keys(tasks))
+
+        cold_avg = sum(cold) / len(cold)
+        warm_avg = sum(warm) / len(warm)
+        self.stdout.write(f'Rows rendered: {len(tasks)}')
+        self.stdout.write(f'Cold cache: {cold_avg * 1000:.1f} ms')
+        self.stdout.write(f'Warm cache: {warm_avg * 1000:.1f} ms')
+        self.stdout.write(
+            f'Warm cache, {len(changed)} rows changed: '
+            f'{partial * 1000:.1f} ms'
+        )
+        if warm_avg:
+            self.stdout.write(self.style.SUCCESS(
+                f'Speedup: {cold_avg / warm_avg:.1f}x'
+            ))
+
+    def measure(self, tasks):
+        started = time.perf_counter()
+        render_task_rows(tasks)
+        return time.perf_counter() - started
+
+    def row_keys(self, tasks):
+        return [row_key(task) for task in tasks]
@@ -0,0 +1,91 @@
+import itertools
+import re
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+
+from task_manager.filters import TaskFilter
+from task_manager.models import Label, Status, Task
+from task_manager.seed import seeded
+from task_manager.tasks_views import TaskListView
+
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (\w+)(?! USING)(?:\s|$)'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN for every TaskFilter combination and report whether '
+        'each plan uses an index or a sequential scan'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed this many tasks first and roll them back afterwards',
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        with seeded(options['seed']):
+            self.explain_all()
+
+    def explain_all(self):
+        values = self.sample_values()
+        request = RequestFactory().get('/')
+        request.user = values.pop('user')
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+
+        for size in range(len(values) + 2):
+            for fields in itertools.combinations(
+                [*values, 'self_tasks'], size
+            ):
+                data = {
+                    field: 'on' if field == 'self_tasks' else values[field]
+                    for field in fields
+                }
+                filterset = TaskFilter(
+                    data,
+                    queryset=Task.objects.all(),
+                    request=request
+                )
+                queryset = filterset.qs.order_by('created_at', 'pk')
+                plan = queryset[:TaskListView.paginate_by].explain()
+                self.report(' + '.join(fields) or '(none)', plan, pattern)
+
+    def sample_values(self):
+        values = {
+            'status': Status.objects.values_list('pk', flat=True).first(),
+            'executor': (
+                Task.objects.filter(executor__isnull=False)
+                .values_list('executor', flat=True).first()
+            ),
+            'label': Label.objects.values_list('pk', flat=True).first(),
+            'user': User.objects.filter(authored_tasks__isnull=False).first(),
+        }
+        if None in values.values():
+            raise CommandError(
+                'Not enough data to explain filters, use --seed'
+            )
+        return values
+
+    def report(self, name, plan, pattern):
+        if pattern is None:
+            self.stdout.write(f'{name}: unknown ({connection.vendor})')
+        else:
+            tables = sorted(set(pattern.findall(plan)))
+            if tables:
+                self.stdout.write(self.style.WARNING(
+                    f'{name}: sequential scan on {", ".join(tables)}'
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{name}: index'))
+
+        if self.verbosity > 1:
+            self.stdout.write(plan)
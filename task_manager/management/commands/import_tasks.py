@@ -0,0 +1,286 @@
+import csv
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager.conditional import bump
+from task_manager.counters import rebuild_task_counters
+from task_manager.models import Label, Status, Task
+from task_manager.saved_filters import rebuild_results
+
+FORMATS = ('csv', 'ndjson', 'json')
+
+
+def read_csv(stream):
+    for row in csv.DictReader(stream):
+        labels = row.get('labels') or ''
+        row['labels'] = [label.strip() for label in labels.split(',')]
+        yield row
+
+
+# A reader yields a ValueError in place of a record it cannot decode; the
+# row is then reported and skipped like any other invalid row.
+
+
+def read_ndjson(stream):
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as error:
+            record = ValueError(f'invalid JSON: {error}')
+        yield record
+
+
+def read_json(stream, buffer_size=64 * 1024):
+    """Yield the objects of a top-level JSON array without loading it all."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+
+    while True:
+        chunk = stream.read(buffer_size)
+        buffer += chunk
+        while True:
+            buffer = buffer.lstrip()
+            if not started:
+                if not buffer:
+                    break
+                if buffer[0] != '[':
+                    raise CommandError('Expected a JSON array')
+                buffer = buffer[1:]
+                started = True
+                continue
+            buffer = buffer.lstrip(',').lstrip()
+            if not buffer or buffer[0] == ']':
+                break
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError as error:
+                if chunk:
+                    break
+                # Nothing after a broken element can be told apart.
+                yield ValueError(f'invalid JSON, rest of input skipped: {error}')
+                return
+            yield obj
+            buffer = buffer[end:]
+        if not chunk:
+            return
+
+
+READERS = {'csv': read_csv, 'ndjson': read_ndjson, 'json': read_json}
+
+
+def _text(record, key):
+    value = record.get(key)
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise ValueError(f'{key} must be a string')
+    return value
+
+
+class Command(BaseCommand):
+    help = (
+        'Import tasks from CSV, NDJSON or a JSON array in batches. '
+        'Statuses, labels and users are resolved by name'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, "-" for stdin')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='Input format, guessed from the file extension by default',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Tasks written per bulk insert and transaction',
+        )
+        parser.add_argument(
+            '--author',
+            help='Username to use when a row has no author',
+        )
+        parser.add_argument(
+            '--create-missing',
+            action='store_true',
+            help='Create statuses and labels that do not exist yet',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate the input without writing anything',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        input_format = options['format'] or Path(path).suffix.lstrip('.')
+        if input_format == 'jsonl':
+            input_format = 'ndjson'
+        if input_format not in READERS:
+            raise CommandError(
+                f'Unknown format "{input_format}", use --format'
+            )
+
+        self.options = options
+        self.load_lookups()
+        started = time.perf_counter()
+
+        if path == '-':
+            stats = self.run(READERS[input_format](sys.stdin))
+        else:
+            with open(path, encoding='utf-8', newline='') as stream:
+                stats = self.run(READERS[input_format](stream))
+
+        elapsed = time.perf_counter() - started
+        if stats['imported'] and not options['dry_run']:
+            rebuild_task_counters()
+            rebuild_results()
+            bump('task')
+
+        rate = stats['rows'] / elapsed if elapsed else 0
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(
+            f'{verb} {stats["imported"]} of {stats["rows"]} rows '
+            f'in {elapsed:.2f} s ({rate:.0f} rows/s), '
+            f'{stats["errors"]} errors'
+        )
+
+    def load_lookups(self):
+        self.statuses = dict(Status.objects.values_list('name', 'pk'))
+        self.labels = dict(Label.objects.values_list('name', 'pk'))
+        self.users = {}
+        full_names = Counter()
+        rows = User.objects.values_list(
+            'pk', 'username', 'first_name', 'last_name'
+        )
+        for pk, username, first_name, last_name in rows:
+            full_name = f'{first_name} {last_name}'.strip()
+            self.users[username] = pk
+            if full_name:
+                full_names[full_name] += 1
+                self.users.setdefault(full_name, pk)
+        # A full name shared by several users cannot identify anyone.
+        for full_name, count in full_names.items():
+            if count > 1 and self.users.get(full_name) is not None:
+                self.users[full_name] = None
+
+        self.default_author = None
+        if self.options['author']:
+            self.default_author = self.users.get(self.options['author'])
+            if self.default_author is None:
+                raise CommandError(
+                    f'Unknown author "{self.options["author"]}"'
+                )
+
+    def run(self, records):
+        stats = Counter(rows=0, imported=0, errors=0)
+        seen_names = set()
+        batch = []
+
+        for number, record in enumerate(records, start=1):
+            stats['rows'] += 1
+            try:
+                batch.append(self.build(record, seen_names))
+            except ValueError as error:
+                stats['errors'] += 1
+                self.stderr.write(f'Row {number}: {error}')
+            if len(batch) >= self.options['batch_size']:
+                stats['imported'] += self.write(batch, stats)
+                batch = []
+
+        if batch:
+            stats['imported'] += self.write(batch, stats)
+        return stats
+
+    def build(self, record, seen_names):
+        if isinstance(record, ValueError):
+            raise record
+        if not isinstance(record, dict):
+            raise ValueError('expected an object')
+        name = _text(record, 'name').strip()
+        if not name:
+            raise ValueError('name is required')
+        if name in seen_names:
+            raise ValueError(f'duplicate task name "{name}"')
+        seen_names.add(name)
+
+        author = _text(record, 'author')
+        author_id = self.resolve_user(author) if author else self.default_author
+        if author_id is None:
+            raise ValueError('author is required')
+        executor = _text(record, 'executor')
+        labels = record.get('labels') or []
+        if not isinstance(labels, list) or not all(
+            isinstance(label, str) for label in labels
+        ):
+            raise ValueError('labels must be a list of names')
+
+        return (
+            Task(
+                name=name,
+                description=_text(record, 'description'),
+                status_id=self.resolve(
+                    self.statuses, Status, _text(record, 'status'), 'status'
+                ),
+                author_id=author_id,
+                executor_id=self.resolve_user(executor) if executor else None,
+            ),
+            [
+                self.resolve(self.labels, Label, label, 'label')
+                for label in labels
+                if label
+            ],
+        )
+
+    def resolve(self, lookup, model, name, kind):
+        name = (name or '').strip()
+        if not name:
+            raise ValueError(f'{kind} is required')
+        if name not in lookup:
+            if not self.options['create_missing']:
+                raise ValueError(f'unknown {kind} "{name}"')
+            if self.options['dry_run']:
+                lookup[name] = None
+            else:
+                lookup[name] = model.objects.create(name=name).pk
+        return lookup[name]
+
+    def resolve_user(self, name):
+        user_id = self.users.get(name.strip())
+        if user_id is None:
+            raise ValueError(f'unknown or ambiguous user "{name}"')
+        return user_id
+
+    def write(self, batch, stats):
+        names = [task.name for task, _ in batch]
+        existing = set(
+            Task.objects.filter(name__in=names).values_list('name', flat=True)
+        )
+        if existing:
+            stats['errors'] += len(existing)
+            for name in sorted(existing):
+                self.stderr.write(f'Task "{name}" already exists')
+            batch = [row for row in batch if row[0].name not in existing]
+
+        if self.options['dry_run'] or not batch:
+            return len(batch)
+
+        through = Task.labels.through
+        with transaction.atomic():
+            tasks = Task.objects.bulk_create([task for task, _ in batch])
+            through.objects.bulk_create([
+                through(task_id=task.pk, label_id=label_id)
+                for task, (_, label_ids) in zip(tasks, batch)
+                for label_id in set(label_ids)
+            ])
+        return len(tasks)
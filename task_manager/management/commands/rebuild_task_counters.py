@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from task_manager.counters import rebuild_task_counters
+from task_manager.jobs import enqueue
+
+
+class Command(BaseCommand):
+    help = 'Recompute task counters on statuses, labels and executors'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--background',
+            action='store_true',
+            help='Queue the rebuild for run_worker instead of running it',
+        )
+
+    def handle(self, *args, **options):
+        if options['background']:
+            job = enqueue('rebuild_task_counters')
+            self.stdout.write(self.style.SUCCESS(f'Queued job {job.pk}'))
+            return
+        with transaction.atomic():
+            rebuild_task_counters()
+        self.stdout.write(self.style.SUCCESS('Task counters rebuilt'))
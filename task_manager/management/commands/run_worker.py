@@ -0,0 +1,122 @@
+import logging
+import os
+import signal
+import socket
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+
+from task_manager.jobs import claim, housekeeping, run
+from task_manager.models import Job
+
+logger = logging.getLogger(__name__)
+
+# Consecutive database errors after which a --once run gives up.
+ONCE_MAX_ERRORS = 3
+# Longest wait, in seconds, between attempts after database errors.
+MAX_BACKOFF = 60
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs until stopped (SIGTERM or Ctrl+C)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.JOB_CONCURRENCY,
+            help='Jobs run at once, one thread and connection each',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait when no job is due',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the jobs that are due now and exit',
+        )
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError('Concurrency must be at least 1')
+
+        self.stop = threading.Event()
+        self.outcomes = Counter()
+        self.lock = threading.Lock()
+        name = f'{socket.gethostname()}:{os.getpid()}'
+        previous = {
+            signum: signal.signal(signum, self.request_stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            if options['concurrency'] == 1:
+                self.work(f'{name}:0', options)
+            else:
+                threads = [
+                    threading.Thread(
+                        target=self.work_in_thread,
+                        args=(f'{name}:{number}', options),
+                    )
+                    for number in range(options['concurrency'])
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Jobs done: {self.outcomes[Job.DONE]}, '
+            f'retried: {self.outcomes[Job.QUEUED]}, '
+            f'failed: {self.outcomes[Job.FAILED]}'
+        ))
+
+    def request_stop(self, signum, frame):
+        self.stop.set()
+
+    def work(self, worker, options):
+        errors = 0
+        housekeep = True
+        while not self.stop.is_set():
+            try:
+                if housekeep:
+                    housekeeping()
+                    housekeep = False
+                jobs = claim(worker)
+                if not jobs:
+                    if options['once']:
+                        return
+                    self.stop.wait(options['poll_interval'])
+                    housekeep = True
+                    continue
+                for job in jobs:
+                    state = run(job)
+                    if state is not None:
+                        with self.lock:
+                            self.outcomes[state] += 1
+                errors = 0
+            except DatabaseError:
+                # A locked database or a dropped connection: start over on
+                # a new connection after a growing pause.
+                errors += 1
+                logger.exception('Worker %s: database error', worker)
+                connection.close()
+                if options['once'] and errors >= ONCE_MAX_ERRORS:
+                    return
+                self.stop.wait(
+                    min(options['poll_interval'] * 2 ** errors, MAX_BACKOFF)
+                )
+
+    def work_in_thread(self, worker, options):
+        try:
+            self.work(worker, options)
+        finally:
+            connection.close()
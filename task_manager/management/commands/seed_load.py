@@ -0,0 +1,60 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from task_manager.conditional import bump
+from task_manager.seed import seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate synthetic users, statuses, labels and tasks with a skewed, '
+        'production-like distribution and keep them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10000)
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--statuses', type=int, default=6)
+        parser.add_argument('--labels', type=int, default=30)
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk insert',
+        )
+        parser.add_argument(
+            '--random-seed',
+            type=int,
+            help='Make the generated distribution reproducible',
+        )
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['statuses']) < 1:
+            raise CommandError('At least one user and one status are needed')
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            counts = seed(
+                options['tasks'],
+                users=options['users'],
+                statuses=options['statuses'],
+                labels=options['labels'],
+                batch_size=options['batch_size'],
+                rng=random.Random(options['random_seed']),
+            )
+            for name in ('task', 'status', 'label', 'user'):
+                bump(name)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(', '.join(
+            f'{count} {name}' for name, count in counts.items()
+        ))
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded in {elapsed:.2f} s '
+            f'({counts["tasks"] / elapsed:.0f} tasks/s)'
+        ))
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_counters(apps, schema_editor):
+    Status = apps.get_model("task_manager", "Status")
+    Label = apps.get_model("task_manager", "Label")
+    Task = apps.get_model("task_manager", "Task")
+    UserTaskCounter = apps.get_model("task_manager", "UserTaskCounter")
+
+    for status in Status.objects.all():
+        status.tasks_count = Task.objects.filter(status=status).count()
+        status.save(update_fields=["tasks_count"])
+
+    for label in Label.objects.all():
+        label.tasks_count = Task.labels.through.objects.filter(label=label).count()
+        label.save(update_fields=["tasks_count"])
+
+    assigned = (
+        Task.objects.filter(executor__isnull=False)
+        .values("executor")
+        .annotate(count=models.Count("id"))
+    )
+    UserTaskCounter.objects.bulk_create(
+        UserTaskCounter(user_id=row["executor"], assigned_tasks_count=row["count"])
+        for row in assigned
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("task_manager", "0005_task_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserTaskCounter",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="task_counter",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="User",
+                    ),
+                ),
+                (
+                    "assigned_tasks_count",
+                    models.IntegerField(default=0, verbose_name="Assigned tasks"),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="label",
+            name="tasks_count",
+            field=models.IntegerField(default=0, editable=False, verbose_name="Tasks"),
+        ),
+        migrations.AddField(
+            model_name="status",
+            name="tasks_count",
+            field=models.IntegerField(default=0, editable=False, verbose_name="Tasks"),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:45
+
+from django.db import migrations
+
+from task_manager.migrations._fts import (
+    SQLITE_CREATE_TRIGGERS,
+    SQLITE_DROP_TRIGGERS,
+)
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE task_manager_task
+    ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('russian', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX task_search_vector_idx "
+    "ON task_manager_task USING gin (search_vector)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX task_search_vector_idx",
+    "ALTER TABLE task_manager_task DROP COLUMN search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE task_manager_task_fts USING fts5(
+        name, description, content='task_manager_task', content_rowid='id'
+    )
+    """,
+    *SQLITE_CREATE_TRIGGERS,
+    "INSERT INTO task_manager_task_fts (task_manager_task_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    *SQLITE_DROP_TRIGGERS,
+    "DROP TABLE task_manager_task_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(
+            schema_editor.connection.vendor, []
+        ):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0006_task_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"postgresql": POSTGRES_BACKWARD, "sqlite": SQLITE_BACKWARD}),
+        ),
+    ]
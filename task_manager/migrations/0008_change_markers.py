@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:47
+
+from django.db import migrations, models
+
+from task_manager.migrations._fts import reinstall_sqlite_triggers
+
+
+def copy_created_at(apps, schema_editor):
+    Task = apps.get_model("task_manager", "Task")
+    Task.objects.update(updated_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0007_task_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeMarker",
+            fields=[
+                (
+                    "name",
+                    models.CharField(
+                        max_length=50,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Name",
+                    ),
+                ),
+                (
+                    "version",
+                    models.BigIntegerField(default=0, verbose_name="Version"),
+                ),
+                ("changed_at", models.DateTimeField(verbose_name="Changed at")),
+            ],
+        ),
+        # SQLite rebuilds the task table for this field in both directions.
+        migrations.RunPython(migrations.RunPython.noop, reinstall_sqlite_triggers),
+        migrations.AddField(
+            model_name="task",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+        migrations.RunPython(reinstall_sqlite_triggers, migrations.RunPython.noop),
+    ]
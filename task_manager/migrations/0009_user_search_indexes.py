@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:05
+
+from django.db import migrations
+
+# Indexes for the user directory's prefix search (istartswith). They
+# match the expressions Django compiles the lookup to: UPPER(col::text)
+# LIKE on PostgreSQL, a case-insensitive LIKE on SQLite.
+SEARCH_COLUMNS = ("username", "first_name", "last_name")
+
+POSTGRES_FORWARD = [
+    f"CREATE INDEX auth_user_{column}_prefix_idx "
+    f'ON auth_user (UPPER("{column}"::text) text_pattern_ops)'
+    for column in SEARCH_COLUMNS
+]
+
+SQLITE_FORWARD = [
+    f"CREATE INDEX auth_user_{column}_prefix_idx "
+    f'ON auth_user ("{column}" COLLATE NOCASE)'
+    for column in SEARCH_COLUMNS
+]
+
+BACKWARD = [
+    f"DROP INDEX auth_user_{column}_prefix_idx" for column in SEARCH_COLUMNS
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(
+            schema_editor.connection.vendor, []
+        ):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("task_manager", "0008_change_markers"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"postgresql": BACKWARD, "sqlite": BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("task_manager", "0009_user_search_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "action",
+                    models.PositiveSmallIntegerField(
+                        choices=[(1, "Created"), (2, "Updated"), (3, "Deleted")],
+                        verbose_name="Action",
+                    ),
+                ),
+                ("changes", models.JSONField(default=dict, verbose_name="Changes")),
+                ("created_at", models.DateTimeField(verbose_name="Created at")),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="User",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="events",
+                        to="task_manager.task",
+                        verbose_name="Task",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Task event",
+                "verbose_name_plural": "Task events",
+                "indexes": [
+                    models.Index(fields=["task", "-id"], name="task_event_task_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:19
+
+from django.db import migrations, models
+
+from task_manager.migrations._fts import reinstall_sqlite_triggers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0010_task_events"),
+    ]
+
+    operations = [
+        # SQLite rebuilds the task table for this field in both directions.
+        migrations.RunPython(migrations.RunPython.noop, reinstall_sqlite_triggers),
+        migrations.AddField(
+            model_name="task",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Version"
+            ),
+        ),
+        migrations.RunPython(reinstall_sqlite_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0011_task_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Job",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, verbose_name="Name")),
+                ("payload", models.JSONField(default=dict, verbose_name="Payload")),
+                (
+                    "state",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (1, "Queued"),
+                            (2, "Running"),
+                            (3, "Done"),
+                            (4, "Failed"),
+                        ],
+                        default=1,
+                        verbose_name="State",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Attempts"
+                    ),
+                ),
+                (
+                    "max_attempts",
+                    models.PositiveSmallIntegerField(
+                        default=3, verbose_name="Max attempts"
+                    ),
+                ),
+                ("run_at", models.DateTimeField(verbose_name="Run at")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Started at"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Finished at"
+                    ),
+                ),
+                (
+                    "waited",
+                    models.FloatField(blank=True, null=True, verbose_name="Waited"),
+                ),
+                (
+                    "duration",
+                    models.FloatField(blank=True, null=True, verbose_name="Duration"),
+                ),
+                (
+                    "worker",
+                    models.CharField(blank=True, max_length=100, verbose_name="Worker"),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Error")),
+            ],
+            options={
+                "verbose_name": "Job",
+                "verbose_name_plural": "Jobs",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("state", 1)),
+                        fields=["run_at", "id"],
+                        name="job_queued_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,160 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0013_notifications"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SavedFilter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, verbose_name="Name")),
+                (
+                    "query",
+                    models.CharField(blank=True, max_length=500, verbose_name="Query"),
+                ),
+                (
+                    "search",
+                    models.CharField(blank=True, max_length=200, verbose_name="Search"),
+                ),
+                (
+                    "self_tasks",
+                    models.BooleanField(default=False, verbose_name="Only my tasks"),
+                ),
+                (
+                    "is_default",
+                    models.BooleanField(default=False, verbose_name="Default"),
+                ),
+                ("uses", models.PositiveIntegerField(default=0, verbose_name="Uses")),
+                (
+                    "materialized",
+                    models.BooleanField(default=False, verbose_name="Precomputed"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "executor",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Executor",
+                    ),
+                ),
+                (
+                    "label",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="task_manager.label",
+                        verbose_name="Label",
+                    ),
+                ),
+                (
+                    "status",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="task_manager.status",
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="saved_filters",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="User",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Saved filter",
+                "verbose_name_plural": "Saved filters",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="SavedFilterResult",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "saved_filter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="results",
+                        to="task_manager.savedfilter",
+                        verbose_name="Saved filter",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="task_manager.task",
+                        verbose_name="Task",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Saved filter result",
+                "verbose_name_plural": "Saved filter results",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="savedfilter",
+            constraint=models.UniqueConstraint(
+                fields=("user", "name"), name="saved_filter_unique_name"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="savedfilter",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_default", True)),
+                fields=("user",),
+                name="saved_filter_one_default",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="savedfilterresult",
+            constraint=models.UniqueConstraint(
+                fields=("saved_filter", "task"), name="saved_filter_result_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0014_saved_filters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="unique_key",
+            field=models.CharField(
+                blank=True,
+                max_length=100,
+                null=True,
+                unique=True,
+                verbose_name="Unique key",
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+"""SQLite FTS5 triggers for task search, shared by migrations.
+
+SQLite applies most Task schema changes by rebuilding the table, which
+drops its triggers. Migrations that alter Task must reinstall them.
+"""
+
+SQLITE_DROP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS task_manager_task_fts_update",
+    "DROP TRIGGER IF EXISTS task_manager_task_fts_delete",
+    "DROP TRIGGER IF EXISTS task_manager_task_fts_insert",
+]
+
+SQLITE_CREATE_TRIGGERS = [
+    """
+    CREATE TRIGGER task_manager_task_fts_insert
+    AFTER INSERT ON task_manager_task BEGIN
+        INSERT INTO task_manager_task_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER task_manager_task_fts_delete
+    AFTER DELETE ON task_manager_task BEGIN
+        INSERT INTO task_manager_task_fts
+            (task_manager_task_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER task_manager_task_fts_update
+    AFTER UPDATE OF name, description ON task_manager_task BEGIN
+        INSERT INTO task_manager_task_fts
+            (task_manager_task_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO task_manager_task_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+
+def reinstall_sqlite_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in SQLITE_DROP_TRIGGERS + SQLITE_CREATE_TRIGGERS:
+        schema_editor.execute(statement)
@@ -13,6 +13,11 @@ class Status(models.Model):
         auto_now_add=True,
         verbose_name=_('Created at')
     )
+    tasks_count = models.IntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Tasks')
+    )
 
     class Meta:
         verbose_name = _('Status')
@@ -33,6 +38,11 @@ class Label(models.Model):
         auto_now_add=True,
         verbose_name=_('Created at')
     )
+    tasks_count = models.IntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Tasks')
+    )
 
     class Meta:
         verbose_name = _('Label')
@@ -43,6 +53,15 @@ class Label(models.Model):
         return self.name
 
 
+class TaskQuerySet(models.QuerySet):
+    def with_related(self):
+        return self.select_related(
+            'status',
+            'author',
+            'executor',
+        ).prefetch_related('labels')
+
+
 class Task(models.Model):
     name = models.CharField(
         max_length=200,
@@ -82,11 +101,465 @@ class Task(models.Model):
         auto_now_add=True,
         verbose_name=_('Created at')
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Updated at')
+    )
+    version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Version')
+    )
+
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
         verbose_name = _('Task')
         verbose_name_plural = _('Tasks')
         ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['created_at', 'id'],
+                name='task_created_idx'
+            ),
+            models.Index(
+                fields=['status', 'created_at', 'id'],
+                name='task_status_created_idx'
+            ),
+            models.Index(
+                fields=['executor', 'created_at', 'id'],
+                name='task_executor_created_idx'
+            ),
+            models.Index(
+                fields=['author', 'created_at', 'id'],
+                name='task_author_created_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Move the row to the next version on every update.
+
+        The bump is part of the UPDATE itself, so a stale instance cannot
+        write an old version back. A version already taken by
+        claim_version() is saved as it is.
+        """
+        claimed = self.__dict__.pop('_claimed_version', None)
+        bump = not self._state.adding and claimed != self.version
+        if bump:
+            self.version = models.F('version') + 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'version'}
+        super().save(*args, **kwargs)
+        if bump:
+            self.refresh_from_db(fields=['version'])
+
+    def claim_version(self, expected):
+        """Move the row to the next version if it is still at expected.
+
+        A conditional UPDATE instead of a row lock held while the form is
+        open: it fails when someone saved the task since the user loaded
+        it. Call it in the transaction that then saves the task.
+        """
+        claimed = Task.objects.filter(pk=self.pk, version=expected).update(
+            version=models.F('version') + 1
+        )
+        if claimed:
+            self.version = self._claimed_version = expected + 1
+        return bool(claimed)
+
+
+class TaskEvent(models.Model):
+    """One change of a task, appended by task_manager.activity.
+
+    changes maps field names to [old, new], related objects by primary
+    key and labels as [added ids, removed ids]. No database constraints
+    on task and actor: events outlive deleted tasks and users, and writing
+    them never locks the referenced rows.
+    """
+
+    CREATED = 1
+    UPDATED = 2
+    DELETED = 3
+    ACTIONS = [
+        (CREATED, _('Created')),
+        (UPDATED, _('Updated')),
+        (DELETED, _('Deleted')),
+    ]
+
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='events',
+        verbose_name=_('Task')
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name='+',
+        verbose_name=_('User')
+    )
+    action = models.PositiveSmallIntegerField(
+        choices=ACTIONS,
+        verbose_name=_('Action')
+    )
+    changes = models.JSONField(
+        default=dict,
+        verbose_name=_('Changes')
+    )
+    created_at = models.DateTimeField(
+        verbose_name=_('Created at')
+    )
+
+    class Meta:
+        verbose_name = _('Task event')
+        verbose_name_plural = _('Task events')
+        indexes = [
+            models.Index(
+                fields=['task', '-id'],
+                name='task_event_task_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.task_id}: {self.get_action_display()}'
+
+
+class UserTaskCounter(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='task_counter',
+        verbose_name=_('User')
+    )
+    assigned_tasks_count = models.IntegerField(
+        default=0,
+        verbose_name=_('Assigned tasks')
+    )
+
+    def __str__(self):
+        return f'{self.user}: {self.assigned_tasks_count}'
+
+
+class ChangeMarker(models.Model):
+    """Last change of a whole model, used to answer conditional GETs."""
+
+    name = models.CharField(
+        max_length=50,
+        primary_key=True,
+        verbose_name=_('Name')
+    )
+    version = models.BigIntegerField(
+        default=0,
+        verbose_name=_('Version')
+    )
+    changed_at = models.DateTimeField(
+        verbose_name=_('Changed at')
+    )
+
+    def __str__(self):
+        return f'{self.name}: {self.version}'
+
+
+class Job(models.Model):
+    """Background work queued in the database, see task_manager.jobs."""
+
+    QUEUED = 1
+    RUNNING = 2
+    DONE = 3
+    FAILED = 4
+    STATES = [
+        (QUEUED, _('Queued')),
+        (RUNNING, _('Running')),
+        (DONE, _('Done')),
+        (FAILED, _('Failed')),
+    ]
+
+    name = models.CharField(
+        max_length=100,
+        verbose_name=_('Name')
+    )
+    payload = models.JSONField(
+        default=dict,
+        verbose_name=_('Payload')
+    )
+    state = models.PositiveSmallIntegerField(
+        choices=STATES,
+        default=QUEUED,
+        verbose_name=_('State')
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('Attempts')
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=3,
+        verbose_name=_('Max attempts')
+    )
+    run_at = models.DateTimeField(
+        verbose_name=_('Run at')
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Created at')
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Started at')
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Finished at')
+    )
+    # Seconds of the last attempt: between run_at and the claim, and running.
+    waited = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name=_('Waited')
+    )
+    duration = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name=_('Duration')
+    )
+    worker = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name=_('Worker')
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name=_('Error')
+    )
+    # Set on a queued job that must not be queued twice, see enqueue();
+    # cleared when a worker claims it.
+    unique_key = models.CharField(
+        max_length=100,
+        null=True,
+        blank=True,
+        unique=True,
+        verbose_name=_('Unique key')
+    )
+
+    class Meta:
+        verbose_name = _('Job')
+        verbose_name_plural = _('Jobs')
+        indexes = [
+            # Only the queued jobs, the rows every worker poll scans.
+            models.Index(
+                fields=['run_at', 'id'],
+                condition=models.Q(state=1),
+                name='job_queued_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
+
+
+class Notification(models.Model):
+    """A change a user is told about in the next digest, see notifications.
+
+    The task's name and new status are copied, so the digest reads the
+    same when the task has changed or gone since.
+    """
+
+    ASSIGNED = 1
+    STATUS_CHANGED = 2
+    KINDS = [
+        (ASSIGNED, _('Assigned')),
+        (STATUS_CHANGED, _('Status changed')),
+    ]
+
+    recipient = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name=_('User')
+    )
+    kind = models.PositiveSmallIntegerField(
+        choices=KINDS,
+        verbose_name=_('Kind')
+    )
+    task_id = models.BigIntegerField(
+        verbose_name=_('Task')
+    )
+    task_name = models.CharField(
+        max_length=200,
+        verbose_name=_('Name')
+    )
+    status_name = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name=_('Status')
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        verbose_name=_('Author')
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Created at')
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Sent at')
+    )
+
+    class Meta:
+        verbose_name = _('Notification')
+        verbose_name_plural = _('Notifications')
+        indexes = [
+            # Only the pending ones, which every digest run reads.
+            models.Index(
+                fields=['recipient', 'id'],
+                condition=models.Q(sent_at__isnull=True),
+                name='notification_pending_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.task_name}'
+
+
+class SavedFilter(models.Model):
+    """A named task list filter of one user, see task_manager.saved_filters.
+
+    query is the normalized TaskFilter query string; the values it holds
+    are copied into columns so result sets can be matched in SQL. Like
+    TaskEvent, the copies carry no database constraints: a filter naming
+    a deleted status or label simply matches nothing.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='saved_filters',
+        verbose_name=_('User')
+    )
+    name = models.CharField(
+        max_length=100,
+        verbose_name=_('Name')
+    )
+    query = models.CharField(
+        max_length=500,
+        blank=True,
+        verbose_name=_('Query')
+    )
+    search = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name=_('Search')
+    )
+    status = models.ForeignKey(
+        Status,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        related_name='+',
+        verbose_name=_('Status')
+    )
+    executor = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        related_name='+',
+        verbose_name=_('Executor')
+    )
+    label = models.ForeignKey(
+        Label,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        related_name='+',
+        verbose_name=_('Label')
+    )
+    self_tasks = models.BooleanField(
+        default=False,
+        verbose_name=_('Only my tasks')
+    )
+    is_default = models.BooleanField(
+        default=False,
+        verbose_name=_('Default')
+    )
+    uses = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Uses')
+    )
+    materialized = models.BooleanField(
+        default=False,
+        verbose_name=_('Precomputed')
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Created at')
+    )
+
+    class Meta:
+        verbose_name = _('Saved filter')
+        verbose_name_plural = _('Saved filters')
+        ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'name'],
+                name='saved_filter_unique_name'
+            ),
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=models.Q(is_default=True),
+                name='saved_filter_one_default'
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class SavedFilterResult(models.Model):
+    """A task in the precomputed result set of a saved filter."""
+
+    saved_filter = models.ForeignKey(
+        SavedFilter,
+        on_delete=models.CASCADE,
+        related_name='results',
+        verbose_name=_('Saved filter')
+    )
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        verbose_name=_('Task')
+    )
+
+    class Meta:
+        verbose_name = _('Saved filter result')
+        verbose_name_plural = _('Saved filter results')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['saved_filter', 'task'],
+                name='saved_filter_result_unique'
+            ),
+        ]
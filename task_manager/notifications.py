@@ -0,0 +1,145 @@
+"""Assignment and status change notifications, sent as digests.
+
+Write paths store a Notification row per recipient, in the same
+transaction as the change, and make sure a send_digests job is queued
+NOTIFICATION_DIGEST_INTERVAL seconds ahead. Everything that arrives
+until the job runs goes out together: one message per recipient, all
+over a single connection to the mail server. Each recipient's digest is
+marked sent as soon as it went out, so a retry after a failed delivery
+only sends the rest. Nobody is told about their own changes, and users
+without an email address are skipped.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone, translation
+from django.utils.translation import gettext as _
+
+from task_manager.jobs import enqueue, register_job
+from task_manager.models import Job, Notification
+
+
+def assigned(task_id, task_name, executor_id, actor):
+    """Notifications for a task given to executor_id."""
+    return _build(
+        Notification.ASSIGNED,
+        task_id,
+        task_name,
+        '',
+        [executor_id],
+        actor
+    )
+
+
+def status_changed(task_id, task_name, status, recipient_ids, actor):
+    """Notifications for a task moved to status, to author and executor."""
+    return _build(
+        Notification.STATUS_CHANGED,
+        task_id,
+        task_name,
+        str(status),
+        recipient_ids,
+        actor
+    )
+
+
+def _build(kind, task_id, task_name, status_name, recipient_ids, actor):
+    actor_id = getattr(actor, 'pk', actor)
+    return [
+        Notification(
+            recipient_id=recipient_id,
+            kind=kind,
+            task_id=task_id,
+            task_name=task_name,
+            status_name=status_name,
+            actor_id=actor_id,
+        )
+        for recipient_id in dict.fromkeys(recipient_ids)
+        if recipient_id is not None and recipient_id != actor_id
+    ]
+
+
+def form_notifications(task, changes, actor):
+    """Notifications for a task saved through a form with this diff."""
+    notifications = []
+    if 'executor' in changes and task.executor_id:
+        notifications += assigned(task.pk, task.name, task.executor_id, actor)
+    if 'status' in changes:
+        notifications += status_changed(
+            task.pk,
+            task.name,
+            task.status,
+            [task.author_id, task.executor_id],
+            actor
+        )
+    return notifications
+
+
+def notify(notifications):
+    """Store notifications and make sure a digest run is queued."""
+    notifications = list(notifications)
+    if not notifications:
+        return
+    Notification.objects.bulk_create(notifications)
+    if not Job.objects.filter(unique_key='send_digests').exists():
+        enqueue(
+            'send_digests',
+            run_at=timezone.now() + timedelta(
+                seconds=settings.NOTIFICATION_DIGEST_INTERVAL
+            ),
+            unique=True
+        )
+
+
+@register_job(atomic=False)
+def send_digests():
+    """Send every pending notification, one message per recipient.
+
+    Each recipient's digest is sent and marked in its own transaction: if
+    sending fails, the digests sent so far stay marked, the rest stays
+    pending and the job is retried.
+    """
+    recipient_ids = (
+        Notification.objects.filter(sent_at__isnull=True)
+        .order_by('recipient_id')
+        .values_list('recipient_id', flat=True)
+        .distinct()
+    )
+    sent = 0
+    with get_connection() as connection, translation.override(settings.LANGUAGE_CODE):
+        for recipient_id in list(recipient_ids):
+            with transaction.atomic():
+                items = list(
+                    Notification.objects.filter(
+                        recipient_id=recipient_id,
+                        sent_at__isnull=True
+                    )
+                    .select_related('recipient', 'actor')
+                    .select_for_update(skip_locked=True, of=('self',))
+                    .order_by('id')
+                )
+                if not items:
+                    continue
+                recipient = items[0].recipient
+                if recipient.email:
+                    connection.send_messages([digest(recipient, items)])
+                    sent += 1
+                Notification.objects.filter(
+                    pk__in=[item.pk for item in items]
+                ).update(sent_at=timezone.now())
+    return sent
+
+
+def digest(recipient, items):
+    return EmailMessage(
+        subject=_('Task manager: %(count)s updates') % {'count': len(items)},
+        body=render_to_string('task_manager/emails/digest.txt', {
+            'recipient': recipient,
+            'notifications': items,
+        }),
+        to=[recipient.email],
+    )
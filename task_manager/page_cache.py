@@ -0,0 +1,164 @@
+import uuid
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from task_manager.conditional import marker_bumped
+
+PAGE_KEY = 'task_manager:page:{name}:{generation}:{language}:{path}'
+GENERATION_KEY = 'task_manager:page_generation:{name}'
+
+# Per-process counters, keyed by (page name, 'hits' or 'misses').
+stats = Counter()
+
+# Cached pages to drop when a change marker moves, by marker name.
+DEPENDENT_PAGES = defaultdict(set)
+
+
+def page_generation(name):
+    """Token that is part of every cache key of the page.
+
+    A random token rather than a counter: if the cache evicts it, the new
+    one cannot match copies cached before.
+    """
+    key = GENERATION_KEY.format(name=name)
+    generation = cache.get(key)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not cache.add(key, generation, None):
+            generation = cache.get(key, generation)
+    return generation
+
+
+async def apage_generation(name):
+    key = GENERATION_KEY.format(name=name)
+    generation = await cache.aget(key)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not await cache.aadd(key, generation, None):
+            generation = await cache.aget(key, generation)
+    return generation
+
+
+def invalidate_page(name):
+    """Drop every cached copy of a page, whatever its query string."""
+    cache.set(GENERATION_KEY.format(name=name), uuid.uuid4().hex, None)
+
+
+def page_stats():
+    pages = {}
+    for (name, outcome), count in sorted(stats.items()):
+        pages.setdefault(name, {'hits': 0, 'misses': 0})[outcome] = count
+    return pages
+
+
+class AnonymousPageCacheMixin:
+    """Serve anonymous GET requests of a page from the cache.
+
+    Copies are grouped under page_cache_name so invalidate_page() drops
+    them all; that happens whenever one of the view's change_markers is
+    bumped. Pages with flash messages and responses that hand out a
+    CSRF token are never cached. Validators (ETag, Last-Modified) are
+    cached with the page, so a hit can still answer 304.
+    """
+
+    page_cache_name = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.page_cache_name:
+            for marker in getattr(cls, 'change_markers', ()):
+                DEPENDENT_PAGES[marker].add(cls.page_cache_name)
+
+    def get(self, request, *args, **kwargs):
+        if not self.page_cacheable(request):
+            return super().get(request, *args, **kwargs)
+
+        key = self.page_cache_key(page_generation(self.page_cache_name))
+        cached = cache.get(key)
+        if cached is not None:
+            return self.cache_hit(request, cached)
+        return self.cache_miss(key, super().get(request, *args, **kwargs))
+
+    def page_cacheable(self, request):
+        return not (
+            request.user.is_authenticated
+            or len(messages.get_messages(request))
+        )
+
+    def page_cache_key(self, generation):
+        return PAGE_KEY.format(
+            name=self.page_cache_name,
+            generation=generation,
+            language=translation.get_language(),
+            path=self.request.get_full_path(),
+        )
+
+    def cache_hit(self, request, cached):
+        stats[self.page_cache_name, 'hits'] += 1
+        return self.cached_response(request, *cached)
+
+    def cache_miss(self, key, response):
+        stats[self.page_cache_name, 'misses'] += 1
+        if response.status_code == 200 and not response.streaming:
+            if getattr(response, 'is_rendered', True):
+                self.store(key, response)
+            else:
+                response.add_post_render_callback(
+                    lambda rendered: self.store(key, rendered)
+                )
+        return response
+
+    def store(self, key, response):
+        if response.cookies or self.request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+            return
+        cache.set(
+            key,
+            (response.content, dict(response.headers)),
+            settings.PAGE_CACHE_TIMEOUT
+        )
+
+    def cached_response(self, request, content, headers):
+        response = HttpResponse(content, headers=headers)
+        if 'ETag' in headers or 'Last-Modified' in headers:
+            response = get_conditional_response(
+                request,
+                etag=headers.get('ETag'),
+                last_modified=parse_http_date_safe(
+                    headers.get('Last-Modified', '')
+                ),
+                response=response
+            )
+        return response
+
+
+class AsyncAnonymousPageCacheMixin(AnonymousPageCacheMixin):
+    """AnonymousPageCacheMixin for async views, on the async cache API."""
+
+    async def get(self, request, *args, **kwargs):
+        if not self.page_cacheable(request):
+            return await super().get(request, *args, **kwargs)
+
+        key = self.page_cache_key(
+            await apage_generation(self.page_cache_name)
+        )
+        cached = await cache.aget(key)
+        if cached is not None:
+            return self.cache_hit(request, cached)
+        return self.cache_miss(
+            key,
+            await super().get(request, *args, **kwargs)
+        )
+
+
+@receiver(marker_bumped)
+def marker_changed(sender, name, **kwargs):
+    for page in DEPENDENT_PAGES[name]:
+        invalidate_page(page)
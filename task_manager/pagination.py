@@ -0,0 +1,202 @@
+import base64
+import json
+from datetime import date
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.http import Http404
+from django.utils.translation import gettext_lazy as _
+
+DEFAULT_KEYS = ('created_at', 'pk')
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorEncoder(json.JSONEncoder):
+    # Unlike DjangoJSONEncoder, keep full microsecond precision: keyset
+    # comparisons must see exactly the value stored in the row.
+    def default(self, o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _key_name(key):
+    return key.lstrip('-')
+
+
+def encode_cursor(obj, keys=DEFAULT_KEYS, reverse=False):
+    payload = [
+        [getattr(obj, _key_name(key)) for key in keys],
+        int(reverse),
+    ]
+    raw = json.dumps(
+        payload,
+        cls=CursorEncoder,
+        separators=(',', ':')
+    ).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, keys=DEFAULT_KEYS):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values, reverse = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        if len(values) != len(keys):
+            raise ValueError(cursor)
+        return [
+            _to_python(model, _key_name(key), value)
+            for key, value in zip(keys, values)
+        ], bool(reverse)
+    except (TypeError, ValueError, ValidationError):
+        raise InvalidCursor(cursor)
+
+
+def _to_python(model, name, value):
+    # null would become a `__gt=None` lookup, which the ORM rejects.
+    if not isinstance(value, (str, int, float)):
+        raise ValueError(value)
+    if name == 'pk':
+        return model._meta.pk.to_python(value)
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        if not isinstance(value, (int, float)):
+            raise ValueError(value)
+        return value
+    return field.to_python(value)
+
+
+def _after(keys, values):
+    """Rows strictly after values in the order given by keys."""
+    condition = Q()
+    for i, key in enumerate(keys):
+        name = _key_name(key)
+        lookup = 'lt' if key.startswith('-') else 'gt'
+        step = Q(**{f'{name}__{lookup}': values[i]})
+        for prev_key, prev_value in zip(keys[:i], values[:i]):
+            step &= Q(**{_key_name(prev_key): prev_value})
+        condition |= step
+    return condition
+
+
+def _flip(key):
+    return key[1:] if key.startswith('-') else f'-{key}'
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def apply_cursor(queryset, cursor, keys=DEFAULT_KEYS):
+    """Order queryset by keys and skip to the position cursor points at.
+
+    Return the queryset and whether the cursor walks backwards, in which
+    case the queryset is in reversed order.
+    """
+    keys = tuple(keys)
+    if not cursor:
+        return queryset.order_by(*keys), False
+
+    values, reverse = decode_cursor(cursor, queryset.model, keys)
+    if reverse:
+        keys = tuple(_flip(key) for key in keys)
+    return queryset.filter(_after(keys, values)).order_by(*keys), reverse
+
+
+def paginate_by_cursor(queryset, cursor, page_size, keys=DEFAULT_KEYS):
+    """Keyset pagination over keys, (created_at, id) by default.
+
+    The last key must be unique. Every page is a single indexed range
+    scan limited to page_size + 1 rows, so page N costs the same as page 1.
+    """
+    keys = tuple(keys)
+    queryset, reverse = apply_cursor(queryset, cursor, keys)
+    rows = list(queryset[:page_size + 1])
+    return _build_page(rows, cursor, page_size, keys, reverse)
+
+
+async def apaginate_by_cursor(queryset, cursor, page_size, keys=DEFAULT_KEYS):
+    """Async variant of paginate_by_cursor for async views."""
+    keys = tuple(keys)
+    queryset, reverse = apply_cursor(queryset, cursor, keys)
+    rows = [row async for row in queryset[:page_size + 1]]
+    return _build_page(rows, cursor, page_size, keys, reverse)
+
+
+def _build_page(rows, cursor, page_size, keys, reverse):
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if reverse:
+        rows.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, bool(cursor)
+
+    if not rows:
+        return CursorPage(rows)
+
+    return CursorPage(
+        rows,
+        next_cursor=encode_cursor(rows[-1], keys) if has_next else None,
+        previous_cursor=(
+            encode_cursor(rows[0], keys, reverse=True)
+            if has_previous else None
+        ),
+    )
+
+
+class CursorPaginationMixin:
+    """Keyset pagination for list views, see paginate_by_cursor.
+
+    Adds next_page_query and previous_page_query (the current query
+    string with the other cursor) to the context.
+    """
+
+    def get_cursor_keys(self, queryset):
+        return DEFAULT_KEYS
+
+    def paginate_queryset(self, queryset, page_size):
+        try:
+            page = paginate_by_cursor(
+                queryset,
+                self.request.GET.get('cursor'),
+                page_size,
+                keys=self.get_cursor_keys(queryset)
+            )
+        except InvalidCursor:
+            raise Http404(_('Invalid page.'))
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context['page_obj']
+        context['next_page_query'] = self._cursor_query(page.next_cursor)
+        context['previous_page_query'] = self._cursor_query(
+            page.previous_cursor
+        )
+        return context
+
+    def _cursor_query(self, cursor):
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params['cursor'] = cursor
+        return params.urlencode()
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+SESSION_TABLE = '"django_session"'
+USER_LOOKUP = re.compile(r'FROM "auth_user" WHERE "auth_user"\."id" = %s')
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+IN_LIST = re.compile(r'\((?:%s, )+%s\)')
+
+
+def fingerprint(sql):
+    """Fingerprint a statement regardless of its parameters.
+
+    Literals (in SQL with interpolated parameters) become placeholders
+    and IN lists collapse, so batches of any size share one fingerprint.
+    """
+    normalized = IN_LIST.sub('(%s, ...)', LITERAL.sub('%s', sql))
+    return hashlib.md5(normalized.encode()).hexdigest()[:12], normalized
+
+
+class RequestProfile:
+    def __init__(self, record_duplicates=False):
+        self.started = time.perf_counter()
+        self.record_duplicates = record_duplicates
+        self.queries = 0
+        self.durations = Counter()
+        self.fingerprints = Counter()
+        self.statements = {}
+        self.view_started = None
+        self.render_started = None
+        self.render_finished = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.queries += 1
+            self.durations['db'] += duration
+            if SESSION_TABLE in sql:
+                self.durations['session'] += duration
+            elif USER_LOOKUP.search(sql):
+                self.durations['auth'] += duration
+            if self.record_duplicates:
+                key, normalized = fingerprint(sql)
+                self.fingerprints[key] += 1
+                self.statements.setdefault(key, normalized)
+
+    def mark_render_finished(self, response):
+        self.render_finished = time.perf_counter()
+
+    def duplicates(self):
+        return [
+            {'fingerprint': key, 'count': count, 'sql': self.statements[key]}
+            for key, count in self.fingerprints.most_common()
+            if count > 1
+        ]
+
+    def timings(self, finished):
+        """Milliseconds spent per phase of the request."""
+        view_started = self.view_started or finished
+        view_finished = self.render_started or finished
+        template = 0
+        if self.render_started and self.render_finished:
+            template = self.render_finished - self.render_started
+            view_finished = self.render_started
+
+        total = finished - self.started
+        view = max(view_finished - view_started, 0)
+        phases = {
+            'total': total,
+            'db': self.durations['db'],
+            'session': self.durations['session'],
+            'auth': self.durations['auth'],
+            'view': view,
+            'template': template,
+            'middleware': max(total - view - template, 0),
+        }
+        return {name: round(value * 1000, 2) for name, value in phases.items()}
+
+
+class ProfilingMiddleware:
+    """Opt-in per-request breakdown of where the time went.
+
+    Enabled with PROFILE_REQUESTS. Adds a Server-Timing header and logs
+    one JSON line per request to the task_manager.profiling logger. With
+    PROFILE_DUPLICATE_QUERIES repeated SQL statements are fingerprinted so
+    N+1 patterns show up. Should be the first entry in MIDDLEWARE so the
+    middleware phase covers the rest of the stack; session and auth only
+    count their database time since both are loaded lazily.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILE_REQUESTS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        profile = RequestProfile(settings.PROFILE_DUPLICATE_QUERIES)
+        request._profile = profile
+        with ExitStack() as stack:
+            self.wrap_connections(stack, profile)
+            response = self.get_response(request)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = RequestProfile(settings.PROFILE_DUPLICATE_QUERIES)
+        request._profile = profile
+        # Connections are thread-local and the async ORM runs queries in
+        # the request's sync_to_async thread, so the wrappers go there.
+        stack = ExitStack()
+        await sync_to_async(self.wrap_connections)(stack, profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, profile)
+
+    def wrap_connections(self, stack, profile):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profile))
+
+    def finish(self, request, response, profile):
+        timings = profile.timings(time.perf_counter())
+        response['Server-Timing'] = self.server_timing(profile, timings)
+        self.log(request, response, profile, timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._profile.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Runs last of all template-response hooks, right before rendering.
+        profile = request._profile
+        profile.render_started = time.perf_counter()
+        response.add_post_render_callback(profile.mark_render_finished)
+        return response
+
+    def server_timing(self, profile, timings):
+        entries = []
+        for name, duration in timings.items():
+            entry = f'{name};dur={duration}'
+            if name == 'db':
+                entry += f';desc="{profile.queries} queries"'
+            entries.append(entry)
+        if profile.record_duplicates:
+            repeated = sum(item['count'] for item in profile.duplicates())
+            entries.append(f'dup;desc="{repeated} repeated queries"')
+        return ', '.join(entries)
+
+    def log(self, request, response, profile, timings):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': profile.queries,
+            **{f'{name}_ms': value for name, value in timings.items()},
+        }
+        if profile.record_duplicates:
+            record['duplicates'] = profile.duplicates()
+        logger.info(json.dumps(record))
@@ -0,0 +1,236 @@
+"""Saved task filters and their precomputed result sets.
+
+Each user's SAVED_FILTERS_MATERIALIZED most used filters (those without
+search text, which only the full-text index can answer) keep the ids of
+the tasks they match in SavedFilterResult. Opening such a filter reads
+that list instead of running the filter query.
+
+The lists are maintained incrementally: whenever tasks change, their rows
+are dropped and matched again against every precomputed filter with one
+INSERT ... SELECT. MATCH_SQL has to agree with TaskFilter, with the
+filter's columns standing in for the submitted values. Concurrent
+refreshes of the same task (two saves, or a save while a list GET
+materializes a filter) may insert the same pair; the insert skips pairs
+that are already there instead of failing.
+
+The names on the list page come from a per-user cached list, so a page
+without a saved filter costs no extra query.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.http import QueryDict
+
+from task_manager.models import SavedFilter, SavedFilterResult, Task
+
+FILTER_PARAMS = ('q', 'status', 'executor', 'label', 'self_tasks')
+
+FILTERS_TIMEOUT = 60 * 60
+
+MATCH_SQL = """
+    INSERT INTO {result} (saved_filter_id, task_id)
+    SELECT saved.id, task.id
+    FROM {saved} saved, {task} task
+    WHERE saved.materialized = %s
+      AND {scope}
+      AND (saved.status_id IS NULL OR saved.status_id = task.status_id)
+      AND (saved.executor_id IS NULL OR saved.executor_id = task.executor_id)
+      AND (saved.self_tasks = %s OR saved.user_id = task.author_id)
+      AND (saved.label_id IS NULL OR EXISTS (
+          SELECT 1 FROM {labels} link
+          WHERE link.task_id = task.id AND link.label_id = saved.label_id
+      ))
+    ON CONFLICT (saved_filter_id, task_id) DO NOTHING
+"""
+
+
+def _filters_key(user_id):
+    return f'task_manager:saved_filters:{user_id}'
+
+
+def user_filters(user_id):
+    """(pk, name, is_default) of each of the user's saved filters."""
+    key = _filters_key(user_id)
+    filters = cache.get(key)
+    if filters is None:
+        filters = list(
+            SavedFilter.objects.filter(user_id=user_id)
+            .values_list('pk', 'name', 'is_default')
+        )
+        cache.set(key, filters, FILTERS_TIMEOUT)
+    return filters
+
+
+def filter_query(params):
+    """The TaskFilter part of params as a query string, in a fixed order."""
+    query = QueryDict(mutable=True)
+    for name in FILTER_PARAMS:
+        value = params.get(name)
+        if value:
+            query[name] = value
+    return query.urlencode()
+
+
+def _match(scope, params):
+    sql = MATCH_SQL.format(
+        result=SavedFilterResult._meta.db_table,
+        saved=SavedFilter._meta.db_table,
+        task=Task._meta.db_table,
+        labels=Task.labels.through._meta.db_table,
+        scope=scope,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [True, *params, False])
+
+
+def refresh_results(task_ids):
+    """Bring the precomputed result sets up to date for these tasks.
+
+    Works for created, changed and deleted tasks alike; for code that
+    changes tasks without model signals (bulk actions, imports).
+    """
+    task_ids = sorted(set(task_ids))
+    if not task_ids:
+        return
+    SavedFilterResult.objects.filter(task_id__in=task_ids).delete()
+    placeholders = ', '.join(['%s'] * len(task_ids))
+    _match(f'task.id IN ({placeholders})', task_ids)
+
+
+def materialize(saved_filter_ids):
+    """Compute the result sets of these filters from scratch."""
+    saved_filter_ids = list(saved_filter_ids)
+    if not saved_filter_ids:
+        return
+    SavedFilter.objects.filter(pk__in=saved_filter_ids).update(
+        materialized=True
+    )
+    SavedFilterResult.objects.filter(
+        saved_filter_id__in=saved_filter_ids
+    ).delete()
+    placeholders = ', '.join(['%s'] * len(saved_filter_ids))
+    _match(f'saved.id IN ({placeholders})', saved_filter_ids)
+
+
+def rebuild_results():
+    """Recompute every precomputed result set, e.g. after bulk inserts."""
+    materialize(
+        SavedFilter.objects.filter(materialized=True)
+        .values_list('pk', flat=True)
+    )
+
+
+def rebalance(user_id):
+    """Keep result sets for exactly the user's most used filters."""
+    ranked = list(
+        SavedFilter.objects.filter(user_id=user_id, search='')
+        .order_by('-uses', 'pk')
+        .values_list('pk', 'materialized')
+    )
+    keep = {pk for pk, _ in ranked[:settings.SAVED_FILTERS_MATERIALIZED]}
+    drop = [pk for pk, materialized in ranked if materialized and pk not in keep]
+    if drop:
+        SavedFilter.objects.filter(pk__in=drop).update(materialized=False)
+        SavedFilterResult.objects.filter(saved_filter_id__in=drop).delete()
+    materialize(
+        pk for pk, materialized in ranked if not materialized and pk in keep
+    )
+
+
+@transaction.atomic
+def use(saved_filter):
+    """Count an opening of the filter; it may earn a result set."""
+    SavedFilter.objects.filter(pk=saved_filter.pk).update(uses=F('uses') + 1)
+    if not saved_filter.materialized and not saved_filter.search:
+        rebalance(saved_filter.user_id)
+        saved_filter.refresh_from_db(fields=['uses', 'materialized'])
+
+
+@transaction.atomic
+def save_filter(saved_filter, values):
+    """Store a filter with the TaskFilter form's cleaned values.
+
+    A default filter takes over from the user's previous default.
+    """
+    saved_filter.search = values.get('q') or ''
+    saved_filter.status = values.get('status')
+    saved_filter.executor = values.get('executor')
+    saved_filter.label = values.get('label')
+    saved_filter.self_tasks = bool(values.get('self_tasks'))
+    if saved_filter.search:
+        saved_filter.materialized = False
+    if saved_filter.is_default:
+        _unset_default(saved_filter)
+    saved_filter.save()
+    if saved_filter.materialized:
+        materialize([saved_filter.pk])
+    else:
+        SavedFilterResult.objects.filter(saved_filter=saved_filter).delete()
+        rebalance(saved_filter.user_id)
+    return saved_filter
+
+
+@transaction.atomic
+def set_default(saved_filter, is_default=True):
+    """Open the list page on this filter, or stop doing so."""
+    if is_default:
+        _unset_default(saved_filter)
+    saved_filter.is_default = is_default
+    saved_filter.save(update_fields=['is_default'])
+
+
+def _unset_default(saved_filter):
+    SavedFilter.objects.filter(
+        user_id=saved_filter.user_id,
+        is_default=True
+    ).exclude(pk=saved_filter.pk).update(is_default=False)
+
+
+@transaction.atomic
+def delete_filter(saved_filter):
+    """Delete a filter; its result set may go to the next most used one."""
+    saved_filter.delete()
+    rebalance(saved_filter.user_id)
+
+
+def results(saved_filter):
+    """Tasks of a precomputed filter, ready for the list page."""
+    return Task.objects.with_related().filter(
+        pk__in=SavedFilterResult.objects.filter(
+            saved_filter=saved_filter
+        ).values('task_id')
+    )
+
+
+@receiver(post_save, sender=SavedFilter)
+@receiver(post_delete, sender=SavedFilter)
+def saved_filter_changed(sender, instance, **kwargs):
+    cache.delete(_filters_key(instance.user_id))
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, **kwargs):
+    refresh_results([instance.pk])
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def task_labels_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear', 'post_clear'):
+        return
+    if not reverse:
+        if action != 'pre_clear':
+            refresh_results([instance.pk])
+    elif action == 'pre_clear':
+        # The links are gone by post_clear; remember whose they were.
+        instance._saved_filter_tasks = list(
+            instance.tasks.values_list('pk', flat=True)
+        )
+    elif action == 'post_clear':
+        refresh_results(getattr(instance, '_saved_filter_tasks', ()))
+    else:
+        refresh_results(pk_set or ())
@@ -0,0 +1,73 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from task_manager.models import Task
+from task_manager.pagination import DEFAULT_KEYS
+
+SEARCH_CONFIG = 'russian'
+FTS_TABLE = 'task_manager_task_fts'
+
+
+def search_tasks(queryset, query):
+    """Filter tasks by a full-text query and annotate search_rank.
+
+    PostgreSQL uses the generated search_vector column and its GIN index,
+    SQLite uses the FTS5 table kept in sync by triggers. Both are created
+    by migration 0007_task_search. Higher search_rank is a better match.
+    """
+    terms = re.findall(r'\w+', query)
+    if not terms:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    task_id = f'"{Task._meta.db_table}"."id"'
+
+    if vendor == 'postgresql':
+        tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        vector = f'"{Task._meta.db_table}"."search_vector"'
+        return queryset.filter(
+            RawSQL(
+                f'{vector} @@ {tsquery}',
+                (query,),
+                output_field=BooleanField()
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f'ts_rank({vector}, {tsquery})',
+                (query,),
+                output_field=FloatField()
+            )
+        )
+
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.filter(
+            pk__in=RawSQL(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+                (match,)
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {task_id}',
+                (match,),
+                output_field=FloatField()
+            )
+        )
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(name__icontains=term) | Q(description__icontains=term)
+    return queryset.filter(condition).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
+
+
+def ordering_keys(queryset):
+    """Keyset ordering for tasks: by rank when searching, else by age."""
+    if 'search_rank' in queryset.query.annotations:
+        return ('-search_rank', 'pk')
+    return DEFAULT_KEYS
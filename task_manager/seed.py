@@ -0,0 +1,117 @@
+import random
+import uuid
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+
+from task_manager.choices import invalidate_choices
+from task_manager.counters import rebuild_task_counters
+from task_manager.models import Label, Status, Task
+from task_manager.page_cache import invalidate_page
+from task_manager.saved_filters import rebuild_results
+
+
+def _skewed_weights(count):
+    return [1 / (i + 1) for i in range(count)]
+
+
+def seed(tasks, users=20, statuses=5, labels=10, batch_size=1000, rng=None):
+    """Bulk-insert synthetic rows with a skewed, production-like shape.
+
+    A few executors, statuses and labels get most of the tasks, about a
+    fifth of the tasks are unassigned, and each task carries 0-3 labels.
+    """
+    rng = rng or random.Random()
+    token = uuid.uuid4().hex[:8]
+    password = make_password(None)
+
+    user_objs = User.objects.bulk_create(
+        [
+            User(
+                username=f'seed-{token}-{i}',
+                first_name='Seed',
+                last_name=f'User {i}',
+                password=password,
+            )
+            for i in range(users)
+        ],
+        batch_size=batch_size,
+    )
+    status_objs = Status.objects.bulk_create(
+        [Status(name=f'seed-{token}-status-{i}') for i in range(statuses)],
+        batch_size=batch_size,
+    )
+    label_objs = Label.objects.bulk_create(
+        [Label(name=f'seed-{token}-label-{i}') for i in range(labels)],
+        batch_size=batch_size,
+    )
+
+    user_weights = _skewed_weights(len(user_objs))
+    status_weights = _skewed_weights(len(status_objs))
+    label_weights = _skewed_weights(len(label_objs))
+    through = Task.labels.through
+
+    for start in range(0, tasks, batch_size):
+        chunk = []
+        for i in range(start, min(start + batch_size, tasks)):
+            executor = None
+            if rng.random() >= 0.2:
+                executor = rng.choices(user_objs, user_weights)[0]
+            chunk.append(Task(
+                name=f'seed-{token}-task-{i}',
+                description=f'Seeded task {i}',
+                status=rng.choices(status_objs, status_weights)[0],
+                author=rng.choice(user_objs),
+                executor=executor,
+            ))
+        chunk = Task.objects.bulk_create(chunk)
+
+        links = []
+        for task in chunk:
+            picked = {
+                label.pk
+                for label in rng.choices(
+                    label_objs, label_weights, k=rng.randint(0, 3)
+                )
+            }
+            links.extend(
+                through(task_id=task.pk, label_id=label_id)
+                for label_id in picked
+            )
+        through.objects.bulk_create(links)
+
+    # bulk_create bypasses the signals that maintain the counters and the
+    # saved filter results and invalidate the cached choice lists and pages.
+    rebuild_task_counters()
+    rebuild_results()
+    invalidate_choices()
+    invalidate_page('users')
+
+    return {
+        'users': len(user_objs),
+        'statuses': len(status_objs),
+        'labels': len(label_objs),
+        'tasks': tasks,
+    }
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def seeded(tasks, **kwargs):
+    """Seed synthetic data for the duration of the block, then roll back."""
+    try:
+        with transaction.atomic():
+            if tasks:
+                seed(tasks, **kwargs)
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE')
+            yield
+            raise _Rollback
+    except _Rollback:
+        invalidate_choices()
+        invalidate_page('users')
@@ -0,0 +1,174 @@
+import csv
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from task_manager.pagination import encode_cursor
+
+CHUNK_SIZE = 500
+
+
+def _full_name(user):
+    return user.get_full_name() if user else None
+
+
+TASK_FIELDS = {
+    'id': lambda task: task.pk,
+    'name': lambda task: task.name,
+    'description': lambda task: task.description,
+    'status': lambda task: task.status.name,
+    'author': lambda task: _full_name(task.author),
+    'executor': lambda task: _full_name(task.executor),
+    'labels': lambda task: [label.name for label in task.labels.all()],
+    'created_at': lambda task: task.created_at,
+    'updated_at': lambda task: task.updated_at,
+}
+
+
+class UnknownFields(ValueError):
+    pass
+
+
+def parse_fields(value):
+    """Parse a sparse fieldset such as 'id,name,status'."""
+    if not value:
+        return list(TASK_FIELDS)
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in TASK_FIELDS]
+    if unknown or not fields:
+        raise UnknownFields(unknown)
+    return fields
+
+
+def prepare_queryset(queryset, fields):
+    """Drop the label prefetch when labels are not requested."""
+    if 'labels' not in fields:
+        queryset = queryset.prefetch_related(None)
+    return queryset
+
+
+def serialize_task(task, fields):
+    return {field: TASK_FIELDS[field](task) for field in fields}
+
+
+def iter_tasks(queryset, limit=None, chunk_size=CHUNK_SIZE):
+    """Iterate tasks in chunks, prefetching labels once per chunk.
+
+    Yield (task, is_extra) so callers can tell that a row past limit
+    exists without loading the rest of the result.
+    """
+    if limit is not None:
+        queryset = queryset[:limit + 1]
+    for index, task in enumerate(queryset.iterator(chunk_size=chunk_size)):
+        yield task, limit is not None and index >= limit
+
+
+def _chunked(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ', '.join(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return '' if value is None else value
+
+
+def stream_csv(queryset, fields, chunk_size=CHUNK_SIZE):
+    writer = csv.writer(_Echo())
+
+    def rows():
+        yield writer.writerow(fields)
+        for task, _ in iter_tasks(queryset, chunk_size=chunk_size):
+            yield writer.writerow([
+                _csv_value(TASK_FIELDS[field](task)) for field in fields
+            ])
+
+    return _chunked(rows(), chunk_size)
+
+
+def stream_ndjson(queryset, fields, chunk_size=CHUNK_SIZE):
+    rows = (
+        json.dumps(
+            serialize_task(task, fields),
+            cls=DjangoJSONEncoder,
+            ensure_ascii=False
+        ) + '\n'
+        for task, _ in iter_tasks(queryset, chunk_size=chunk_size)
+    )
+    return _chunked(rows, chunk_size)
+
+
+async def _aiter_chunks(chunks):
+    iterator = iter(chunks)
+    done = object()
+    while True:
+        # One chunk per call, in the thread that owns the connection.
+        chunk = await sync_to_async(next)(iterator, done)
+        if chunk is done:
+            return
+        yield chunk
+
+
+def streaming_response(request, chunks, **kwargs):
+    """StreamingHttpResponse over chunks that streams under ASGI too.
+
+    Django's ASGI handler reads a sync iterator with sync_to_async(list),
+    i.e. builds the whole body in memory first; under ASGI the chunks are
+    handed over as an async iterator instead, produced one at a time.
+    """
+    if isinstance(request, ASGIRequest):
+        chunks = _aiter_chunks(chunks)
+    return StreamingHttpResponse(chunks, **kwargs)
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson'),
+}
+
+
+def stream_json(queryset, fields, keys, limit=None, chunk_size=CHUNK_SIZE):
+    """Yield a {"results": [...], "next": cursor} document piece by piece."""
+    yield '{"results":['
+    buffer = []
+    written = False
+    last = None
+    has_more = False
+
+    for task, is_extra in iter_tasks(queryset, limit, chunk_size):
+        if is_extra:
+            has_more = True
+            break
+        buffer.append(json.dumps(
+            serialize_task(task, fields),
+            cls=DjangoJSONEncoder,
+            ensure_ascii=False
+        ))
+        last = task
+        if len(buffer) >= chunk_size:
+            yield (',' if written else '') + ','.join(buffer)
+            written = True
+            buffer = []
+
+    if buffer:
+        yield (',' if written else '') + ','.join(buffer)
+
+    next_cursor = encode_cursor(last, keys) if has_more else None
+    yield f'],"next":{json.dumps(next_cursor)}}}'
@@ -0,0 +1,48 @@
+from django.conf import settings
+
+
+class SkipUnchangedMixin:
+    """Session store that does not write back data it loaded unchanged.
+
+    Assigning a key its current value marks the session modified, which
+    costs a write (and a new cookie) on every such request. The loaded
+    data is kept serialized and compared before saving. With
+    SESSION_SAVE_EVERY_REQUEST every save is kept, since it also renews
+    the expiry.
+    """
+
+    _loaded = None
+
+    def _snapshot(self, data):
+        return self.serializer().dumps(data)
+
+    def _unchanged(self, must_create):
+        return (
+            not must_create
+            and not settings.SESSION_SAVE_EVERY_REQUEST
+            and self._loaded is not None
+            and self.session_key is not None
+            and self._snapshot(self._session) == self._loaded
+        )
+
+    def load(self):
+        data = super().load()
+        self._loaded = self._snapshot(data)
+        return data
+
+    async def aload(self):
+        data = await super().aload()
+        self._loaded = self._snapshot(data)
+        return data
+
+    def save(self, must_create=False):
+        if self._unchanged(must_create):
+            return
+        super().save(must_create=must_create)
+        self._loaded = self._snapshot(self._session)
+
+    async def asave(self, must_create=False):
+        if self._unchanged(must_create):
+            return
+        await super().asave(must_create=must_create)
+        self._loaded = self._snapshot(self._session)
@@ -0,0 +1,7 @@
+from django.contrib.sessions.backends import cached_db
+
+from task_manager.sessions import SkipUnchangedMixin
+
+
+class SessionStore(SkipUnchangedMixin, cached_db.SessionStore):
+    pass
@@ -0,0 +1,7 @@
+from django.contrib.sessions.backends import signed_cookies
+
+from task_manager.sessions import SkipUnchangedMixin
+
+
+class SessionStore(SkipUnchangedMixin, signed_cookies.SessionStore):
+    pass
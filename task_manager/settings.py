@@ -5,6 +5,7 @@ Generated by 'django-admin startproject' using Django 5.2.10.
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 import dj_database_url
@@ -54,8 +55,9 @@ INSTALLED_APPS = [
 
 # MIDDLEWARE
 MIDDLEWARE = [
+    'task_manager.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'task_manager.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -67,6 +69,32 @@ MIDDLEWARE = [
 ]
 
 
+# Native async read views, switched on by asgi.py
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
+
+# Request profiling: Server-Timing headers and one JSON log line per request
+PROFILE_REQUESTS = os.getenv('PROFILE_REQUESTS', 'False') == 'True'
+PROFILE_DUPLICATE_QUERIES = (
+    os.getenv('PROFILE_DUPLICATE_QUERIES', 'False') == 'True'
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'task_manager.profiling': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+
 ROOT_URLCONF = "task_manager.urls"
 
 
@@ -94,10 +122,33 @@ WSGI_APPLICATION = "task_manager.wsgi.application"
 # DATABASE
 database_url = os.getenv('DATABASE_URL')
 
+# Connection reuse per worker process. With DB_POOL every worker keeps a
+# psycopg pool of DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections (needs
+# psycopg 3 with psycopg_pool, the "pool" extra); otherwise a connection
+# lives for DB_CONN_MAX_AGE seconds and is checked before each request
+# reuses it. asgi.py defaults DB_CONN_MAX_AGE to 0: under ASGI every
+# request may run in a different thread and persistent connections pile up.
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '2'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '4'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+
 if database_url:
     DATABASES = {
-        'default': dj_database_url.parse(database_url)
+        'default': dj_database_url.parse(
+            database_url,
+            # Pooled connections go back to the pool after each request.
+            conn_max_age=0 if DB_POOL else DB_CONN_MAX_AGE,
+            conn_health_checks=not DB_POOL,
+        )
     }
+    if DB_POOL and 'postgresql' in DATABASES['default']['ENGINE']:
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
 else:
     DATABASES = {
         "default": {
@@ -107,6 +158,108 @@ else:
     }
 
 
+# CACHE
+# locmem is per process; file and redis are shared by all workers on a
+# host (redis also across hosts) and are what cached_db sessions need.
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CACHE_LOCATIONS = {
+    'locmem': '',
+    'file': os.path.join(tempfile.gettempdir(), 'task_manager_cache'),
+    'redis': 'redis://127.0.0.1:6379/1',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION',
+            CACHE_LOCATIONS[CACHE_BACKEND]
+        ),
+    }
+}
+if CACHE_BACKEND != 'redis':
+    # Redis evicts by its own maxmemory policy and rejects this option.
+    CACHES['default']['OPTIONS'] = {
+        # Task list row fragments need room for a whole board.
+        'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '20000')),
+    }
+
+# Seconds the status, label and user dropdown lists are cached. A change
+# drops them only from the cache of the process that made it, so with the
+# per-process locmem cache other workers show old lists for this long.
+CHOICES_CACHE_TIMEOUT = int(os.getenv(
+    'CHOICES_CACHE_TIMEOUT',
+    '5' if CACHE_BACKEND == 'locmem' else '3600'
+))
+
+# Seconds anonymous copies of the index and user list pages are kept
+PAGE_CACHE_TIMEOUT = int(os.getenv('PAGE_CACHE_TIMEOUT', '300'))
+
+# Task activity log: queued events are written in one INSERT once this
+# many are pending or the oldest has waited this many seconds.
+ACTIVITY_BATCH_SIZE = int(os.getenv('ACTIVITY_BATCH_SIZE', '100'))
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv('ACTIVITY_FLUSH_INTERVAL', '2'))
+
+# Saved task filters: each user's this many most used filters keep their
+# matching task ids, updated as tasks change, instead of being re-run.
+SAVED_FILTERS_MATERIALIZED = int(os.getenv('SAVED_FILTERS_MATERIALIZED', '3'))
+
+
+# BACKGROUND JOBS
+# Run by `manage.py run_worker`. A failed job is retried after
+# JOB_RETRY_DELAY seconds, doubled on every further failure; a job still
+# running after JOB_TIMEOUT seconds is taken as lost and retried.
+JOB_CONCURRENCY = int(os.getenv('JOB_CONCURRENCY', '1'))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+JOB_RETRY_DELAY = float(os.getenv('JOB_RETRY_DELAY', '10'))
+JOB_TIMEOUT = int(os.getenv('JOB_TIMEOUT', '600'))
+# Seconds finished jobs are kept for the statistics at /health/jobs/
+JOB_KEEP_FINISHED = int(os.getenv('JOB_KEEP_FINISHED', '86400'))
+
+
+# EMAIL AND NOTIFICATIONS
+# Assignment and status notifications are collected and sent by
+# run_worker as one digest per recipient every
+# NOTIFICATION_DIGEST_INTERVAL seconds, all over one SMTP connection.
+EMAIL_BACKEND = os.getenv(
+    'EMAIL_BACKEND',
+    'django.core.mail.backends.console.EmailBackend' if DEBUG
+    else 'django.core.mail.backends.smtp.EmailBackend'
+)
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', '25'))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'False') == 'True'
+EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', '10'))
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'webmaster@localhost')
+NOTIFICATION_DIGEST_INTERVAL = int(
+    os.getenv('NOTIFICATION_DIGEST_INTERVAL', '300')
+)
+
+
+# SESSIONS AND MESSAGES
+# db keeps every session in django_session. cached_db serves reads from
+# the cache and should only be used with a cache shared by all workers,
+# otherwise a logout is not seen by the other processes. signed_cookies
+# needs no storage at all; the session lives in the client's cookie.
+# All three skip the write when a request leaves the data unchanged.
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'db')
+SESSION_ENGINE = f'task_manager.sessions.{SESSION_BACKEND}'
+
+# Flash messages go to a cookie first and only overflow into the session.
+MESSAGE_STORAGE = {
+    'fallback': 'django.contrib.messages.storage.fallback.FallbackStorage',
+    'cookie': 'django.contrib.messages.storage.cookie.CookieStorage',
+    'session': 'django.contrib.messages.storage.session.SessionStorage',
+}[os.getenv('MESSAGE_STORAGE', 'fallback')]
+
+
 # PASSWORD VALIDATION
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -1,10 +1,11 @@
 from django.urls import path
 
 from task_manager import statuses_views
+from task_manager.async_views import read_view
 
 urlpatterns = [
     path(
-        '', statuses_views.StatusListView.as_view(),
+        '', read_view(statuses_views.StatusListView),
         name='statuses_list'
         ),
     path(
@@ -8,6 +8,7 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from task_manager.conditional import ConditionalGetMixin
 from task_manager.models import Status
 
 
@@ -22,10 +23,11 @@ class StatusForm(forms.ModelForm):
         }
 
 
-class StatusListView(LoginRequiredMixin, ListView):
+class StatusListView(LoginRequiredMixin, ConditionalGetMixin, ListView):
     model = Status
     template_name = 'task_manager/statuses/list.html'
     context_object_name = 'statuses'
+    change_markers = ('status', 'task', 'user')
     login_url = reverse_lazy('login')
 
     def handle_no_permission(self):
@@ -83,6 +85,13 @@ class StatusDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
         return redirect('login')
 
     def form_valid(self, form):
+        if self.object.tasks_count > 0:
+            messages.error(
+                self.request,
+                _('Cannot delete status because it is in use')
+            )
+            return redirect('statuses_list')
+
         try:
             self.object.delete()
             messages.success(
@@ -1,11 +1,37 @@
 from django.urls import path
 
 from task_manager import tasks_views
+from task_manager.async_views import read_view
 
 urlpatterns = [
     path(
-        '', tasks_views.TaskListView.as_view(),
+        '', read_view(tasks_views.TaskListView),
          name='tasks_list'),
+    path(
+        'api/',
+        tasks_views.TaskApiView.as_view(),
+        name='tasks_api'
+        ),
+    path(
+        'bulk/',
+        tasks_views.TaskBulkView.as_view(),
+        name='tasks_bulk'
+        ),
+    path(
+        'filters/save/',
+        tasks_views.TaskFilterSaveView.as_view(),
+        name='task_filter_save'
+        ),
+    path(
+        'filters/<int:pk>/default/',
+        tasks_views.TaskFilterDefaultView.as_view(),
+        name='task_filter_default'
+        ),
+    path(
+        'filters/<int:pk>/delete/',
+        tasks_views.TaskFilterDeleteView.as_view(),
+        name='task_filter_delete'
+        ),
     path(
         'create/',
         tasks_views.TaskCreateView.as_view(),
@@ -13,9 +39,14 @@ urlpatterns = [
         ),
     path(
         '<int:pk>/',
-        tasks_views.TaskDetailView.as_view(),
+        read_view(tasks_views.TaskDetailView),
         name='task_detail'
         ),
+    path(
+        '<int:pk>/history/',
+        tasks_views.TaskHistoryView.as_view(),
+        name='task_history'
+        ),
     path(
         '<int:pk>/update/',
         tasks_views.TaskUpdateView.as_view(),
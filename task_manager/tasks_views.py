@@ -1,15 +1,51 @@
 from django import forms
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.models import User
 from django.contrib.messages.views import SuccessMessageMixin
-from django.shortcuts import redirect
-from django.urls import reverse_lazy
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http import JsonResponse, QueryDict
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse, reverse_lazy
 from django.utils.translation import gettext_lazy as _
-from django.views.generic import CreateView, DeleteView, DetailView, UpdateView
+from django.views.generic import (
+    CreateView,
+    DeleteView,
+    DetailView,
+    ListView,
+    UpdateView,
+    View,
+)
 from django_filters.views import FilterView
 
+from task_manager import activity, notifications, saved_filters
+from task_manager.bulk import BULK_ACTIONS
+from task_manager.choices import (
+    label_choices,
+    set_choices,
+    status_choices,
+    user_choices,
+)
+from task_manager.conditional import ConditionalGetMixin
 from task_manager.filters import TaskFilter
-from task_manager.models import Task
+from task_manager.fragments import render_task_rows
+from task_manager.models import Label, SavedFilter, Status, Task, TaskEvent
+from task_manager.pagination import (
+    CursorPaginationMixin,
+    InvalidCursor,
+    apply_cursor,
+)
+from task_manager.search import ordering_keys
+from task_manager.serializers import (
+    EXPORT_FORMATS,
+    TASK_FIELDS,
+    UnknownFields,
+    parse_fields,
+    prepare_queryset,
+    stream_json,
+    streaming_response,
+)
 
 
 class TaskForm(forms.ModelForm):
@@ -49,16 +85,332 @@ class TaskForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.fields['executor'].label_from_instance = (
-            lambda obj: obj.get_full_name()
-        )
+        set_choices(self.fields['status'], status_choices())
+        set_choices(self.fields['executor'], user_choices(full_name=True))
+        set_choices(self.fields['labels'], label_choices())
+
+
+class TaskUpdateForm(TaskForm):
+    """TaskForm that remembers which version of the task it was opened on.
+
+    A submission without a version is treated as a conflict.
+    """
+
+    version = forms.IntegerField(
+        widget=forms.HiddenInput,
+        min_value=0,
+        required=False
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['version'].initial = self.instance.version
+
+
+def _shown(value):
+    if value is None or value == '':
+        return '-'
+    if isinstance(value, User):
+        return value.get_full_name() or value.username
+    if isinstance(value, (list, tuple, QuerySet)):
+        return ', '.join(str(item) for item in value) or '-'
+    return value
+
+
+class TaskIdsField(forms.Field):
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {
+        'required': _('Select at least one task'),
+        'invalid': _('Select at least one task'),
+    }
+
+    def to_python(self, value):
+        try:
+            return sorted({int(pk) for pk in value or ()})
+        except (TypeError, ValueError):
+            raise forms.ValidationError(
+                self.error_messages['invalid'],
+                code='invalid'
+            )
+
+
+class TaskBulkForm(forms.Form):
+    ACTION_CHOICES = [
+        ('status', _('Change status')),
+        ('executor', _('Change executor')),
+        ('add_labels', _('Add labels')),
+        ('remove_labels', _('Remove labels')),
+        ('delete', _('Delete')),
+    ]
+
+    tasks = TaskIdsField()
+    action = forms.ChoiceField(
+        label=_('Action'),
+        choices=ACTION_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    status = forms.ModelChoiceField(
+        label=_('Status'),
+        queryset=Status.objects.all(),
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    executor = forms.ModelChoiceField(
+        label=_('Executor'),
+        queryset=User.objects.all(),
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    labels = forms.ModelMultipleChoiceField(
+        label=_('Labels'),
+        queryset=Label.objects.all(),
+        required=False,
+        widget=forms.SelectMultiple(attrs={'class': 'form-select', 'size': '3'})
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        set_choices(self.fields['status'], status_choices())
+        set_choices(self.fields['executor'], user_choices(full_name=True))
+        set_choices(self.fields['labels'], label_choices())
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get('action')
+        if action == 'status' and not cleaned_data.get('status'):
+            self.add_error('status', _('Choose a status'))
+        if action in ('add_labels', 'remove_labels') and not cleaned_data.get(
+            'labels'
+        ):
+            self.add_error('labels', _('Choose at least one label'))
+        return cleaned_data
+
+    def get_action_args(self, user):
+        action = self.cleaned_data['action']
+        if action == 'delete':
+            return (user,)
+        if action in ('add_labels', 'remove_labels'):
+            return (self.cleaned_data['labels'], user)
+        return (self.cleaned_data[action], user)
+
+
+class SavedFilterForm(forms.ModelForm):
+    """Name a filter of the list page; an existing name is overwritten."""
+
+    class Meta:
+        model = SavedFilter
+        fields = ['name', 'is_default', 'query']
+        widgets = {
+            'name': forms.TextInput(attrs={'class': 'form-control'}),
+            'is_default': forms.CheckboxInput(
+                attrs={'class': 'form-check-input'}
+            ),
+            'query': forms.HiddenInput,
+        }
+
+    def clean_query(self):
+        params = QueryDict(self.cleaned_data['query'])
+        filterset = TaskFilter(params, queryset=Task.objects.none())
+        if not filterset.is_valid():
+            raise forms.ValidationError(_('This filter cannot be saved'))
+        self.filter_values = filterset.form.cleaned_data
+        return saved_filters.filter_query(params)
 
+    def save(self):
+        saved_filter = SavedFilter.objects.filter(
+            user=self.instance.user,
+            name=self.cleaned_data['name']
+        ).first() or self.instance
+        saved_filter.query = self.cleaned_data['query']
+        saved_filter.is_default = self.cleaned_data['is_default']
+        return saved_filters.save_filter(saved_filter, self.filter_values)
 
-class TaskListView(LoginRequiredMixin, FilterView):
+
+def _list_url(query=''):
+    url = reverse('tasks_list')
+    return f'{url}?{query}' if query else url
+
+
+class TaskListView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    FilterView
+):
     model = Task
     template_name = 'task_manager/tasks/list.html'
     context_object_name = 'tasks'
     filterset_class = TaskFilter
+    paginate_by = 50
+    change_markers = ('task', 'status', 'label', 'user', 'saved_filter')
+    renders_forms = True
+    login_url = reverse_lazy('login')
+    user_filters = ()
+    saved_filter = None
+
+    def get_queryset(self):
+        if self.saved_filter is not None and self.saved_filter.materialized:
+            return saved_filters.results(self.saved_filter)
+        return Task.objects.with_related()
+
+    def select_saved_filter(self):
+        """Load the user's saved filters and pick the one in ?saved=.
+
+        A bare list address opens the user's default filter, through a
+        redirect so that the address names it; the redirect is returned.
+        """
+        self.user_filters = saved_filters.user_filters(self.request.user.pk)
+        if not self.request.GET:
+            for pk, _, is_default in self.user_filters:
+                if is_default:
+                    return redirect(_list_url(f'saved={pk}'))
+            return None
+
+        # Not looked up in the cached list: another worker may have saved
+        # the filter since it was cached.
+        selected = self.request.GET.get('saved', '')
+        if not (selected.isascii() and selected.isdigit()):
+            return None
+        self.saved_filter = SavedFilter.objects.filter(
+            pk=selected,
+            user=self.request.user
+        ).first()
+        # Further pages and exports are not new openings.
+        if self.saved_filter is not None and not (
+            'cursor' in self.request.GET or 'export' in self.request.GET
+        ):
+            saved_filters.use(self.saved_filter)
+        return None
+
+    def get_filterset_kwargs(self, filterset_class):
+        kwargs = super().get_filterset_kwargs(filterset_class)
+        if self.saved_filter is not None:
+            kwargs['data'] = QueryDict(self.saved_filter.query)
+            kwargs['precomputed'] = self.saved_filter.materialized
+        return kwargs
+
+    def get(self, request, *args, **kwargs):
+        response = self.select_saved_filter()
+        if response is not None:
+            return response
+        export_format = request.GET.get('export')
+        if export_format in EXPORT_FORMATS:
+            return self.export(export_format)
+        return super().get(request, *args, **kwargs)
+
+    def export(self, export_format):
+        filterset = self.get_filterset(self.get_filterset_class())
+        if filterset.is_valid() or not self.get_strict():
+            queryset = filterset.qs
+        else:
+            queryset = filterset.queryset.none()
+        queryset = queryset.order_by(*ordering_keys(queryset))
+
+        stream, content_type = EXPORT_FORMATS[export_format]
+        response = streaming_response(
+            self.request,
+            stream(queryset, list(TASK_FIELDS), chunk_size=2000),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="tasks.{export_format}"'
+        )
+        return response
+
+    def get_cursor_keys(self, queryset):
+        return ordering_keys(queryset)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['task_rows'] = render_task_rows(context['tasks'])
+        context['bulk_form'] = TaskBulkForm()
+        context['saved_filters'] = self.user_filters
+        context['saved_filter'] = self.saved_filter
+        if self.saved_filter is not None:
+            initial = {
+                'name': self.saved_filter.name,
+                'is_default': self.saved_filter.is_default,
+                'query': self.saved_filter.query,
+            }
+        else:
+            initial = {'query': saved_filters.filter_query(self.request.GET)}
+        context['saved_filter_form'] = SavedFilterForm(initial=initial)
+        context['export_queries'] = {
+            export_format: self._export_query(export_format)
+            for export_format in EXPORT_FORMATS
+        }
+        return context
+
+    def _export_query(self, export_format):
+        params = self.request.GET.copy()
+        params.pop('cursor', None)
+        params['export'] = export_format
+        return params.urlencode()
+
+    def handle_no_permission(self):
+        messages.error(
+            self.request,
+            _('You are not authorized! Please log in.')
+        )
+        return redirect('login')
+
+
+class TaskBulkView(LoginRequiredMixin, View):
+    """Apply one action to the tasks selected on the list page.
+
+    Every action is a set-based UPDATE or DELETE (plus one bulk insert or
+    delete on the label links); only the author's own tasks are deleted.
+    """
+
+    http_method_names = ['post']
+    login_url = reverse_lazy('login')
+
+    def handle_no_permission(self):
+        messages.error(
+            self.request,
+            _('You are not authorized! Please log in.')
+        )
+        return redirect('login')
+
+    def post(self, request, *args, **kwargs):
+        form = TaskBulkForm(request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return self.redirect()
+
+        result = BULK_ACTIONS[form.cleaned_data['action']](
+            form.cleaned_data['tasks'],
+            *form.get_action_args(request.user)
+        )
+
+        messages.success(
+            request,
+            _('Tasks changed: %(count)s') % {'count': result.changed}
+        )
+        if result.skipped:
+            messages.warning(
+                request,
+                _('Skipped, only the author can delete a task: %(tasks)s') % {
+                    'tasks': ', '.join(result.skipped)
+                }
+            )
+        return self.redirect()
+
+    def redirect(self):
+        url = reverse('tasks_list')
+        query = self.request.POST.get('query')
+        if query:
+            url = f'{url}?{query}'
+        return redirect(url)
+
+
+class SavedFilterView(LoginRequiredMixin, View):
+    """Base of the views that change the user's saved filters."""
+
+    http_method_names = ['post']
     login_url = reverse_lazy('login')
 
     def handle_no_permission(self):
@@ -68,13 +420,166 @@ class TaskListView(LoginRequiredMixin, FilterView):
         )
         return redirect('login')
 
+    def get_saved_filter(self):
+        return get_object_or_404(
+            SavedFilter,
+            pk=self.kwargs['pk'],
+            user=self.request.user
+        )
+
+
+class TaskFilterSaveView(SavedFilterView):
+    def post(self, request, *args, **kwargs):
+        form = SavedFilterForm(request.POST)
+        form.instance.user = request.user
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return redirect(_list_url(request.POST.get('query', '')))
+
+        saved_filter = form.save()
+        messages.success(request, _('Filter saved'))
+        return redirect(_list_url(f'saved={saved_filter.pk}'))
+
+
+class TaskFilterDefaultView(SavedFilterView):
+    """Make a saved filter the default, or stop it being the default."""
+
+    def post(self, request, *args, **kwargs):
+        saved_filter = self.get_saved_filter()
+        saved_filters.set_default(saved_filter, not saved_filter.is_default)
+        return redirect(_list_url(f'saved={saved_filter.pk}'))
+
+
+class TaskFilterDeleteView(SavedFilterView):
+    def post(self, request, *args, **kwargs):
+        saved_filters.delete_filter(self.get_saved_filter())
+        messages.success(request, _('Filter deleted'))
+        # An empty choice: a bare address would open the default filter.
+        return redirect(_list_url('saved='))
+
+
+class TaskApiView(LoginRequiredMixin, View):
+    """Read-only JSON list of tasks, streamed row by row.
+
+    Accepts the TaskFilter parameters plus fields (sparse fieldset),
+    limit (page size) and cursor (the "next" value of a previous page).
+    """
+
+    max_limit = 1000
+
+    def handle_no_permission(self):
+        return JsonResponse(
+            {'error': _('You are not authorized! Please log in.')},
+            status=401
+        )
+
+    def get(self, request, *args, **kwargs):
+        filterset = TaskFilter(
+            request.GET,
+            queryset=Task.objects.with_related(),
+            request=request
+        )
+        if not filterset.is_valid():
+            return self.error(filterset.errors.get_json_data())
+
+        try:
+            fields = parse_fields(request.GET.get('fields'))
+        except UnknownFields as error:
+            return self.error({'fields': error.args[0]})
+
+        limit = request.GET.get('limit')
+        if limit is not None:
+            try:
+                size = int(limit)
+            except ValueError:
+                size = 0
+            if size <= 0:
+                return self.error({'limit': limit})
+            limit = min(size, self.max_limit)
+
+        queryset = filterset.qs
+        keys = ordering_keys(queryset)
+        try:
+            queryset, reverse = apply_cursor(
+                queryset,
+                request.GET.get('cursor'),
+                keys
+            )
+        except InvalidCursor:
+            reverse = True
+        if reverse:
+            return self.error({'cursor': request.GET.get('cursor')})
+
+        return streaming_response(
+            request,
+            stream_json(prepare_queryset(queryset, fields), fields, keys, limit),
+            content_type='application/json'
+        )
 
-class TaskDetailView(LoginRequiredMixin, DetailView):
+    def error(self, errors):
+        return JsonResponse({'errors': errors}, status=400)
+
+
+class TaskDetailView(LoginRequiredMixin, ConditionalGetMixin, DetailView):
     model = Task
     template_name = 'task_manager/tasks/detail.html'
     context_object_name = 'task'
+    change_markers = ('status', 'label', 'user')
     login_url = reverse_lazy('login')
 
+    def updated_at_query(self):
+        return Task.objects.filter(pk=self.kwargs['pk']).values_list(
+            'updated_at',
+            flat=True
+        )
+
+    def get_validator_parts(self):
+        updated_at = self.updated_at_query().first()
+        if updated_at is None:
+            return None
+        return [updated_at]
+
+    def get_queryset(self):
+        return Task.objects.with_related()
+
+    def handle_no_permission(self):
+        messages.error(
+            self.request,
+            _('You are not authorized! Please log in.')
+        )
+        return redirect('login')
+
+
+class TaskHistoryView(LoginRequiredMixin, CursorPaginationMixin, ListView):
+    """Activity log of one task, newest first, a page at a time.
+
+    Linked from the detail page rather than rendered on it, so showing a
+    task does not read its history. Queued events are written first so
+    the page includes the user's own latest changes.
+    """
+
+    template_name = 'task_manager/tasks/history.html'
+    context_object_name = 'events'
+    paginate_by = 20
+    login_url = reverse_lazy('login')
+
+    def get_queryset(self):
+        activity.flush()
+        return TaskEvent.objects.filter(
+            task_id=self.kwargs['pk']
+        ).select_related('actor')
+
+    def get_cursor_keys(self, queryset):
+        return ('-pk',)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['task'] = Task.objects.filter(pk=self.kwargs['pk']).first()
+        context['event_changes'] = activity.describe(context['events'])
+        return context
+
     def handle_no_permission(self):
         messages.error(
             self.request,
@@ -100,12 +605,34 @@ class TaskCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
 
     def form_valid(self, form):
         form.instance.author = self.request.user
-        return super().form_valid(form)
+        with transaction.atomic():
+            response = super().form_valid(form)
+            if self.object.executor_id:
+                notifications.notify(notifications.assigned(
+                    self.object.pk,
+                    self.object.name,
+                    self.object.executor_id,
+                    self.request.user
+                ))
+        activity.record(
+            self.object.pk,
+            TaskEvent.CREATED,
+            actor=self.request.user
+        )
+        return response
 
 
 class TaskUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
+    """Edit a task with optimistic concurrency control.
+
+    Nothing is locked while the form is open. On submit the task's version
+    is claimed with a conditional UPDATE; if someone saved the task in the
+    meantime the claim fails and the form comes back (409) with the saved
+    values next to the submitted ones.
+    """
+
     model = Task
-    form_class = TaskForm
+    form_class = TaskUpdateForm
     template_name = 'task_manager/tasks/update.html'
     success_url = reverse_lazy('tasks_list')
     success_message = _('Task successfully updated')
@@ -118,6 +645,62 @@ class TaskUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
         )
         return redirect('login')
 
+    def form_valid(self, form):
+        changes = activity.form_changes(form)
+        version = form.cleaned_data['version']
+        with transaction.atomic():
+            if version is None or not self.object.claim_version(version):
+                return self.conflict(form)
+            response = super().form_valid(form)
+            notifications.notify(notifications.form_notifications(
+                self.object,
+                changes,
+                self.request.user
+            ))
+        if changes:
+            activity.record(
+                self.object.pk,
+                TaskEvent.UPDATED,
+                changes,
+                self.request.user
+            )
+        return response
+
+    def conflict(self, form):
+        """Show what differs between the saved task and the submission.
+
+        The returned form keeps the user's input but carries the current
+        version, so submitting it again knowingly overwrites the task.
+        """
+        self.object = self.get_object()
+        data = form.data.copy()
+        data['version'] = self.object.version
+        form = self.get_form_class()(data, instance=self.object)
+        # Read before validation, which copies the input onto the task.
+        saved = {name: self._saved_value(name) for name in form.changed_data}
+        form.is_valid()
+        conflicts = [
+            (
+                form.fields[name].label,
+                _shown(value),
+                _shown(form.cleaned_data.get(name)),
+            )
+            for name, value in saved.items()
+        ]
+        form.add_error(None, _(
+            'Someone changed this task while you were editing it. '
+            'Check the saved values and submit again to overwrite them.'
+        ))
+        return self.render_to_response(
+            self.get_context_data(form=form, conflicts=conflicts),
+            status=409
+        )
+
+    def _saved_value(self, name):
+        if name == 'labels':
+            return list(self.object.labels.all())
+        return getattr(self.object, name)
+
 
 class TaskDeleteView(LoginRequiredMixin, DeleteView):
     model = Task
@@ -145,8 +728,18 @@ class TaskDeleteView(LoginRequiredMixin, DeleteView):
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
+        # delete() clears the pk; the event is queued once the row is gone.
+        task_id, name = self.object.pk, self.object.name
+        with transaction.atomic():
+            response = super().form_valid(form)
+            activity.record(
+                task_id,
+                TaskEvent.DELETED,
+                {'name': [name, None]},
+                self.request.user
+            )
         messages.success(
             self.request,
             _('Task successfully deleted')
         )
-        return super().form_valid(form)
+        return response
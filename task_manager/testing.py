@@ -0,0 +1,80 @@
+from collections import Counter
+from contextlib import ContextDecorator
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from task_manager.profiling import fingerprint
+
+
+class query_budget(ContextDecorator):
+    """Fail when a block runs more queries than its budget allows.
+
+    queries caps the total number of statements (None for no cap) and
+    duplicates caps how many statements repeat an earlier one with other
+    parameters, which is how N+1 patterns look. Works as a context
+    manager and as a decorator.
+    """
+
+    def __init__(self, queries=None, duplicates=0, using=DEFAULT_DB_ALIAS):
+        self.queries = queries
+        self.duplicates = duplicates
+        self.using = using
+
+    def __enter__(self):
+        self.context = CaptureQueriesContext(connections[self.using])
+        self.context.__enter__()
+        return self.context
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.context.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            self.check()
+        return False
+
+    def check(self):
+        statements = [query['sql'] for query in self.context.captured_queries]
+        counts = Counter(fingerprint(sql)[1] for sql in statements)
+        repeated = {sql: count for sql, count in counts.items() if count > 1}
+        duplicates = sum(count - 1 for count in repeated.values())
+
+        errors = []
+        if self.queries is not None and len(statements) > self.queries:
+            errors.append(
+                f'{len(statements)} queries executed, '
+                f'budget is {self.queries}'
+            )
+        if self.duplicates is not None and duplicates > self.duplicates:
+            errors.append(
+                f'{duplicates} duplicate queries executed, '
+                f'budget is {self.duplicates}'
+            )
+        if errors:
+            lines = [f'{count}x {sql}' for sql, count in repeated.items()]
+            lines += [
+                f'{index}. {sql}'
+                for index, sql in enumerate(statements, start=1)
+            ]
+            raise AssertionError('\n'.join(errors + ['', *lines]))
+
+
+class QueryBudgetTestCase(TestCase):
+    """TestCase with query budget assertions at growing dataset sizes."""
+
+    dataset_sizes = (1, 10, 60)
+
+    def assertQueryBudget(self, queries=None, duplicates=0):
+        return query_budget(queries, duplicates)
+
+    def assertQueryBudgetScales(self, grow, request, queries, duplicates=0):
+        """Check request() against the budget after each grow(size) call.
+
+        grow receives every size from dataset_sizes in turn and should
+        bring the data up to that size; the budget is the same for all.
+        """
+        for size in self.dataset_sizes:
+            grow(size)
+            with self.subTest(size=size):
+                with self.assertQueryBudget(queries, duplicates):
+                    request()
@@ -1,17 +1,76 @@
+import base64
+import csv
+import importlib
+import json
+import logging
+import os
+import tempfile
+import time
+import weakref
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.test import Client, TestCase
-from django.urls import reverse
-
-from task_manager.models import Label, Status, Task
-
-
-class UserTestCase(TestCase):
+from django.core import mail
+from django.core.asgi import ASGIHandler
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import DatabaseError, OperationalError, connection
+from django.db.models.signals import post_delete, pre_delete
+from django.http import QueryDict
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, reverse
+from django.utils import timezone
+from fakeredis import FakeConnection
+
+from task_manager import (
+    activity,
+    choices,
+    jobs,
+    notifications,
+    page_cache,
+    saved_filters,
+)
+from task_manager.async_views import (
+    AsyncLabelListView,
+    AsyncStatusListView,
+    AsyncTaskDetailView,
+    AsyncTaskListView,
+    AsyncUserListView,
+)
+from task_manager.bulk import DELETE_RECEIVERS
+from task_manager.counters import rebuild_task_counters
+from task_manager.db import pool_stats
+from task_manager.filters import TaskFilter
+from task_manager.models import (
+    Job,
+    Label,
+    Notification,
+    SavedFilter,
+    SavedFilterResult,
+    Status,
+    Task,
+    TaskEvent,
+    UserTaskCounter,
+)
+from task_manager.profiling import fingerprint
+from task_manager.sessions.db import SessionStore
+from task_manager.tasks_views import TaskListView
+from task_manager.testing import QueryBudgetTestCase
+
+
+class UserTestCase(QueryBudgetTestCase):
     fixtures = ['users.json']
 
     def setUp(self):
         self.client = Client()
         self.user1 = User.objects.get(pk=1)
         self.user2 = User.objects.get(pk=2)
+        cache.clear()
 
     def test_users_list(self):
         """Тест списка пользователей"""
@@ -20,6 +79,55 @@ class UserTestCase(TestCase):
         self.assertContains(response, self.user1.username)
         self.assertContains(response, self.user2.username)
 
+        def grow(size):
+            for i in range(User.objects.count(), size):
+                User.objects.create(username=f'budget-{i}', first_name='B')
+
+        self.assertQueryBudgetScales(
+            grow,
+            lambda: self.client.get(reverse('users_list')),
+            queries=2
+        )
+
+    def test_users_list_search_and_counts(self):
+        """Тест поиска пользователей и числа их задач"""
+        status = Status.objects.create(name='Новый')
+        Task.objects.create(
+            name='Задача', status=status, author=self.user2, executor=self.user1
+        )
+        Task.objects.create(name='Ещё задача', status=status, author=self.user2)
+
+        response = self.client.get(reverse('users_list'), {'q': 'user t'})
+        users = list(response.context['users'])
+        self.assertEqual(users, [self.user2])
+        self.assertEqual(users[0].authored_tasks_count, 2)
+        self.assertEqual(users[0].assigned_tasks_count, 0)
+
+        response = self.client.get(reverse('users_list'), {'q': 'ONE'})
+        users = list(response.context['users'])
+        self.assertEqual(users, [self.user1])
+        self.assertEqual(users[0].assigned_tasks_count, 1)
+
+        response = self.client.get(reverse('users_list'), {'q': 'nobody'})
+        self.assertContains(response, 'Пользователи не найдены')
+
+    def test_users_list_pagination(self):
+        """Тест постраничного списка пользователей"""
+        User.objects.bulk_create(
+            User(username=f'page-{i}') for i in range(60)
+        )
+        response = self.client.get(reverse('users_list'))
+        self.assertEqual(len(response.context['users']), 50)
+        next_query = response.context['next_page_query']
+        self.assertIsNotNone(next_query)
+
+        response = self.client.get(f"{reverse('users_list')}?{next_query}")
+        users = list(response.context['users'])
+        self.assertEqual(len(users), 12)
+        self.assertEqual(users[-1].username, 'page-59')
+        self.assertIsNone(response.context['next_page_query'])
+        self.assertIsNotNone(response.context['previous_page_query'])
+
     def test_user_create(self):
         """Тест создания пользователя"""
         response = self.client.get(reverse('user_create'))
@@ -123,7 +231,7 @@ class UserTestCase(TestCase):
         self.assertEqual(response.status_code, 302)
 
 
-class StatusTestCase(TestCase):
+class StatusTestCase(QueryBudgetTestCase):
     fixtures = ['users.json', 'statuses.json']
 
     def setUp(self):
@@ -145,6 +253,16 @@ class StatusTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, self.status1.name)
 
+        def grow(size):
+            for i in range(Status.objects.count(), size):
+                Status.objects.create(name=f'Статус {i}')
+
+        self.assertQueryBudgetScales(
+            grow,
+            lambda: self.client.get(reverse('statuses_list')),
+            queries=4
+        )
+
     def test_status_create(self):
         """Тест создания статуса"""
         self.client.force_login(self.user)
@@ -182,7 +300,7 @@ class StatusTestCase(TestCase):
         self.assertFalse(Status.objects.filter(pk=self.status1.pk).exists())
 
 
-class TaskTestCase(TestCase):
+class TaskTestCase(QueryBudgetTestCase):
     fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
 
     def setUp(self):
@@ -190,6 +308,7 @@ class TaskTestCase(TestCase):
         self.user1 = User.objects.get(pk=1)
         self.user2 = User.objects.get(pk=2)
         self.task1 = Task.objects.get(pk=1)
+        cache.clear()
 
     def test_tasks_list_not_authenticated(self):
         """Тест: список задач недоступен без авторизации"""
@@ -203,6 +322,216 @@ class TaskTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, self.task1.name)
 
+        def grow(size):
+            self._create_tasks(max(size - Task.objects.count(), 0))
+
+        self.assertQueryBudgetScales(
+            grow,
+            lambda: self.client.get(reverse('tasks_list')),
+            queries=6
+        )
+        # Validating the executor filter loads that user the same way the
+        # session loads the current one: one fixed repeat, not an N+1.
+        self.assertQueryBudgetScales(
+            grow,
+            lambda: self.client.get(
+                reverse('tasks_list'),
+                {'executor': self.user2.pk, 'label': 1}
+            ),
+            queries=7,
+            duplicates=1
+        )
+
+    def _create_tasks(self, count):
+        status = Status.objects.first()
+        labels = list(Label.objects.all())
+        offset = Task.objects.count()
+        for i in range(offset, offset + count):
+            task = Task.objects.create(
+                name=f'Задача {i}',
+                status=status,
+                author=self.user1,
+                executor=self.user2,
+            )
+            task.labels.set(labels)
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_tasks_list_query_count_is_constant(self):
+        """Тест: число запросов списка задач не зависит от числа задач"""
+        self.client.force_login(self.user1)
+        url = reverse('tasks_list')
+
+        self._create_tasks(2)
+        self._count_queries(url)
+        small = self._count_queries(url)
+        self._create_tasks(20)
+        large = self._count_queries(url)
+
+        self.assertEqual(small, large)
+
+    def test_task_detail_query_count(self):
+        """Тест: детальная страница задачи загружает связи заранее"""
+        self.client.force_login(self.user1)
+        self._create_tasks(1)
+        task = Task.objects.latest('pk')
+        task.labels.add(Label.objects.create(name='Ещё метка'))
+
+        self.assertEqual(
+            self._count_queries(reverse('task_detail', args=[task.pk])),
+            self._count_queries(reverse('task_detail', args=[self.task1.pk])),
+        )
+
+    def test_tasks_list_cursor_pagination(self):
+        """Тест постраничного вывода задач по курсору"""
+        self.client.force_login(self.user1)
+        self._create_tasks(4)
+        expected = list(Task.objects.order_by('created_at', 'pk'))
+
+        with patch.object(TaskListView, 'paginate_by', 2):
+            seen = []
+            params = {'status': self.task1.status.pk}
+            while True:
+                response = self.client.get(reverse('tasks_list'), params)
+                self.assertEqual(response.status_code, 200)
+                seen.extend(response.context['tasks'])
+                query = response.context['next_page_query']
+                if query is None:
+                    break
+                params = QueryDict(query)
+                self.assertEqual(
+                    params['status'], str(self.task1.status.pk)
+                )
+
+            self.assertEqual(seen, expected)
+
+            response = self.client.get(
+                reverse('tasks_list'),
+                QueryDict(response.context['previous_page_query'])
+            )
+            self.assertEqual(list(response.context['tasks']), expected[2:4])
+
+    def test_tasks_list_invalid_cursor(self):
+        """Тест: неверный курсор возвращает 404"""
+        self.client.force_login(self.user1)
+        for values in ([None, None], [[1], {}], ['2024-01-01', [2]]):
+            cursor = base64.urlsafe_b64encode(
+                json.dumps([values, 0]).encode()
+            ).decode()
+            for name, args, status in (
+                ('tasks_list', [], 404),
+                ('users_list', [], 404),
+                ('task_history', [self.task1.pk], 404),
+                ('tasks_api', [], 400),
+            ):
+                response = self.client.get(
+                    reverse(name, args=args),
+                    {'cursor': cursor}
+                )
+                self.assertEqual(response.status_code, status, (name, values))
+        response = self.client.get(
+            reverse('tasks_list'),
+            {'cursor': 'not-a-cursor'}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_task_rows_fragment_cache(self):
+        """Тест: строки списка задач кэшируются и обновляются при изменениях"""
+        self.client.force_login(self.user1)
+        url = reverse('tasks_list')
+        self.client.get(url)
+
+        with patch('task_manager.fragments.render_to_string') as render:
+            response = self.client.get(url)
+        render.assert_not_called()
+        self.assertContains(response, self.task1.name)
+
+        Status.objects.filter(pk=self.task1.status_id).update(
+            name='Переименованный статус'
+        )
+        self.user1.first_name = 'Новое'
+        self.user1.save()
+        response = self.client.get(url)
+        self.assertContains(response, 'Переименованный статус')
+        self.assertContains(response, 'Новое One')
+
+    def test_tasks_export_csv(self):
+        """Тест экспорта отфильтрованных задач в CSV"""
+        self.client.force_login(self.user1)
+        self._create_tasks(3)
+
+        response = self.client.get(
+            reverse('tasks_list'),
+            {'executor': self.user2.pk, 'export': 'csv'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('tasks.csv', response['Content-Disposition'])
+        rows = list(csv.reader(
+            b''.join(response.streaming_content).decode().splitlines()
+        ))
+        self.assertEqual(rows[0][:3], ['id', 'name', 'description'])
+        self.assertEqual([row[1] for row in rows[1:]], [
+            'Задача 1', 'Задача 2', 'Задача 3'
+        ])
+        self.assertEqual(rows[1][6], 'bug, feature')
+
+    def test_tasks_export_ndjson(self):
+        """Тест экспорта задач в NDJSON с пакетной загрузкой меток"""
+        self.client.force_login(self.user1)
+        self._create_tasks(2)
+        url = reverse('tasks_list')
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as before:
+            response = self.client.get(url, {'export': 'ndjson'})
+            b''.join(response.streaming_content)
+        self._create_tasks(5)
+        with self.assertNumQueries(len(before.captured_queries)):
+            response = self.client.get(url, {'export': 'ndjson'})
+            lines = b''.join(response.streaming_content).splitlines()
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(len(lines), 8)
+        self.assertEqual(json.loads(lines[0])['name'], self.task1.name)
+
+    def test_task_form_choices_cached(self):
+        """Тест: списки выбора формы задачи берутся из кэша"""
+        self.client.force_login(self.user1)
+        url = reverse('task_update', args=[self.task1.pk])
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        choice_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "task_manager_status"' in query['sql']
+            or 'FROM "task_manager_label" ORDER' in query['sql']
+        ]
+        self.assertEqual(choice_queries, [])
+        self.assertContains(
+            response,
+            f'<option value="{self.task1.labels.get().pk}" selected>',
+        )
+        self.assertContains(response, self.user2.get_full_name())
+
+        self.client.post(reverse('label_create'), {'name': 'Свежая метка'})
+        response = self.client.get(url)
+        self.assertContains(response, 'Свежая метка')
+
+        # A change made by another worker reaches this one when the list
+        # expires.
+        Label.objects.filter(name='Свежая метка').update(name='Чужая метка')
+        self.assertNotContains(self.client.get(url), 'Чужая метка')
+        later = time.time() + settings.CHOICES_CACHE_TIMEOUT + 1
+        with patch('time.time') as now:
+            now.return_value = later
+            response = self.client.get(url)
+        self.assertContains(response, 'Чужая метка')
+
     def test_task_create(self):
         """Тест создания задачи"""
         self.client.force_login(self.user1)
@@ -233,12 +562,102 @@ class TaskTestCase(TestCase):
                 'name': 'Обновлённая задача',
                 'description': 'Новое описание',
                 'status': status.pk,
+                'version': self.task1.version,
             }
         )
         self.assertEqual(response.status_code, 302)
         self.task1.refresh_from_db()
         self.assertEqual(self.task1.name, 'Обновлённая задача')
 
+    def test_task_update_checks_version(self):
+        """Тест: изменение устаревшей версии задачи не перезаписывает её"""
+        self.client.force_login(self.user1)
+        url = reverse('task_update', args=[self.task1.pk])
+        response = self.client.get(url)
+        self.assertContains(
+            response,
+            '<input type="hidden" name="version" value="0" id="id_version">',
+            html=True
+        )
+        data = {
+            'name': self.task1.name,
+            'description': 'Правка первого',
+            'status': self.task1.status_id,
+            'version': 0,
+        }
+
+        response = self.client.post(url, {**data, 'executor': self.user2.pk})
+        self.assertEqual(response.status_code, 302)
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.version, 1)
+
+        response = self.client.post(url, {
+            **data, 'description': 'Правка второго'
+        })
+        self.assertEqual(response.status_code, 409)
+        self.assertContains(
+            response, 'её изменил кто-то другой', status_code=409
+        )
+        self.assertContains(response, 'Сохранённое значение', status_code=409)
+        self.assertContains(
+            response,
+            '<tr><th>Исполнитель</th><td>User Two</td><td>-</td></tr>',
+            html=True,
+            status_code=409
+        )
+        self.assertContains(
+            response,
+            '<input type="hidden" name="version" value="1" id="id_version">',
+            html=True,
+            status_code=409
+        )
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.description, 'Правка первого')
+        self.assertEqual(self.task1.executor, self.user2)
+
+        response = self.client.post(url, {
+            **data, 'description': 'Правка второго', 'version': 1
+        })
+        self.assertEqual(response.status_code, 302)
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.description, 'Правка второго')
+        self.assertIsNone(self.task1.executor)
+        self.assertEqual(self.task1.version, 2)
+
+    def test_any_save_bumps_version(self):
+        """Тест: любое сохранение задачи меняет версию"""
+        stale = Task.objects.get(pk=self.task1.pk)
+        self.task1.description = 'Из скрипта'
+        self.task1.save()
+        self.assertEqual(self.task1.version, 1)
+        stale.save(update_fields=['name'])
+        self.assertEqual(stale.version, 2)
+        self.assertEqual(Task.objects.get(pk=self.task1.pk).version, 2)
+
+        self.client.force_login(self.user1)
+        url = reverse('task_update', args=[self.task1.pk])
+        data = {'name': self.task1.name, 'status': 1}
+        response = self.client.post(url, {**data, 'version': 0})
+        self.assertEqual(response.status_code, 409)
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 409)
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.description, 'Из скрипта')
+        self.assertEqual(self.task1.version, 2)
+
+    def test_bulk_change_bumps_version(self):
+        """Тест: групповое изменение тоже меняет версию задачи"""
+        self.client.force_login(self.user1)
+        self.client.post(reverse('tasks_bulk'), {
+            'action': 'status', 'status': 2, 'tasks': [self.task1.pk]
+        })
+        response = self.client.post(
+            reverse('task_update', args=[self.task1.pk]),
+            {'name': self.task1.name, 'status': 1, 'version': 0}
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Task.objects.get(pk=self.task1.pk).status_id, 2)
+
     def test_task_delete_by_author(self):
         """Тест удаления задачи автором"""
         self.client.force_login(self.user1)
@@ -309,6 +728,87 @@ class TaskTestCase(TestCase):
         for task in response.context['filter'].qs:
             self.assertIn(label, task.labels.all())
 
+    def test_task_filter_by_label_field(self):
+        """Тест фильтрации задач по полю метки из формы фильтра"""
+        self.client.force_login(self.user1)
+        self._create_tasks(2)
+        label = Label.objects.create(name='Редкая метка')
+        tagged = Task.objects.latest('pk')
+        tagged.labels.add(label)
+
+        response = self.client.get(
+            reverse('tasks_list'),
+            {'label': label.pk}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['tasks']), [tagged])
+
+    def test_task_search_ranked(self):
+        """Тест полнотекстового поиска с ранжированием"""
+        self.client.force_login(self.user1)
+        status = Status.objects.first()
+        in_description = Task.objects.create(
+            name='Обычная задача',
+            description='Упал сервер базы данных',
+            status=status,
+            author=self.user1,
+        )
+        in_name = Task.objects.create(
+            name='Перезапустить сервер',
+            status=status,
+            author=self.user1,
+        )
+
+        response = self.client.get(reverse('tasks_list'), {'q': 'Сервер'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(response.context['tasks']),
+            [in_name, in_description]
+        )
+
+    def test_task_search_index_follows_changes(self):
+        """Тест: поисковый индекс обновляется при изменении задач"""
+        self.client.force_login(self.user1)
+        url = reverse('tasks_list')
+
+        self.task1.description = 'Уникальноеслово'
+        self.task1.save()
+        response = self.client.get(url, {'q': 'уникальное'})
+        self.assertEqual(list(response.context['tasks']), [self.task1])
+
+        self.task1.delete()
+        response = self.client.get(url, {'q': 'уникальное'})
+        self.assertEqual(list(response.context['tasks']), [])
+
+    def test_task_search_pagination(self):
+        """Тест постраничного вывода результатов поиска"""
+        self.client.force_login(self.user1)
+        self._create_tasks(5)
+
+        with patch.object(TaskListView, 'paginate_by', 2):
+            response = self.client.get(reverse('tasks_list'), {'q': 'задача'})
+            seen = list(response.context['tasks'])
+            while response.context['next_page_query']:
+                response = self.client.get(
+                    reverse('tasks_list'),
+                    QueryDict(response.context['next_page_query'])
+                )
+                seen.extend(response.context['tasks'])
+
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(len(set(seen)), 6)
+
+    def test_explain_task_filters_command(self):
+        """Тест команды explain_task_filters"""
+        out = StringIO()
+        call_command('explain_task_filters', '--seed', '50', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 16)
+        self.assertTrue(lines[-1].startswith(
+            'status + executor + label + self_tasks: '
+        ))
+        self.assertEqual(Task.objects.count(), 1)
+
     def test_task_filter_self_tasks(self):
         """Тест фильтрации только своих задач"""
         self.client.force_login(self.user1)
@@ -322,7 +822,1499 @@ class TaskTestCase(TestCase):
             self.assertEqual(task.author, self.user1)
 
 
-class LabelTestCase(TestCase):
+class TaskApiTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
+
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.user2 = User.objects.get(pk=2)
+        self.status = Status.objects.get(pk=1)
+        self.client.force_login(self.user1)
+        for i in range(4):
+            task = Task.objects.create(
+                name=f'API задача {i}',
+                status=self.status,
+                author=self.user2,
+                executor=self.user1,
+            )
+            task.labels.set(Label.objects.all())
+
+    def get_json(self, **params):
+        response = self.client.get(reverse('tasks_api'), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_api_not_authenticated(self):
+        """Тест: API недоступно без авторизации"""
+        self.client.logout()
+        response = self.client.get(reverse('tasks_api'))
+        self.assertEqual(response.status_code, 401)
+
+    def test_api_lists_tasks_with_names(self):
+        """Тест: API возвращает задачи с именами связанных объектов"""
+        data = self.get_json()
+        self.assertEqual(len(data['results']), 5)
+        self.assertIsNone(data['next'])
+        task = data['results'][-1]
+        self.assertEqual(task['name'], 'API задача 3')
+        self.assertEqual(task['status'], self.status.name)
+        self.assertEqual(task['author'], self.user2.get_full_name())
+        self.assertEqual(task['executor'], self.user1.get_full_name())
+        self.assertEqual(task['labels'], ['bug', 'feature'])
+
+    def test_api_filters_fields_and_cursor(self):
+        """Тест: API поддерживает фильтры, выбор полей и курсор"""
+        data = self.get_json(self_tasks='on', fields='id,name', limit=1)
+        self.assertEqual(data['results'], [{'id': 1, 'name': 'Первая задача'}])
+        self.assertIsNone(data['next'])
+
+        names = []
+        params = {'executor': self.user1.pk, 'fields': 'name', 'limit': 3}
+        while True:
+            data = self.get_json(**params)
+            names.extend(task['name'] for task in data['results'])
+            if data['next'] is None:
+                break
+            params['cursor'] = data['next']
+        self.assertEqual(names, [f'API задача {i}' for i in range(4)])
+
+    def test_api_query_count_is_constant(self):
+        """Тест: число запросов API не зависит от числа задач"""
+        with CaptureQueriesContext(connection) as before:
+            self.get_json()
+        Task.objects.create(
+            name='Ещё одна',
+            status=self.status,
+            author=self.user1,
+        )
+        with self.assertNumQueries(len(before.captured_queries)):
+            self.get_json()
+
+    def test_api_rejects_bad_parameters(self):
+        """Тест: API отклоняет неверные параметры"""
+        for params in (
+            {'fields': 'name,password'},
+            {'limit': 'many'},
+            {'limit': '²'},
+            {'limit': '0'},
+            {'limit': '-5'},
+            {'cursor': 'broken'},
+            {'status': 'abc'},
+        ):
+            response = self.client.get(reverse('tasks_api'), params)
+            self.assertEqual(response.status_code, 400, params)
+
+
+class TaskCounterTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
+
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.user2 = User.objects.get(pk=2)
+        self.status1 = Status.objects.get(pk=1)
+        self.status2 = Status.objects.get(pk=2)
+        self.label1 = Label.objects.get(pk=1)
+        self.label2 = Label.objects.create(name='Вторая метка')
+
+    def assertCounts(self, status1, status2, label1, label2, executor):
+        self.status1.refresh_from_db()
+        self.status2.refresh_from_db()
+        self.label1.refresh_from_db()
+        self.label2.refresh_from_db()
+        counter = UserTaskCounter.objects.filter(user=self.user2).first()
+        self.assertEqual(
+            (
+                self.status1.tasks_count,
+                self.status2.tasks_count,
+                self.label1.tasks_count,
+                self.label2.tasks_count,
+                counter.assigned_tasks_count if counter else 0,
+            ),
+            (status1, status2, label1, label2, executor)
+        )
+
+    def test_counters_follow_task_changes(self):
+        """Тест: счётчики обновляются при изменении задач"""
+        self.assertCounts(1, 0, 1, 0, 0)
+
+        task = Task.objects.create(
+            name='Счётчики',
+            status=self.status1,
+            author=self.user1,
+            executor=self.user2,
+        )
+        task.labels.add(self.label1, self.label2)
+        self.assertCounts(2, 0, 2, 1, 1)
+
+        task = Task.objects.get(pk=task.pk)
+        task.status = self.status2
+        task.executor = None
+        task.save()
+        task.labels.remove(self.label1, self.label1)
+        self.assertCounts(1, 1, 1, 1, 0)
+
+        self.label1.tasks.add(task)
+        task.labels.clear()
+        self.assertCounts(1, 1, 1, 0, 0)
+
+        task.labels.add(self.label2)
+        task.delete()
+        self.assertCounts(1, 0, 1, 0, 0)
+
+    def test_counters_follow_deferred_task_changes(self):
+        """Тест: счётчики верны для задачи, загруженной не полностью"""
+        task = Task.objects.only('name').get(pk=1)
+        task.status_id = self.status2.pk
+        task.executor_id = self.user2.pk
+        task.save()
+        self.assertCounts(0, 1, 1, 0, 1)
+
+        task = Task.objects.only('name').get(pk=1)
+        task.name = 'Только имя'
+        task.save()
+        self.assertTrue(
+            {'status_id', 'executor_id'} <= task.get_deferred_fields()
+        )
+        self.assertCounts(0, 1, 1, 0, 1)
+
+    def test_rebuild_task_counters_command(self):
+        """Тест команды пересчёта счётчиков"""
+        Status.objects.update(tasks_count=10)
+        Label.objects.update(tasks_count=10)
+        Task.objects.update(executor=self.user2)
+
+        call_command('rebuild_task_counters', stdout=StringIO())
+        self.assertCounts(1, 0, 1, 0, 1)
+
+    def test_rebuild_refreshes_list_validators(self):
+        """Тест: после пересчёта списки статусов и меток не отвечают 304"""
+        self.client.force_login(self.user1)
+        for name in ('statuses_list', 'labels_list'):
+            url = reverse(name)
+            etag = self.client.get(url)['ETag']
+            Status.objects.update(tasks_count=10)
+            Label.objects.update(tasks_count=10)
+            rebuild_task_counters()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200, name)
+
+    def test_status_in_use_list_and_delete(self):
+        """Тест: статусы показывают число задач и не удаляются при использовании"""
+        self.client.force_login(self.user1)
+        response = self.client.get(reverse('statuses_list'))
+        self.assertContains(response, '<td>1</td>', html=True)
+
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                reverse('status_delete', args=[self.status1.pk])
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Status.objects.filter(pk=self.status1.pk).exists())
+
+
+class TaskBulkTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
+
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.user2 = User.objects.get(pk=2)
+        self.status1 = Status.objects.get(pk=1)
+        self.status2 = Status.objects.get(pk=2)
+        self.labels = list(Label.objects.all())
+        self.tasks = [Task.objects.get(pk=1)]
+        for i in range(4):
+            task = Task.objects.create(
+                name=f'Пакет {i}',
+                status=self.status1,
+                author=self.user1 if i % 2 else self.user2,
+            )
+            task.labels.add(self.labels[0])
+            self.tasks.append(task)
+        self.client.force_login(self.user1)
+
+    def counters(self):
+        return (
+            list(Status.objects.values_list('pk', 'tasks_count')),
+            list(Label.objects.values_list('pk', 'tasks_count')),
+            list(UserTaskCounter.objects.values_list(
+                'user_id', 'assigned_tasks_count'
+            )),
+        )
+
+    def assertCountersConsistent(self):
+        counters = self.counters()
+        rebuild_task_counters()
+        self.assertEqual(counters, self.counters())
+
+    def bulk(self, action, tasks=None, **data):
+        tasks = self.tasks if tasks is None else tasks
+        return self.client.post(
+            reverse('tasks_bulk'),
+            {'action': action, 'tasks': [task.pk for task in tasks], **data},
+            follow=True
+        )
+
+    def test_bulk_update(self):
+        """Тест группового изменения статуса, исполнителя и меток"""
+        response = self.bulk('status', status=self.status2.pk)
+        self.assertContains(response, 'Изменено задач: 5')
+        self.assertEqual(
+            Task.objects.filter(status=self.status2).count(), 5
+        )
+        self.assertCountersConsistent()
+
+        response = self.bulk('executor', executor=self.user2.pk)
+        self.assertContains(response, 'Изменено задач: 5')
+        response = self.bulk('executor', tasks=self.tasks[:2])
+        self.assertContains(response, 'Изменено задач: 2')
+        self.assertCountersConsistent()
+
+        response = self.bulk('add_labels', labels=[self.labels[1].pk])
+        self.assertContains(response, 'Изменено задач: 5')
+        self.assertEqual(self.labels[1].tasks.count(), 5)
+        self.assertCountersConsistent()
+
+        response = self.bulk('remove_labels', labels=[
+            label.pk for label in self.labels
+        ])
+        self.assertContains(response, 'Изменено задач: 5')
+        self.assertFalse(Task.labels.through.objects.exists())
+        self.assertCountersConsistent()
+
+    def test_bulk_update_query_count_is_constant(self):
+        """Тест: число запросов не зависит от числа выбранных задач"""
+        url = reverse('tasks_bulk')
+        data = {'action': 'add_labels', 'labels': [self.labels[1].pk]}
+        with CaptureQueriesContext(connection) as few:
+            self.client.post(url, {**data, 'tasks': [self.tasks[0].pk]})
+        with CaptureQueriesContext(connection) as many:
+            self.client.post(url, {
+                **data, 'tasks': [task.pk for task in self.tasks[1:]]
+            })
+        self.assertEqual(len(few), len(many))
+
+    def test_bulk_delete_only_own_tasks(self):
+        """Тест: групповое удаление пропускает чужие задачи"""
+        response = self.bulk('delete')
+        self.assertContains(response, 'Изменено задач: 3')
+        self.assertContains(response, 'Пакет 0, Пакет 2')
+        self.assertEqual(
+            sorted(Task.objects.values_list('name', flat=True)),
+            ['Пакет 0', 'Пакет 2']
+        )
+        self.assertCountersConsistent()
+
+    def test_bulk_delete_covers_delete_receivers(self):
+        """Тест: групповое удаление заменяет все обработчики удаления задач"""
+        receivers = set()
+        for signal in (pre_delete, post_delete):
+            self.assertTrue(signal.has_listeners(Task))
+            for (_, sender), receiver, _ in signal.receivers:
+                if sender not in (id(Task), id(None)):
+                    continue
+                if isinstance(receiver, weakref.ReferenceType):
+                    receiver = receiver()
+                receivers.add(f'{receiver.__module__}.{receiver.__name__}')
+        self.assertEqual(receivers, set(DELETE_RECEIVERS))
+
+    def test_bulk_requires_tasks_and_values(self):
+        """Тест: без задач или значения действие не выполняется"""
+        response = self.bulk('status', tasks=[], status=self.status2.pk)
+        self.assertContains(response, 'Выберите хотя бы одну задачу')
+        response = self.bulk('status')
+        self.assertContains(response, 'Выберите статус')
+        self.assertFalse(Task.objects.filter(status=self.status2).exists())
+
+
+class TaskActivityTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
+
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.task = Task.objects.get(pk=1)
+        self.client.force_login(self.user1)
+        activity.flush()
+
+    def post(self, url, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(url, data)
+
+    def update(self, **data):
+        self.post(reverse('task_update', args=[self.task.pk]), {
+            'name': self.task.name,
+            'description': self.task.description,
+            'status': self.task.status_id,
+            'labels': [1],
+            'version': Task.objects.get(pk=self.task.pk).version,
+            **data,
+        })
+
+    def test_events_are_queued_until_flushed(self):
+        """Тест: события пишутся пачкой, а не в запросе"""
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(0):
+                activity.record(self.task.pk, TaskEvent.UPDATED)
+                activity.record(self.task.pk, TaskEvent.UPDATED)
+        self.assertFalse(TaskEvent.objects.exists())
+        with self.assertNumQueries(1):
+            self.assertEqual(activity.flush(), 2)
+        self.assertEqual(TaskEvent.objects.count(), 2)
+
+    def test_rolled_back_changes_are_not_logged(self):
+        """Тест: изменения отменённой транзакции не попадают в журнал"""
+        activity.record(self.task.pk, TaskEvent.UPDATED)
+        self.assertEqual(activity.flush(), 0)
+
+    def test_delete_is_logged_only_when_done(self):
+        """Тест: удаление записывается, только если задача удалена"""
+        url = reverse('task_delete', args=[self.task.pk])
+        with patch.object(Task, 'delete', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.post(url, {})
+        self.assertEqual(activity.flush(), 0)
+
+        self.post(url, {})
+        activity.flush()
+        event = TaskEvent.objects.get(task_id=1)
+        self.assertEqual(event.action, TaskEvent.DELETED)
+        self.assertEqual(event.changes, {'name': ['Первая задача', None]})
+
+    def test_update_records_field_changes(self):
+        """Тест: изменение задачи записывает изменённые поля"""
+        self.update(status=2, executor=2, labels=[2])
+        self.update(status=2, executor=2, labels=[2])
+        activity.flush()
+
+        event = TaskEvent.objects.get(task=self.task)
+        self.assertEqual(event.action, TaskEvent.UPDATED)
+        self.assertEqual(event.actor, self.user1)
+        self.assertEqual(event.changes, {
+            'status': [1, 2],
+            'executor': [None, 2],
+            'labels': [[2], [1]],
+        })
+
+    def test_bulk_actions_record_events(self):
+        """Тест: групповые действия записывают событие на каждую задачу"""
+        other = Task.objects.create(
+            name='Вторая', status_id=1, author=self.user1
+        )
+        url = reverse('tasks_bulk')
+        tasks = [self.task.pk, other.pk]
+        self.post(url, {'action': 'status', 'status': 2, 'tasks': tasks})
+        self.post(url, {'action': 'add_labels', 'labels': [2], 'tasks': tasks})
+        self.post(url, {'action': 'delete', 'tasks': [other.pk]})
+        activity.flush()
+
+        self.assertEqual(
+            list(TaskEvent.objects.filter(task=other).order_by('pk')
+                 .values_list('action', 'changes')),
+            [
+                (TaskEvent.UPDATED, {'status': [1, 2]}),
+                (TaskEvent.UPDATED, {'labels': [[2], []]}),
+                (TaskEvent.DELETED, {'name': ['Вторая', None]}),
+            ]
+        )
+        self.assertEqual(self.task.events.count(), 2)
+
+    def test_history_page(self):
+        """Тест страницы истории задачи"""
+        self.update(status=2, executor=2, labels=[2])
+        response = self.client.get(
+            reverse('task_detail', args=[self.task.pk])
+        )
+        self.assertContains(
+            response, reverse('task_history', args=[self.task.pk])
+        )
+
+        with self.assertNumQueries(8):
+            response = self.client.get(
+                reverse('task_history', args=[self.task.pk])
+            )
+        self.assertContains(response, 'В работе')
+        self.assertContains(response, 'User Two')
+        self.assertContains(response, '+feature')
+        self.assertContains(response, '&minus;bug')
+
+    def test_history_is_paginated(self):
+        """Тест постраничного вывода истории"""
+        with self.captureOnCommitCallbacks(execute=True):
+            activity.record_many(
+                activity.event(self.task.pk, TaskEvent.UPDATED)
+                for _ in range(25)
+            )
+        url = reverse('task_history', args=[self.task.pk])
+        response = self.client.get(url)
+        self.assertEqual(len(response.context['events']), 20)
+        response = self.client.get(
+            f"{url}?{response.context['next_page_query']}"
+        )
+        self.assertEqual(len(response.context['events']), 5)
+
+
+class ImportTasksTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
+
+    def run_import(self, content, suffix, *args):
+        with tempfile.NamedTemporaryFile(
+            'w', suffix=suffix, encoding='utf-8', delete=False
+        ) as file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            'import_tasks', file.name, *args, stdout=stdout, stderr=stderr
+        )
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_csv(self):
+        """Тест импорта задач из CSV"""
+        content = (
+            'name,description,status,author,executor,labels\n'
+            'Импорт 1,Описание,Новый,user1,User Two,"bug, feature"\n'
+            'Импорт 2,,Новый,User One,,\n'
+            'Импорт 3,,Нет такого,user1,,\n'
+        )
+        with self.assertNumQueries(18):
+            stdout, stderr = self.run_import(content, '.csv')
+
+        self.assertIn('Imported 2 of 3 rows', stdout)
+        self.assertIn('Row 3: unknown status', stderr)
+        task = Task.objects.get(name='Импорт 1')
+        self.assertEqual(task.author.username, 'user1')
+        self.assertEqual(task.executor.username, 'user2')
+        self.assertEqual(
+            sorted(task.labels.values_list('name', flat=True)),
+            ['bug', 'feature']
+        )
+        self.assertEqual(task.status.tasks_count, 3)
+        self.assertEqual(task.executor.task_counter.assigned_tasks_count, 1)
+
+    def test_import_json_batches_and_existing_names(self):
+        """Тест импорта JSON пачками с пропуском существующих задач"""
+        existing = Task.objects.get(pk=1).name
+        rows = [
+            {'name': name, 'status': 'Новый', 'labels': ['bug']}
+            for name in [existing, 'Первая', 'Вторая', 'Третья']
+        ]
+        stdout, stderr = self.run_import(
+            json.dumps(rows), '.json', '--author', 'user2', '--batch-size', '2'
+        )
+        self.assertIn('Imported 3 of 4 rows', stdout)
+        self.assertIn('already exists', stderr)
+        self.assertEqual(Label.objects.get(name='bug').tasks.count(), 4)
+
+    def test_import_dry_run_and_create_missing(self):
+        """Тест: пробный запуск ничего не записывает"""
+        content = json.dumps(
+            {'name': 'Проверка', 'status': 'Отложен', 'author': 'user1',
+             'labels': ['новая метка']}
+        ) + '\n'
+        stdout, _ = self.run_import(
+            content, '.ndjson', '--dry-run', '--create-missing'
+        )
+        self.assertIn('Validated 1 of 1 rows', stdout)
+        self.assertFalse(Task.objects.filter(name='Проверка').exists())
+        self.assertFalse(Status.objects.filter(name='Отложен').exists())
+
+        self.run_import(content, '.ndjson', '--create-missing')
+        task = Task.objects.get(name='Проверка')
+        self.assertEqual(task.status.name, 'Отложен')
+        self.assertEqual(task.labels.get().name, 'новая метка')
+
+    def test_import_bad_rows_are_skipped(self):
+        """Тест: неразборчивые строки считаются ошибками, а не прерывают импорт"""
+        content = '\n'.join([
+            json.dumps({'name': 'Хорошая 1', 'status': 'Новый'}),
+            'not json',
+            '[1]',
+            json.dumps({'name': ['список'], 'status': 'Новый'}),
+            json.dumps({'name': 'Метки', 'status': 'Новый', 'labels': 'bug'}),
+            json.dumps({'name': 'Хорошая 2', 'status': 'Новый'}),
+        ]) + '\n'
+        stdout, stderr = self.run_import(
+            content, '.ndjson', '--author', 'user1', '--dry-run'
+        )
+        self.assertIn('Validated 2 of 6 rows', stdout)
+        self.assertIn('4 errors', stdout)
+        self.assertIn('Row 2: invalid JSON', stderr)
+        self.assertIn('Row 3: expected an object', stderr)
+        self.assertIn('Row 4: name must be a string', stderr)
+        self.assertIn('Row 5: labels must be a list of names', stderr)
+
+        content = json.dumps([{'name': 'Хорошая', 'status': 'Новый'}])
+        stdout, stderr = self.run_import(
+            content[:-1] + ', {"name": }]', '.json', '--author', 'user1'
+        )
+        self.assertIn('Imported 1 of 2 rows', stdout)
+        self.assertIn('Row 2: invalid JSON', stderr)
+        self.assertTrue(Task.objects.filter(name='Хорошая').exists())
+
+
+class LoadToolsTestCase(TestCase):
+    def test_seed_load(self):
+        """Тест генерации синтетических данных"""
+        call_command(
+            'seed_load', '--tasks', '30', '--users', '3', '--statuses', '2',
+            '--labels', '2', '--random-seed', '1', stdout=StringIO()
+        )
+        self.assertEqual(Task.objects.count(), 30)
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(
+            sum(Status.objects.values_list('tasks_count', flat=True)), 30
+        )
+
+    def test_bench_http_writes_results(self):
+        """Тест: бенчмарк записывает задержки и число запросов"""
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'bench.json')
+            call_command(
+                'bench_http', '--tasks', '20', '--users', '2', '--repeat', '2',
+                '--only', 'tasks_list', 'task_delete', '--output', output,
+                stdout=StringIO()
+            )
+            with open(output, encoding='utf-8') as file:
+                results = json.load(file)['results']
+
+        self.assertEqual(set(results), {'tasks_list', 'task_delete'})
+        self.assertEqual(results['tasks_list']['status'], 200)
+        self.assertEqual(results['task_delete']['status'], 302)
+        self.assertGreater(results['tasks_list']['queries'], 0)
+        self.assertFalse(Task.objects.exists())
+
+
+class ProfilingMiddlewareTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
+
+    def test_disabled_by_default(self):
+        """Тест: профилирование выключено по умолчанию"""
+        response = self.client.get(reverse('index'))
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(PROFILE_REQUESTS=True, PROFILE_DUPLICATE_QUERIES=True)
+    def test_server_timing_and_log(self):
+        """Тест: заголовок Server-Timing и структурированный лог"""
+        client = Client()
+        client.force_login(User.objects.get(pk=1))
+        with self.assertLogs('task_manager.profiling', 'INFO') as logs:
+            response = client.get(reverse('tasks_list'))
+
+        timing = response['Server-Timing']
+        for name in ('total', 'db', 'session', 'auth', 'view', 'template'):
+            self.assertIn(f'{name};dur=', timing)
+        self.assertIn('dup;desc=', timing)
+
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record['path'], reverse('tasks_list'))
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertGreater(record['template_ms'], 0)
+        self.assertEqual(record['duplicates'], [])
+
+    def test_fingerprint_ignores_in_list_size(self):
+        """Тест: отпечаток запроса не зависит от длины списка IN"""
+        sql = 'SELECT * FROM "t" WHERE "t"."id" IN ({})'
+        self.assertEqual(
+            fingerprint(sql.format('%s, %s')),
+            fingerprint(sql.format('%s, %s, %s, %s'))
+        )
+
+
+class DatabaseStatsTestCase(TestCase):
+    fixtures = ['users.json']
+
+    def test_superuser_only(self):
+        """Тест: статистика соединений доступна только суперпользователю"""
+        self.client.force_login(User.objects.get(pk=1))
+        response = self.client.get(reverse('db_stats'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_connection_stats(self):
+        """Тест: статистика соединений текущего процесса"""
+        admin = User.objects.create_superuser('admin', password='admin')
+        self.client.force_login(admin)
+        stats = self.client.get(reverse('db_stats')).json()
+        self.assertEqual(stats['pid'], os.getpid())
+        default = stats['databases']['default']
+        self.assertEqual(default['vendor'], connection.vendor)
+        self.assertIn('connections_opened', default)
+        self.assertNotIn('pool', default)
+
+    def test_pool_stats(self):
+        """Тест: счётчики пула соединений"""
+        class Pool:
+            def get_stats(self):
+                return {'requests_num': 7, 'requests_queued': 2}
+
+        with patch.object(connection, 'pool', Pool(), create=True):
+            pool = pool_stats()['databases']['default']['pool']
+        self.assertEqual(pool['checkouts'], 7)
+        self.assertEqual(pool['waits'], 2)
+        self.assertEqual(pool['timeouts'], 0)
+
+
+class JobQueueTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
+
+    def setUp(self):
+        self.calls = []
+        registry = patch.dict(jobs.REGISTRY, {
+            'remember': lambda **payload: self.calls.append(payload),
+            'broken': lambda: 1 / 0,
+        })
+        registry.start()
+        self.addCleanup(registry.stop)
+
+    def run_worker(self, *args):
+        stdout = StringIO()
+        call_command('run_worker', '--once', *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_enqueue_and_run(self):
+        """Тест: задание из очереди выполняется обработчиком"""
+        job = jobs.enqueue('remember', task=1)
+        jobs.enqueue(
+            'remember',
+            task=2,
+            run_at=timezone.now() + timedelta(hours=1)
+        )
+        with self.assertRaises(jobs.UnknownJob):
+            jobs.enqueue('missing')
+
+        self.assertIn('Jobs done: 1, retried: 0, failed: 0', self.run_worker())
+        self.assertEqual(self.calls, [{'task': 1}])
+        job.refresh_from_db()
+        self.assertEqual(job.state, Job.DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.duration)
+        self.assertGreaterEqual(job.waited, 0)
+
+    def test_job_is_claimed_once(self):
+        """Тест: задание достаётся только одному обработчику"""
+        jobs.enqueue('remember')
+        self.assertEqual(len(jobs.claim('first')), 1)
+        self.assertEqual(jobs.claim('second'), [])
+
+    def test_unique_job_is_queued_once(self):
+        """Тест: уникальное задание не ставится в очередь дважды"""
+        first = jobs.enqueue('remember', unique=True)
+        self.assertEqual(jobs.enqueue('remember', unique=True), first)
+        self.assertEqual(Job.objects.count(), 1)
+
+        jobs.claim('worker')
+        second = jobs.enqueue('remember', unique=True)
+        self.assertNotEqual(second, first)
+        self.assertEqual(Job.objects.count(), 2)
+
+    @override_settings(JOB_MAX_ATTEMPTS=2, JOB_RETRY_DELAY=30)
+    def test_retry_with_backoff(self):
+        """Тест: упавшее задание повторяется с задержкой, затем помечается ошибкой"""
+        job = jobs.enqueue('broken')
+        with self.assertLogs('task_manager.jobs', 'ERROR'):
+            output = self.run_worker()
+        self.assertIn('retried: 1', output)
+        job.refresh_from_db()
+        self.assertEqual(job.state, Job.QUEUED)
+        self.assertIn('ZeroDivisionError', job.error)
+        self.assertAlmostEqual(
+            (job.run_at - job.finished_at).total_seconds(), 30
+        )
+        self.assertEqual(jobs.retry_delay(3), 120)
+
+        self.assertIn('Jobs done: 0', self.run_worker())
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs('task_manager.jobs', 'ERROR'):
+            self.assertIn('failed: 1', self.run_worker())
+        job.refresh_from_db()
+        self.assertEqual((job.state, job.attempts), (Job.FAILED, 2))
+
+    def test_lost_job_is_retried(self):
+        """Тест: зависшее задание возвращается в очередь"""
+        job = jobs.enqueue('remember')
+        jobs.claim('lost')
+        Job.objects.update(started_at=timezone.now() - timedelta(hours=1))
+        self.run_worker()
+        job.refresh_from_db()
+        self.assertEqual((job.state, job.attempts), (Job.DONE, 2))
+
+    def test_slow_job_does_not_overwrite_retry(self):
+        """Тест: медленный запуск не затирает состояние повторного"""
+        jobs.enqueue('remember')
+        slow, = jobs.claim('slow')
+        Job.objects.update(started_at=timezone.now() - timedelta(hours=1))
+        jobs.housekeeping()
+        retry, = jobs.claim('fresh')
+
+        with self.assertLogs('task_manager.jobs', 'WARNING'):
+            self.assertIsNone(jobs.run(slow))
+        job = Job.objects.get()
+        self.assertEqual((job.state, job.worker), (Job.RUNNING, 'fresh'))
+        self.assertEqual(jobs.run(retry), Job.DONE)
+
+    def test_worker_survives_database_errors(self):
+        """Тест: ошибка базы не останавливает обработчик"""
+        jobs.enqueue('remember', task=1)
+        command = 'task_manager.management.commands.run_worker'
+        claims = [OperationalError('database is locked'), jobs.claim]
+
+        def claim(worker):
+            step = claims.pop(0) if claims else jobs.claim
+            if isinstance(step, Exception):
+                raise step
+            return step(worker)
+
+        with patch(f'{command}.claim', claim), \
+                patch(f'{command}.connection') as connection, \
+                self.assertLogs(command, 'ERROR'):
+            output = self.run_worker('--poll-interval', '0')
+        connection.close.assert_called_once()
+        self.assertIn('Jobs done: 1', output)
+        self.assertEqual(self.calls, [{'task': 1}])
+
+        claims.extend([OperationalError('gone')] * 5)
+        with patch(f'{command}.claim', claim), \
+                patch(f'{command}.connection'), \
+                self.assertLogs(command, 'ERROR') as logs:
+            self.run_worker('--poll-interval', '0')
+        self.assertEqual(len(logs.records), 3)
+
+    def test_rebuild_counters_in_background(self):
+        """Тест: пересчёт счётчиков через очередь заданий"""
+        Status.objects.update(tasks_count=10)
+        stdout = StringIO()
+        call_command('rebuild_task_counters', '--background', stdout=stdout)
+        self.assertIn('Queued job', stdout.getvalue())
+        self.assertEqual(Status.objects.get(pk=1).tasks_count, 10)
+
+        self.run_worker('--concurrency', '1')
+        self.assertEqual(Status.objects.get(pk=1).tasks_count, 1)
+
+    def test_job_stats(self):
+        """Тест: статистика заданий для суперпользователя"""
+        jobs.enqueue('remember')
+        jobs.enqueue('remember', run_at=timezone.now() + timedelta(hours=1))
+        self.run_worker()
+
+        self.client.force_login(User.objects.get(pk=1))
+        self.assertEqual(
+            self.client.get(reverse('job_stats')).status_code, 403
+        )
+        self.client.force_login(
+            User.objects.create_superuser('admin', password='admin')
+        )
+        stats = self.client.get(reverse('job_stats')).json()['jobs']
+        self.assertEqual(stats['remember']['done'], 1)
+        self.assertEqual(stats['remember']['queued'], 1)
+        self.assertIsNotNone(stats['remember']['avg_duration'])
+
+
+class NotificationTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
+
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.user2 = User.objects.get(pk=2)
+        User.objects.filter(pk=2).update(email='two@example.com')
+        self.task = Task.objects.get(pk=1)
+        self.client.force_login(self.user1)
+
+    def send_digests(self):
+        Job.objects.update(run_at=timezone.now())
+        call_command('run_worker', '--once', stdout=StringIO())
+
+    def test_assignment_and_status_digest(self):
+        """Тест: назначения и смены статуса приходят одним письмом"""
+        response = self.client.post(
+            reverse('task_update', args=[self.task.pk]),
+            {
+                'name': self.task.name,
+                'description': self.task.description,
+                'status': 2,
+                'executor': self.user2.pk,
+                'labels': [1],
+                'version': 0,
+            }
+        )
+        self.assertEqual(response.status_code, 302)
+        self.client.post(reverse('task_create'), {
+            'name': 'Новая для второго',
+            'status': 1,
+            'executor': self.user2.pk,
+        })
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(
+            Job.objects.filter(name='send_digests').count(), 1
+        )
+
+        with patch(
+            'task_manager.notifications.get_connection',
+            wraps=mail.get_connection
+        ) as get_connection:
+            self.send_digests()
+        get_connection.assert_called_once()
+
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ['two@example.com'])
+        self.assertEqual(message.subject, 'Менеджер задач: обновлений: 3')
+        self.assertIn(
+            'User One назначил(а) вам задачу «Первая задача»', message.body
+        )
+        self.assertIn('в статус «В работе»', message.body)
+        self.assertIn('«Новая для второго»', message.body)
+        self.assertFalse(
+            Notification.objects.filter(sent_at__isnull=True).exists()
+        )
+
+        self.send_digests()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_own_changes_and_missing_email(self):
+        """Тест: о своих изменениях и без адреса писем нет"""
+        notifications.notify(notifications.status_changed(
+            self.task.pk, self.task.name, 'Готово', [1, 2], self.user2
+        ))
+        self.assertEqual(
+            list(Notification.objects.values_list('recipient_id', flat=True)),
+            [1]
+        )
+        self.send_digests()
+        self.assertEqual(mail.outbox, [])
+        self.assertFalse(
+            Notification.objects.filter(sent_at__isnull=True).exists()
+        )
+
+    def test_bulk_notifications(self):
+        """Тест: групповые действия тоже уведомляют"""
+        other = Task.objects.create(
+            name='Вторая', status_id=1, author=self.user2
+        )
+        self.client.post(reverse('tasks_bulk'), {
+            'action': 'executor',
+            'executor': self.user2.pk,
+            'tasks': [self.task.pk, other.pk],
+        })
+        self.send_digests()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].body.count('назначил(а) вам'), 2)
+
+    def test_failed_delivery_is_retried(self):
+        """Тест: при ошибке отправки уведомления остаются в очереди"""
+        notifications.notify(notifications.assigned(
+            self.task.pk, self.task.name, self.user2.pk, self.user1
+        ))
+        with patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=OSError('relay down')
+        ), self.assertLogs('task_manager.jobs', 'ERROR'):
+            self.send_digests()
+        self.assertTrue(
+            Notification.objects.filter(sent_at__isnull=True).exists()
+        )
+        self.assertEqual(Job.objects.get().state, Job.QUEUED)
+
+        self.send_digests()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_retry_sends_only_undelivered_digests(self):
+        """Тест: после сбоя повтор отправляет только неотправленные письма"""
+        User.objects.filter(pk=1).update(email='one@example.com')
+        notifications.notify(
+            notifications.assigned(1, 'Первая задача', 1, self.user2)
+            + notifications.assigned(1, 'Первая задача', 2, self.user1)
+        )
+        self.assertEqual(Job.objects.count(), 1)
+        with patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=[1, OSError('relay down')]
+        ), self.assertLogs('task_manager.jobs', 'ERROR'):
+            self.send_digests()
+        self.assertEqual(
+            list(Notification.objects.filter(sent_at__isnull=True)
+                 .values_list('recipient_id', flat=True)),
+            [2]
+        )
+
+        self.send_digests()
+        self.assertEqual(
+            [message.to for message in mail.outbox], [['two@example.com']]
+        )
+
+
+class SavedFilterTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
+
+    def setUp(self):
+        cache.clear()
+        self.user1 = User.objects.get(pk=1)
+        self.user2 = User.objects.get(pk=2)
+        self.task = Task.objects.get(pk=1)
+        self.client.force_login(self.user1)
+
+    def save(self, name, query, **extra):
+        return self.client.post(reverse('task_filter_save'), {
+            'name': name,
+            'query': query,
+            **extra,
+        })
+
+    def assertMatches(self, saved_filter):
+        request = RequestFactory().get('/')
+        request.user = saved_filter.user
+        expected = TaskFilter(
+            QueryDict(saved_filter.query),
+            queryset=Task.objects.all(),
+            request=request
+        ).qs
+        self.assertEqual(
+            set(saved_filter.results.values_list('task_id', flat=True)),
+            set(expected.values_list('pk', flat=True))
+        )
+
+    def test_save_and_open_default(self):
+        """Тест: сохранённый фильтр по умолчанию открывается сам"""
+        response = self.save(
+            'Мои новые',
+            'status=1&self_tasks=on&cursor=abc',
+            is_default='on'
+        )
+        mine = SavedFilter.objects.get(name='Мои новые')
+        self.assertRedirects(
+            response,
+            f'{reverse("tasks_list")}?saved={mine.pk}'
+        )
+        self.assertEqual(mine.user, self.user1)
+        self.assertEqual(mine.query, 'status=1&self_tasks=on')
+        self.assertEqual(mine.status_id, 1)
+        self.assertTrue(mine.self_tasks and mine.is_default)
+
+        response = self.client.get(reverse('tasks_list'))
+        self.assertRedirects(
+            response,
+            f'{reverse("tasks_list")}?saved={mine.pk}'
+        )
+        response = self.client.get(response.url)
+        self.assertContains(response, 'Первая задача')
+        self.assertContains(response, 'Мои новые')
+        response = self.client.get(reverse('tasks_list'), {'saved': ''})
+        self.assertEqual(response.status_code, 200)
+
+        # The cached list of another worker may not have it yet.
+        cache.set(f'task_manager:saved_filters:{self.user1.pk}', [])
+        response = self.client.get(reverse('tasks_list'), {'saved': mine.pk})
+        self.assertEqual(response.context['saved_filter'], mine)
+        response = self.client.get(reverse('tasks_list'), {'saved': 'x'})
+        self.assertIsNone(response.context['saved_filter'])
+
+        # A new default replaces the old one; the same name overwrites.
+        self.save('Второй', 'status=2', is_default='on')
+        self.save('Второй', 'status=2&label=1', is_default='on')
+        self.assertEqual(
+            list(SavedFilter.objects.filter(is_default=True)
+                 .values_list('name', 'query')),
+            [('Второй', 'status=2&label=1')]
+        )
+        self.client.post(reverse('task_filter_default', args=[mine.pk]))
+        mine.refresh_from_db()
+        self.assertTrue(mine.is_default)
+        self.assertEqual(SavedFilter.objects.filter(is_default=True).count(), 1)
+
+    def test_invalid_and_foreign_filters(self):
+        """Тест: нельзя сохранить неверный и тронуть чужой фильтр"""
+        self.save('Плохой', 'status=999')
+        self.assertFalse(SavedFilter.objects.exists())
+
+        self.save('Мой', 'status=1')
+        mine = SavedFilter.objects.get()
+        self.client.force_login(self.user2)
+        response = self.client.post(
+            reverse('task_filter_delete', args=[mine.pk])
+        )
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse('tasks_list'), {'saved': mine.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['saved_filter'])
+
+        self.client.force_login(self.user1)
+        self.client.post(reverse('task_filter_delete', args=[mine.pk]))
+        self.assertFalse(SavedFilter.objects.exists())
+        self.assertFalse(SavedFilterResult.objects.exists())
+
+    def test_results_follow_task_changes(self):
+        """Тест: предрассчитанные результаты следуют за задачами"""
+        self.save('Баги', 'label=1')
+        self.save('Мои новые', 'status=1&self_tasks=on')
+        self.save('Для второго', 'executor=2')
+        filters = list(SavedFilter.objects.all())
+        self.assertTrue(all(item.materialized for item in filters))
+
+        def check():
+            for item in filters:
+                self.assertMatches(item)
+
+        check()
+        self.client.post(reverse('task_create'), {
+            'name': 'Вторая задача',
+            'status': 1,
+            'executor': self.user2.pk,
+            'labels': [1, 2],
+        })
+        check()
+        other = Task.objects.get(name='Вторая задача')
+        self.client.post(reverse('task_update', args=[self.task.pk]), {
+            'name': self.task.name,
+            'description': self.task.description,
+            'status': 2,
+            'executor': self.user2.pk,
+            'labels': [2],
+            'version': self.task.version,
+        })
+        check()
+        other.labels.remove(1)
+        check()
+        Label.objects.get(pk=2).tasks.add(self.task)
+        Label.objects.get(pk=1).tasks.add(self.task, other)
+        check()
+        Label.objects.get(pk=1).tasks.clear()
+        check()
+        self.client.post(reverse('tasks_bulk'), {
+            'action': 'status',
+            'status': 1,
+            'tasks': [self.task.pk, other.pk],
+        })
+        check()
+        self.client.post(reverse('tasks_bulk'), {
+            'action': 'add_labels',
+            'labels': [1],
+            'tasks': [other.pk],
+        })
+        check()
+        self.client.post(reverse('tasks_bulk'), {
+            'action': 'executor',
+            'executor': '',
+            'tasks': [other.pk],
+        })
+        check()
+        self.client.post(reverse('tasks_bulk'), {
+            'action': 'delete',
+            'tasks': [other.pk],
+        })
+        check()
+        self.client.post(reverse('task_delete', args=[self.task.pk]))
+        check()
+        self.assertFalse(SavedFilterResult.objects.exists())
+
+    def test_refresh_is_idempotent(self):
+        """Тест: повторное обновление не дублирует результаты"""
+        self.save('Баги', 'label=1')
+        saved_filter = SavedFilter.objects.get()
+        self.assertMatches(saved_filter)
+
+        # A concurrent refresh inserting rows that already exist.
+        with patch.object(SavedFilterResult.objects, 'filter') as delete:
+            saved_filters.refresh_results([self.task.pk])
+            saved_filters.refresh_results([self.task.pk])
+        delete.assert_called()
+        saved_filters.materialize([saved_filter.pk])
+        self.assertEqual(saved_filter.results.count(), 1)
+        self.assertMatches(saved_filter)
+
+    def test_open_precomputed_filter(self):
+        """Тест: предрассчитанный фильтр не выполняет запрос фильтра"""
+        self.save('Баги', 'label=1&executor=2')
+        saved_filter = SavedFilter.objects.get()
+        self.task.executor = self.user2
+        self.task.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('tasks_list'),
+                {'saved': saved_filter.pk}
+            )
+        self.assertContains(response, 'Первая задача')
+        listing = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT "task_manager_task"."id"')
+        ]
+        self.assertEqual(len(listing), 1)
+        self.assertIn('task_manager_savedfilterresult', listing[0])
+        self.assertNotIn('task_manager_task_labels', listing[0])
+        saved_filter.refresh_from_db()
+        self.assertEqual(saved_filter.uses, 1)
+
+    @override_settings(SAVED_FILTERS_MATERIALIZED=1)
+    def test_most_used_filters_are_precomputed(self):
+        """Тест: результаты хранятся только у самых частых фильтров"""
+        self.save('Первый', 'status=1')
+        self.save('Второй', 'label=1')
+        self.save('Поиск', 'q=задача')
+        second, first, search = SavedFilter.objects.order_by('name')
+        self.assertTrue(first.materialized)
+        self.assertFalse(second.materialized)
+        self.assertFalse(search.materialized)
+
+        for _ in range(2):
+            response = self.client.get(
+                reverse('tasks_list'),
+                {'saved': second.pk}
+            )
+        self.assertContains(response, 'Первая задача')
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertFalse(first.materialized)
+        self.assertTrue(second.materialized)
+        self.assertFalse(first.results.exists())
+        self.assertMatches(second)
+
+        for _ in range(3):
+            response = self.client.get(
+                reverse('tasks_list'),
+                {'saved': search.pk}
+            )
+        self.assertContains(response, 'Первая задача')
+        search.refresh_from_db()
+        self.assertFalse(search.materialized)
+        self.assertFalse(search.results.exists())
+
+        self.client.post(reverse('task_filter_delete', args=[second.pk]))
+        first.refresh_from_db()
+        self.assertTrue(first.materialized)
+        self.assertMatches(first)
+
+
+class SessionStorageTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
+
+    def test_unchanged_session_not_saved(self):
+        """Тест: неизменённая сессия не записывается повторно"""
+        session = SessionStore()
+        session['theme'] = 'dark'
+        session.create()
+
+        session = SessionStore(session.session_key)
+        session['theme'] = 'dark'
+        with self.assertNumQueries(0):
+            session.save()
+
+        session['theme'] = 'light'
+        with CaptureQueriesContext(connection) as context:
+            session.save()
+        self.assertTrue(context.captured_queries)
+        self.assertEqual(
+            SessionStore(session.session_key)['theme'],
+            'light'
+        )
+
+    @override_settings(
+        SESSION_ENGINE='task_manager.sessions.signed_cookies'
+    )
+    def test_signed_cookie_sessions(self):
+        """Тест: сессии в подписанных cookie не обращаются к базе"""
+        self.client.force_login(User.objects.get(pk=1))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('tasks_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([
+            query for query in context.captured_queries
+            if 'django_session' in query['sql']
+        ])
+
+
+class PageCacheTestCase(TestCase):
+    fixtures = ['users.json']
+
+    def setUp(self):
+        cache.clear()
+        page_cache.stats.clear()
+
+    def test_anonymous_user_list_cached(self):
+        """Тест: анонимный список пользователей отдаётся из кэша"""
+        first = self.client.get(reverse('users_list'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('users_list'))
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['ETag'], second['ETag'])
+
+        response = self.client.get(
+            reverse('users_list'),
+            headers={'if-none-match': second['ETag']}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(
+            page_cache.page_stats()['users'],
+            {'hits': 2, 'misses': 1}
+        )
+
+    def test_user_change_invalidates(self):
+        """Тест: изменение пользователей сбрасывает кэш страницы"""
+        self.client.get(reverse('users_list'))
+        User.objects.create_user('newcomer', first_name='New', last_name='Comer')
+        self.assertContains(self.client.get(reverse('users_list')), 'newcomer')
+
+        user = User.objects.get(username='newcomer')
+        user.last_login = user.date_joined
+        user.save(update_fields=['last_login'])
+        self.assertEqual(page_cache.page_stats()['users']['misses'], 2)
+        self.client.get(reverse('users_list'))
+        self.assertEqual(page_cache.page_stats()['users']['hits'], 1)
+
+        Task.objects.create(
+            name='Задача',
+            status=Status.objects.create(name='Новый'),
+            author=user
+        )
+        self.client.get(reverse('users_list'))
+        self.assertEqual(page_cache.page_stats()['users']['misses'], 3)
+
+    def test_authenticated_not_cached(self):
+        """Тест: страницы авторизованных пользователей не кэшируются"""
+        self.client.get(reverse('index'))
+        self.client.force_login(User.objects.get(pk=1))
+        response = self.client.get(reverse('index'))
+        self.assertContains(response, 'User One')
+        self.assertEqual(page_cache.page_stats()['index'], {'hits': 0, 'misses': 1})
+
+    def test_cache_stats(self):
+        """Тест: счётчики попаданий в кэш страниц"""
+        self.client.get(reverse('index'))
+        self.client.get(reverse('index'))
+        admin = User.objects.create_superuser('admin', password='admin')
+        self.client.force_login(admin)
+        stats = self.client.get(reverse('cache_stats')).json()
+        self.assertEqual(stats['pages']['index'], {'hits': 1, 'misses': 1})
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': settings.CACHE_BACKENDS['redis'],
+        'LOCATION': settings.CACHE_LOCATIONS['redis'],
+        # An in-memory server speaking the Redis protocol.
+        'OPTIONS': {'connection_class': FakeConnection},
+    }
+})
+class RedisCacheTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json']
+
+    def setUp(self):
+        cache.clear()
+        page_cache.stats.clear()
+        # The client another worker would have to the same server.
+        self.other_worker = caches.create_connection('default')
+
+    def test_changes_reach_other_workers(self):
+        """Тест: изменение сбрасывает списки в общем кэше для всех воркеров"""
+        labels = choices.label_choices()
+        self.assertEqual(self.other_worker.get(choices.LABEL_KEY), labels)
+
+        Label.objects.create(name='Новая метка')
+        self.assertIsNone(self.other_worker.get(choices.LABEL_KEY))
+        self.assertIn('Новая метка', dict(choices.label_choices()).values())
+
+    def test_pages_served_from_shared_cache(self):
+        """Тест: страница из общего кэша отдаётся без запросов"""
+        first = self.client.get(reverse('users_list'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('users_list'))
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(
+            page_cache.page_stats()['users'],
+            {'hits': 1, 'misses': 1}
+        )
+
+
+class ConditionalGetTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
+
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.user2 = User.objects.get(pk=2)
+        self.task1 = Task.objects.get(pk=1)
+        self.client.force_login(self.user1)
+
+    def revalidate(self, url, response, **params):
+        return self.client.get(
+            url,
+            params,
+            HTTP_IF_NONE_MATCH=response['ETag']
+        )
+
+    def test_list_pages_not_modified(self):
+        """Тест: неизменённые списки отвечают 304"""
+        for name in ('tasks_list', 'statuses_list', 'labels_list', 'users_list'):
+            url = reverse(name)
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('private', response['Cache-Control'])
+
+            with self.assertNumQueries(3):
+                response = self.revalidate(url, response)
+            self.assertEqual(response.status_code, 304)
+
+    def test_task_list_validator_changes(self):
+        """Тест: ETag списка задач зависит от данных, фильтра и пользователя"""
+        url = reverse('tasks_list')
+        response = self.client.get(url)
+
+        self.assertEqual(
+            self.revalidate(url, response, self_tasks='on').status_code,
+            200
+        )
+
+        Label.objects.create(name='Новая метка')
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+        response = self.client.get(url)
+        self.client.force_login(self.user2)
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_task_list_validator_follows_csrf_token(self):
+        """Тест: после нового входа список задач не отвечает 304"""
+        self.user1.set_password('password123')
+        self.user1.save()
+        self.client.force_login(self.user1)
+        url = reverse('tasks_list')
+        response = self.client.get(url)
+        self.assertEqual(self.revalidate(url, response).status_code, 304)
+
+        self.client.post(reverse('logout'))
+        self.client.post(reverse('login'), {
+            'username': self.user1.username, 'password': 'password123'
+        })
+        self.client.get(reverse('index'))
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_task_detail_validator_changes(self):
+        """Тест: ETag задачи меняется при изменении задачи и её меток"""
+        url = reverse('task_detail', args=[self.task1.pk])
+        response = self.client.get(url)
+        self.assertEqual(self.revalidate(url, response).status_code, 304)
+
+        self.task1.labels.clear()
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+        response = self.client.get(url)
+        Task.objects.create(
+            name='Другая задача',
+            status=self.task1.status,
+            author=self.user2,
+        )
+        self.assertEqual(self.revalidate(url, response).status_code, 304)
+
+        self.task1.name = 'Переименованная задача'
+        self.task1.save()
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_pending_messages_skip_not_modified(self):
+        """Тест: при наличии сообщений страница отрисовывается заново"""
+        url = reverse('labels_list')
+        response = self.client.get(url)
+        self.client.post(
+            reverse('label_delete', args=[Label.objects.get(pk=1).pk])
+        )
+
+        response = self.revalidate(url, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(
+            response,
+            'Невозможно удалить метку, потому что она используется'
+        )
+
+
+@override_settings(ASYNC_VIEWS=True)
+class AsyncViewsTestCase(TestCase):
+    fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
+
+    @classmethod
+    def setUpClass(cls):
+        # Cleanups run last first: reload once the settings are restored.
+        cls.addClassCleanup(cls.reload_urls)
+        super().setUpClass()
+        cls.reload_urls()
+
+    @staticmethod
+    def reload_urls():
+        for name in ('tasks_urls', 'labels_urls', 'statuses_urls', 'users_urls', 'urls'):
+            importlib.reload(import_module(f'task_manager.{name}'))
+        clear_url_caches()
+
+    async def test_async_login_required(self):
+        """Тест: асинхронный список задач требует входа"""
+        response = await self.async_client.get(reverse('tasks_list'))
+        self.assertRedirects(
+            response,
+            reverse('login'),
+            fetch_redirect_response=False
+        )
+
+    async def test_async_read_views(self):
+        """Тест асинхронных страниц для чтения"""
+        task = await Task.objects.aget(pk=1)
+        await self.async_client.aforce_login(await User.objects.aget(pk=1))
+        pages = {
+            reverse('tasks_list'): AsyncTaskListView,
+            reverse('task_detail', args=[task.pk]): AsyncTaskDetailView,
+            reverse('statuses_list'): AsyncStatusListView,
+            reverse('labels_list'): AsyncLabelListView,
+            reverse('users_list'): AsyncUserListView,
+        }
+        for url, view_class in pages.items():
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertIs(response.resolver_match.func.view_class, view_class)
+
+            response = await self.async_client.get(
+                url,
+                headers={'if-none-match': response['ETag']}
+            )
+            self.assertEqual(response.status_code, 304, url)
+
+        response = await self.async_client.get(
+            reverse('tasks_list'),
+            {'status': task.status_id, 'q': 'первая'}
+        )
+        self.assertContains(response, task.name)
+        response = await self.async_client.get(
+            reverse('task_detail', args=[999])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_async_streams_and_cold_caches(self):
+        """Тест: под ASGI выгрузки идут потоком, холодный кэш не мешает"""
+        await cache.aclear()
+        await self.async_client.aforce_login(await User.objects.aget(pk=1))
+        response = await self.async_client.get(
+            reverse('tasks_list'),
+            {'status': 1}
+        )
+        self.assertContains(response, 'Первая задача')
+
+        for url, params in (
+            (reverse('tasks_list'), {'export': 'csv'}),
+            (reverse('tasks_list'), {'export': 'ndjson'}),
+            (reverse('tasks_api'), {'limit': 1}),
+        ):
+            response = await self.async_client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.is_async, params)
+            content = b''.join([
+                chunk async for chunk in response.streaming_content
+            ])
+            self.assertIn('Первая задача'.encode(), content)
+
+    @override_settings(DEBUG=True, PROFILE_REQUESTS=True)
+    def test_middleware_stack_is_async(self):
+        """Тест: под ASGI цепочка middleware не переключается в sync"""
+        with self.assertLogs('django.request', 'DEBUG') as logs:
+            ASGIHandler()
+            logging.getLogger('django.request').debug('loaded')
+        self.assertFalse(
+            [line for line in logs.output if 'adapted' in line],
+            logs.output
+        )
+
+
+class LabelTestCase(QueryBudgetTestCase):
     fixtures = ['users.json', 'statuses.json', 'labels.json', 'tasks.json']
 
     def setUp(self):
@@ -342,6 +2334,16 @@ class LabelTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, self.label1.name)
 
+        def grow(size):
+            for i in range(Label.objects.count(), size):
+                Label.objects.create(name=f'Метка {i}')
+
+        self.assertQueryBudgetScales(
+            grow,
+            lambda: self.client.get(reverse('labels_list')),
+            queries=4
+        )
+
     def test_label_create(self):
         """Тест создания метки"""
         self.client.force_login(self.user1)
@@ -20,6 +20,21 @@ urlpatterns = [
         views.LogoutUserView.as_view(),
         name='logout'
     ),
+    path(
+        'health/db/',
+        views.DatabaseStatsView.as_view(),
+        name='db_stats'
+    ),
+    path(
+        'health/cache/',
+        views.CacheStatsView.as_view(),
+        name='cache_stats'
+    ),
+    path(
+        'health/jobs/',
+        views.JobStatsView.as_view(),
+        name='job_stats'
+    ),
     path(
         'test-error/',
         views.trigger_error,
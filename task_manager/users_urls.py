@@ -1,11 +1,12 @@
 from django.urls import path
 
 from task_manager import users_views
+from task_manager.async_views import read_view
 
 urlpatterns = [
     path(
         '',
-        users_views.UserListView.as_view(),
+        read_view(users_views.UserListView),
         name='users_list'
     ),
     path(
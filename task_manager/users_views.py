@@ -7,6 +7,8 @@ from django.contrib.auth.mixins import (
 )
 from django.contrib.auth.models import User
 from django.contrib.messages.views import SuccessMessageMixin
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
@@ -17,6 +19,11 @@ from django.views.generic import (
     UpdateView,
 )
 
+from task_manager.conditional import ConditionalGetMixin
+from task_manager.models import Task
+from task_manager.page_cache import AnonymousPageCacheMixin
+from task_manager.pagination import CursorPaginationMixin
+
 
 class UserCreateForm(UserCreationForm):
     first_name = forms.CharField(
@@ -64,11 +71,76 @@ class UserUpdateForm(UserCreationForm):
         )
 
 
-class UserListView(ListView):
+def _task_count(field):
+    tasks = (
+        Task.objects.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(tasks), 0)
+
+
+def with_task_counts(users):
+    """Annotate authored and assigned task counts in the same query.
+
+    Correlated subqueries rather than two joined Counts: the database only
+    counts for the rows of the page, and the joins would multiply.
+    """
+    return users.annotate(
+        authored_tasks_count=_task_count('author'),
+        assigned_tasks_count=_task_count('executor'),
+    )
+
+
+def search_users(users, query):
+    """Prefix search on the username, first or last name, or full name."""
+    query = query.strip()
+    if not query:
+        return users
+    condition = (
+        Q(username__istartswith=query)
+        | Q(first_name__istartswith=query)
+        | Q(last_name__istartswith=query)
+    )
+    first_name, _, last_name = query.partition(' ')
+    if last_name.strip():
+        condition |= Q(
+            first_name__iexact=first_name,
+            last_name__istartswith=last_name.strip()
+        )
+    return users.filter(condition)
+
+
+class UserListView(
+    AnonymousPageCacheMixin,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    ListView
+):
     model = User
     template_name = "task_manager/users/list.html"
     context_object_name = "users"
-    ordering = ["id"]
+    paginate_by = 50
+    change_markers = ("user", "task")
+    page_cache_name = "users"
+
+    def get_queryset(self):
+        users = User.objects.only(
+            'username', 'first_name', 'last_name', 'date_joined'
+        )
+        return with_task_counts(
+            search_users(users, self.request.GET.get('q', ''))
+        )
+
+    def get_cursor_keys(self, queryset):
+        return ('pk',)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '')
+        return context
 
 
 class UserCreateView(
@@ -1,13 +1,22 @@
+import os
+
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth.mixins import UserPassesTestMixin
 from django.contrib.auth.views import LoginView, LogoutView
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
-from django.views.generic import TemplateView
+from django.views.generic import TemplateView, View
+
+from task_manager.db import pool_stats
+from task_manager.jobs import job_stats
+from task_manager.page_cache import AnonymousPageCacheMixin, page_stats
 
 
-class IndexView(TemplateView):
+class IndexView(AnonymousPageCacheMixin, TemplateView):
     template_name = 'task_manager/index.html'
+    page_cache_name = 'index'
 
 
 class LoginUserView(LoginView):
@@ -28,6 +37,38 @@ class LogoutUserView(LogoutView):
         return super().dispatch(request, *args, **kwargs)
 
 
+class SuperuserStatsView(UserPassesTestMixin, View):
+    raise_exception = True
+
+    def test_func(self):
+        return self.request.user.is_superuser
+
+
+class DatabaseStatsView(SuperuserStatsView):
+    """Connection pool statistics of the worker that serves the request."""
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(pool_stats())
+
+
+class CacheStatsView(SuperuserStatsView):
+    """Page cache hits and misses of the worker that serves the request."""
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({
+            'pid': os.getpid(),
+            'backend': settings.CACHES['default']['BACKEND'],
+            'pages': page_stats(),
+        })
+
+
+class JobStatsView(SuperuserStatsView):
+    """Background job counts and timings, from the jobs table."""
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({'jobs': job_stats()})
+
+
 def trigger_error(request):
     """Тестовый view для проверки Rollbar"""
     1 / 0  # noqa: B018